@@ -11,7 +11,6 @@ Example of wwPDB OneDep Biocuration API entry content service -
 from __future__ import absolute_import, print_function
 import os
 import sys
-import time
 
 # Configure logging -
 if False:
@@ -118,20 +117,10 @@ def requestEntryContent(requestEntryId, requestContentType, requestFormatType, r
         rD = cr.requestEntryContent(requestEntryId, requestContentType, requestFormatType)
     displayStatus(rD)
     #
-    #   Poll for service completion -
-    #
-    it = 0
-    sl = 2
-    while (True):
-        #    Pause -
-        it += 1
-        pause = it * it * sl
-        time.sleep(pause)
-        rD = cr.getStatus()
-        if rD['status'] in ['completed', 'failed']:
-            break
-        print_("[%4d] Pausing for %4d (seconds)\n" % (it, pause))
-        #
+    #   Wait for service completion (adaptive poll schedule) -
+    #
+    rD = cr.waitForCompletion()
+    displayStatus(rD)
     #
     print_("Storing content type %s  in result file %s\n" % (requestContentType, resultFilePath))
     rD = cr.getOutputByType(resultFilePath, requestContentType, formatType=requestFormatType)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+AsyncContentRequest.py
+^^^^^^^^^^^^^^^^^^^^^^
+
+Asyncio API for OneDep Biocuration Content Request Web Service
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  Initial version mirroring ContentRequest (requires aiohttp)
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+
+import logging
+import sys
+
+from onedep_biocuration import __version__
+from onedep_biocuration import __apiUrl__
+
+#
+from onedep_biocuration.utils.AsyncApiBase import AsyncApiBase
+
+log = logging.getLogger(__name__)
+
+
+class AsyncContentRequest(AsyncApiBase):
+    def __init__(self, apiKey=None, apiUrl=None, errorFlagKey="onedep_error_flag", statusTextKey="onedep_status_text", maxConnections=100):
+        """
+        OneDep Biocuration content request webservice asyncio client API
+
+        :param string apiKey: (Optional) security token.
+        :param string apiUrl: (Optional) alternative API server URL.
+        :param string errorFlagKey: (Optional) key for error flag in service return dictionary
+        :param string statusTextKey: (Optional) key for status text in service return dictionary
+        :param int maxConnections: (Optional) limit on simultaneous connections to the service
+
+        All service methods are coroutines. Because each client tracks a single current session,
+        use one client per session or pass an explicit `session_id` keyword argument, e.g.
+
+            async with AsyncContentRequest(apiKey=apiKey) as cr:
+                rD = await cr.newSession()
+                rD = await cr.requestEntryContent(entryId, contentType, "json", session_id=rD["session_id"])
+
+        """
+        apiUrl = apiUrl if apiUrl else __apiUrl__
+        apiKey = apiKey if apiKey else "anonymous"
+        userAgent = "OneDepBiocurationClient/%s Python/%s " % (__version__, sys.version.split()[0])
+        apiName = "contentws"
+        #
+        super(AsyncContentRequest, self).__init__(apiKey=apiKey, userAgent=userAgent, apiName=apiName, apiUrl=apiUrl, verify=False, maxConnections=maxConnections)
+        #
+        requestContentTypes = {}
+        self.setContentTypes(requestContentTypes)
+        #
+        self.setApiReturnStatusKeys(errorFlagKey=errorFlagKey, statusTextKey=statusTextKey)
+
+    async def newSession(self):
+        """Create a new OneDep service session.
+
+        :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text, and session_id)
+
+        """
+        return await self.createSession()
+
+    async def getStatus(self, **params):
+        """Return the service status for the current session.
+
+        :rtype: json service response converted to dictionary (with mininal keys: status, api_error_flag, api_status_text)
+        """
+        return await self.post(endPoint="session_status", **params)
+
+    async def getOutputByType(self, filePath, contentType, formatType="json", **params):
+        """Store the output file containing 'contentType'/'formatType' from the current session context in the specified output file path.
+
+        :param string filePath: full path to the output file
+        :param string contentType: target contentType
+        :param string contentType: target formatType (if other than json)
+
+         :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
+        """
+        return await self.download(dstPath=filePath, contentType=contentType, formatType=formatType, **params)
+
+    async def getIndex(self, **params):
+        """Return a catalog of the data content of the current session.
+
+        :rtype: json service response converted to dictionary (catalog plus keys - api_error_flag, api_status_text, index)
+        """
+        return await self.post(endPoint="session_index", **params)
+
+    async def requestEntryContent(self, entryId, contentType, formatType, **params):
+        """For the target 'entryId' request a report corresponding to the input 'contentType'.
+
+        :param string requestEntryId: the data set identifier target for the request
+        :param string contentType: the content type target for the request
+        :param string formatType:  the format type for content type target for the request
+
+         :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
+        """
+        _params = {"request_content_type": contentType, "request_dataset_id": entryId, "request_format_type": formatType}
+        for p in params:
+            _params[p] = params[p]
+        #
+        return await self.post(endPoint="entry_content", **_params)
+
+    async def requestSummaryContent(self, contentType, formatType, **params):
+        """Request a summary report corresponding to the input 'contentType'.
+
+        :param string contentType: the content type target for the request
+        :param string formatType:  the format type for content type target for the request
+
+         :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
+        """
+        _params = {"request_content_type": contentType, "request_format_type": formatType}
+        for p in params:
+            _params[p] = params[p]
+        #
+        return await self.post(endPoint="summary_content", **_params)
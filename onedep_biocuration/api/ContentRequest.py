@@ -11,6 +11,18 @@ API for OneDep Biocuration Content Request Web Service
 
 Updates:
      10-Feb-2017 jdw  Initial version
+     18-Oct-2026      add fetchEntryContent() and bounded-concurrency requestEntryContentMany()
+     18-Oct-2026      add waitForCompletion() with adaptive poll schedule
+     18-Oct-2026      pass client options through to ApiBase
+     18-Oct-2026      add optional on-disk report cache and fetchSummaryContent()
+     18-Oct-2026      lease new sessions from an optional SessionPool
+     18-Oct-2026      return SessionHandle from newSession() and share one client across batch requests
+     18-Oct-2026      accept (entryId, contentType) pairs in requestEntryContentMany()
+     18-Oct-2026      add iterOutputRecords() streaming the records of large outputs
+     18-Oct-2026      optionally store outputs gzip/zstd-compressed in getOutputByType()
+     18-Oct-2026      record session lifecycles and batch runs on the optional trace timeline
+     18-Oct-2026      add a per-call trace recorder to requestEntryContentMany()
+     18-Oct-2026      release request details once the output is fetched or the request fails (bounded map)
 
 """
 # from __future__ import print_function
@@ -25,19 +37,35 @@ __license__ = "Apache 2.0"
 
 
 import logging
+import os
 import sys
+import tempfile
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from onedep_biocuration import __version__
 from onedep_biocuration import __apiUrl__
 
 #
-from onedep_biocuration.utils.ApiBase import ApiBase
+from onedep_biocuration.api.SessionHandle import SessionHandle
+from onedep_biocuration.utils.ApiBase import ApiBase, ApiException
+from onedep_biocuration.utils.CompressedFile import compressFile, openReport
+from onedep_biocuration.utils.JsonRecordReader import JsonRecordReader
+from onedep_biocuration.utils.PollPolicy import PollPolicy
+from onedep_biocuration.utils.ReportCache import ReportCache
+from onedep_biocuration.utils.TraceRecorder import NULL_SPAN
 
 log = logging.getLogger(__name__)
 
 
 class ContentRequest(ApiBase):
-    def __init__(self, apiKey=None, apiUrl=None, errorFlagKey="onedep_error_flag", statusTextKey="onedep_status_text"):
+    # largest number of sessions for which request details are kept (the oldest are released first)
+    MAX_TRACKED_REQUESTS = 1000
+
+    def __init__(self, apiKey=None, apiUrl=None, errorFlagKey="onedep_error_flag", statusTextKey="onedep_status_text", pollPolicy=None, cache=None, sessionPool=None, **kwargs):
         """
         OneDep Biocuration content request webservice client API
 
@@ -45,6 +73,10 @@ class ContentRequest(ApiBase):
         :param string apiUrl: (Optional) alternative API server URL.
         :param string errorFlagKey: (Optional) key for error flag in service return dictionary
         :param string statusTextKey: (Optional) key for status text in service return dictionary
+        :param object pollPolicy: (Optional) PollPolicy instance used by waitForCompletion()
+        :param object cache: (Optional) ReportCache instance for downloaded reports
+        :param object sessionPool: (Optional) SessionPool instance from which new sessions are leased
+        :param kwargs: (Optional) client options passed to ApiBase (e.g. pipelinedChecksum=True, traceRecorder=TraceRecorder())
 
         """
         apiUrl = apiUrl if apiUrl else __apiUrl__
@@ -52,54 +84,229 @@ class ContentRequest(ApiBase):
         userAgent = "OneDepBiocurationClient/%s Python/%s " % (__version__, sys.version.split()[0])
         apiName = "contentws"
         #
-        super(ContentRequest, self).__init__(apiKey=apiKey, userAgent=userAgent, apiName=apiName, apiUrl=apiUrl, verify=False)
+        super(ContentRequest, self).__init__(apiKey=apiKey, userAgent=userAgent, apiName=apiName, apiUrl=apiUrl, verify=False, **kwargs)
         #
         #
         requestContentTypes = {}
         self.setContentTypes(requestContentTypes)
         #
         self.setApiReturnStatusKeys(errorFlagKey=errorFlagKey, statusTextKey=statusTextKey)
+        #
+        self.__pollPolicy = pollPolicy
+        self.__cache = cache
+        self.__sessionPool = sessionPool
+        # details and submission time of the last request in each session (until its output is fetched)
+        self.__requestLock = threading.Lock()
+        self.__requestD = OrderedDict()
+
+    def setPollPolicy(self, pollPolicy):
+        """Set the PollPolicy instance used by waitForCompletion()."""
+        self.__pollPolicy = pollPolicy
+
+    def getPollPolicy(self):
+        if self.__pollPolicy is None:
+            self.__pollPolicy = PollPolicy()
+        return self.__pollPolicy
+
+    def setReportCache(self, cache):
+        """Set the ReportCache instance for downloaded reports (None to disable caching)."""
+        self.__cache = cache
+
+    def __makeCacheKey(self, entryId, contentType, formatType, querySite=None):
+        if self.__cache is None:
+            return None
+        return ReportCache.makeKey(self._apiUrl, entryId if entryId else "summary", contentType, formatType, querySite)
+
+    def __traceCacheHit(self, key):
+        tracer = self._getActiveTraceRecorder()
+        if tracer is not None:
+            tracer.instant("cache_hit", cat="session", key=key)
+
+    def __cacheHit(self):
+        return {self._returnApiErrorFlagKey: False, self._returnApiStatusTextKey: "ok", "cache_hit": True}
+
+    def setSessionPool(self, sessionPool):
+        """Set the SessionPool instance from which new sessions are leased (None to create sessions directly)."""
+        self.__sessionPool = sessionPool
 
     def newSession(self):
-        """Create a new OneDep service session.
+        """Create a new OneDep service session (leased from the session pool if one is set) and make it the current session.
 
-        :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text, and session_id)
+        The returned SessionHandle provides getStatus(), getIndex(), requestEntryContent(), requestSummaryContent(),
+        waitForCompletion() and getOutputByType() bound to the new session, so several sessions can be driven
+        concurrently through this client and its connection pool.
 
-        """
-        return self.createSession()
+        :rtype: SessionHandle - json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text, and session_id)
 
-    def getStatus(self):
+        """
+        sh = self.__openSession()
+        self.setSession(sh.getSessionId())
+        return sh
+
+    def __openSession(self):
+        """Internal method to create a new session handle without changing the current session."""
+        if self.__sessionPool is None:
+            rD = self.post("session", session_id=None)
+        else:
+            rD = self.__sessionPool.lease()
+        return SessionHandle(self, rD)
+
+    def getStatus(self, **params):
         """Return the service status for the current session.
 
         :rtype: json service response converted to dictionary (with mininal keys: status, api_error_flag, api_status_text)
         """
-        return self.post(endPoint="session_status")
+        return self.post(endPoint="session_status", **params)
+
+    def waitForCompletion(self, timeout=None, policy=None, **params):
+        """Poll the service status for the current session until the request is completed or failed.
 
-    def getOutputByType(self, filePath, contentType, formatType="json"):
+        Pauses between status requests follow the capped exponential backoff of the poll policy.
+        The first pause is aligned with the expected turnaround of the requested content type and
+        the observed turnaround is recorded to refine the estimate for subsequent requests.
+
+        :param float timeout: (Optional) maximum seconds to wait (default: no limit)
+        :param object policy: (Optional) PollPolicy instance (default: client poll policy)
+        :param params: (Optional) parameters passed to getStatus() (e.g. session_id)
+
+        :rtype: json service response converted to dictionary (with mininal keys: status, api_error_flag, api_status_text)
+        """
+        policy = policy if policy else self.getPollPolicy()
+        sessionId = params.get("session_id", self.getSession())
+        with self.__requestLock:
+            rqD = self.__requestD.get(sessionId, {})
+        contentType = rqD.get("content_type")
+        submitTime = rqD.get("submitted")
+        startTime = time.time()
+        deadline = startTime + timeout if timeout is not None else None
+        lastRunningTime = submitTime if submitTime else startTime
+        #
+        rD = {}
+        nPoll = 0
+        with self._traceSpan("wait", cat="session", session_id=sessionId, content_type=contentType) as span:
+            for pause in policy.pauses(contentType=contentType, elapsed=startTime - submitTime if submitTime else 0.0):
+                if deadline is not None:
+                    pause = min(pause, max(0.0, deadline - time.time()))
+                log.debug("Session %r pausing %.2f (seconds)", sessionId, pause)
+                time.sleep(pause)
+                rD = self.getStatus(**params)
+                nPoll += 1
+                if rD.get(self._returnApiErrorFlagKey, True) or rD.get("status") in ["completed", "failed"]:
+                    break
+                lastRunningTime = time.time()
+                if deadline is not None and lastRunningTime >= deadline:
+                    rD[self._returnApiErrorFlagKey] = True
+                    rD[self._returnApiStatusTextKey] = "Timeout waiting for session completion"
+                    break
+            span.set(polls=nPoll, status=rD.get("status"), error=rD.get(self._returnApiErrorFlagKey, True))
+        #
+        if rD.get("status") == "completed" and submitTime and policy.estimator:
+            # completion is bracketed by the last running and the first completed status
+            policy.estimator.record(contentType, (lastRunningTime + time.time()) / 2.0 - submitTime)
+        if rD.get("status") == "failed":
+            with self.__requestLock:
+                self.__requestD.pop(sessionId, None)
+        return rD
+
+    def getOutputByType(self, filePath, contentType, formatType="json", compression=None, **params):
         """Store the output file containing 'contentType'/'formatType' from the current session context in the specified output file path.
 
+        With a report cache the output is copied from a current cache entry for the session request,
+        if one exists, and downloaded outputs are added to the cache. Compressed outputs are stored as
+        they stream in and can be read with CompressedFile.openReport() (they are not added to the cache).
+        The details of the session request are released (see getRequestDetails()).
+
         :param string filePath: full path to the output file
         :param string contentType: target contentType
         :param string contentType: target formatType (if other than json)
+        :param string compression: (Optional) store the output 'gzip' or 'zstd' compressed
 
          :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
         """
-        return self.download(dstPath=filePath, contentType=contentType, formatType=formatType)
+        key = None
+        with self.__requestLock:
+            rqD = self.__requestD.pop(params.get("session_id", self.getSession()), {})
+        if self.__cache is not None:
+            if rqD.get("content_type") == contentType:
+                key = self.__makeCacheKey(rqD.get("entry_id"), contentType, formatType, rqD.get("query_site"))
+                if self.__cache.get(key, filePath):
+                    if compression:
+                        compressFile(filePath, filePath, compression)
+                    self.__traceCacheHit(key)
+                    return self.__cacheHit()
+        rD = self.download(dstPath=filePath, contentType=contentType, formatType=formatType, compression=compression, **params)
+        if key and not compression and not rD.get(self._returnApiErrorFlagKey, True):
+            self.__cache.put(key, filePath, contentType=contentType)
+        return rD
+
+    def iterOutputRecords(self, contentType, formatType="json", filePath=None, keyPath=None, compression=None, **params):
+        """Return an iterator over the records of the 'contentType' JSON output of the current session.
+
+        The output is downloaded (and its checksum verified) when iteration starts and the records are then
+        read one at a time, so memory use does not grow with the size of the output (see JsonRecordReader).
+
+        :param string contentType: target contentType
+        :param string formatType: (Optional) target formatType (json)
+        :param string filePath: (Optional) path to keep the downloaded output (default: temporary file removed after iteration)
+        :param string compression: (Optional) keep the downloaded output 'gzip' or 'zstd' compressed
+        :param list keyPath: (Optional) object member names leading to the array of wanted records (e.g. ["data"])
+        :param params: (Optional) parameters passed to getOutputByType() (e.g. session_id)
 
-    def getIndex(self):
+        :raises ApiException: if the output cannot be downloaded or fails checksum verification
+        """
+        tmpPath = None
+        if filePath is None:
+            fd, tmpPath = tempfile.mkstemp(prefix="onedep-output-", suffix="." + formatType)
+            os.close(fd)
+        try:
+            rD = self.getOutputByType(filePath if filePath else tmpPath, contentType, formatType=formatType, compression=compression, **params)
+            if rD.get(self._returnApiErrorFlagKey, True):
+                raise ApiException(rD.get(self._returnApiStatusTextKey, "Output download failed"))
+            with openReport(filePath if filePath else tmpPath, "rb") as ifh:
+                for record in JsonRecordReader(ifh, keyPath=keyPath):
+                    yield record
+        finally:
+            if tmpPath and os.path.exists(tmpPath):
+                os.remove(tmpPath)
+
+    def getIndex(self, **params):
         """Return a catalog of the data content of the current session.
 
         :rtype: json service response converted to dictionary (catalog plus keys - api_error_flag, api_status_text, index)
         """
-        return self.post(endPoint="session_index")
+        return self.post(endPoint="session_index", **params)
 
     def __run(self, endPoint, **params):
         """Submit request to the input endPoint using the current session data context.
 
         :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
         """
+        sessionId = params.get("session_id", self.getSession())
+        rqD = {
+            "content_type": params.get("request_content_type"),
+            "entry_id": params.get("request_dataset_id"),
+            "query_site": params.get("query_site"),
+            "submitted": time.time(),
+        }
+        with self.__requestLock:
+            self.__requestD.pop(sessionId, None)
+            self.__requestD[sessionId] = rqD
+            while len(self.__requestD) > self.MAX_TRACKED_REQUESTS:
+                self.__requestD.popitem(last=False)
         return self.post(endPoint=endPoint, **params)
 
+    def getRequestDetails(self, sessionId=None):
+        """Return the details of the pending request of the input session (default: current session) or None.
+
+        Details are kept from the content request until its output is fetched with getOutputByType()
+        or the request fails.
+
+        :rtype: dictionary with keys: content_type, entry_id, query_site, submitted
+        """
+        with self.__requestLock:
+            rqD = self.__requestD.get(sessionId if sessionId else self.getSession())
+            return dict(rqD) if rqD is not None else None
+
     def requestEntryContent(self, entryId, contentType, formatType, **params):
         """For the target 'entryId' request a report corresponding to the input 'contentType'.
 
@@ -129,6 +336,136 @@ class ContentRequest(ApiBase):
         #
         return self.__run(endPoint="summary_content", **_params)
 
+    def fetchEntryContent(self, entryId, contentType, formatType, filePath, timeout=None, policy=None, **params):
+        """Create a new session, request the 'contentType' report for 'entryId', wait for the
+        request to complete and store the output in 'filePath'.
+
+        With a report cache, a current cached report is returned without any service request.
+
+        :param string entryId: the data set identifier target for the request
+        :param string contentType: the content type target for the request
+        :param string formatType:  the format type for content type target for the request
+        :param string filePath: full path to the output file
+        :param float timeout: (Optional) maximum seconds to wait for completion (default: no limit)
+        :param object policy: (Optional) PollPolicy instance (default: client poll policy)
+        :param params: (Optional) additional request parameters
+
+         :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
+        """
+        return self.__fetchContent(self.newSession, entryId, contentType, formatType, filePath, timeout, policy, **params)
+
+    def fetchSummaryContent(self, contentType, formatType, filePath, timeout=None, policy=None, **params):
+        """Create a new session, request the 'contentType' summary report, wait for the request
+        to complete and store the output in 'filePath'.
+
+        With a report cache, a current cached report is returned without any service request.
+
+        :param string contentType: the content type target for the request
+        :param string formatType:  the format type for content type target for the request
+        :param string filePath: full path to the output file
+        :param float timeout: (Optional) maximum seconds to wait for completion (default: no limit)
+        :param object policy: (Optional) PollPolicy instance (default: client poll policy)
+        :param params: (Optional) additional request parameters (e.g. query_site)
+
+         :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text)
+        """
+        return self.__fetchContent(self.newSession, None, contentType, formatType, filePath, timeout, policy, **params)
+
+    def __fetchContent(self, openSession, entryId, contentType, formatType, filePath, timeout, policy, **params):
+        """Internal method running the session/request/wait/download sequence in a session from openSession().
+
+        :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text, session_id)
+        """
+        key = self.__makeCacheKey(entryId, contentType, formatType, params.get("query_site"))
+        if key and self.__cache.get(key, filePath):
+            self.__traceCacheHit(key)
+            rD = self.__cacheHit()
+            rD["session_id"] = None
+            return rD
+        #
+        with self._traceSpan("session", cat="session", entry_id=entryId, content_type=contentType) as span:
+            sh = openSession()
+            span.set(session_id=sh.getSessionId())
+            if sh.get(self._returnApiErrorFlagKey, True):
+                span.set(error=True)
+                return sh
+            try:
+                rD = self.__fetchSessionContent(sh, entryId, contentType, formatType, filePath, timeout, policy, **params)
+            finally:
+                with self.__requestLock:
+                    self.__requestD.pop(sh.getSessionId(), None)
+            rD["session_id"] = sh.getSessionId()
+            span.set(error=rD.get(self._returnApiErrorFlagKey, True), status_text=rD.get(self._returnApiStatusTextKey))
+        return rD
+
+    def __fetchSessionContent(self, sh, entryId, contentType, formatType, filePath, timeout, policy, **params):
+        if entryId:
+            rD = sh.requestEntryContent(entryId, contentType, formatType, **params)
+        else:
+            rD = sh.requestSummaryContent(contentType, formatType, **params)
+        if rD.get(self._returnApiErrorFlagKey, True):
+            return rD
+        rD = sh.waitForCompletion(timeout=timeout, policy=policy)
+        if rD.get(self._returnApiErrorFlagKey, True):
+            return rD
+        if rD.get("status") == "failed":
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "Content request failed"
+            return rD
+        return sh.getOutputByType(filePath, contentType, formatType=formatType)
+
+    def requestEntryContentMany(self, entryIds, contentType, formatType="json", maxWorkers=8, outputDirPath=".", timeout=None, policy=None, traceRecorder=None, **params):
+        """Request the 'contentType' report for each of the input entries using a pool of worker threads.
+
+        Entries may also be given as (entryId, contentType) pairs to request a different content type
+        for each entry ('contentType' applies to entries without a content type of their own).
+
+        Each entry is processed in its own service session (see fetchEntryContent()) and the output
+        is stored in 'outputDirPath' as <entryId>_<contentType>.<formatType>. The sessions share the
+        connection pool of this client (set poolMaxSize to at least maxWorkers) and the current session
+        of this client is not changed.
+
+        :param list entryIds: list of data set identifiers or of (data set identifier, content type) pairs
+        :param string contentType: the default content type target for the requests
+        :param string formatType:  the format type for content type target for the requests
+        :param int maxWorkers: (Optional) maximum number of entries processed concurrently
+        :param string outputDirPath: (Optional) directory for output files
+        :param float timeout: (Optional) maximum seconds to wait for each request to complete
+        :param object policy: (Optional) PollPolicy instance (default: client poll policy)
+        :param object traceRecorder: (Optional) TraceRecorder instance recording the timeline of this batch only (default: client trace recorder)
+        :param params: (Optional) additional request parameters
+
+        :rtype: list of response dictionaries in the order of the input entries (with minimal keys:
+                api_error_flag, api_status_text, entry_id, content_type, session_id, output_file)
+        """
+
+        def worker(item):
+            entryId, itemContentType = (item[0], item[1] if item[1] else contentType) if isinstance(item, (tuple, list)) else (item, contentType)
+            fp = os.path.join(outputDirPath, "%s_%s.%s" % (entryId, itemContentType, formatType))
+            prevRecorder = self._setThreadTraceRecorder(traceRecorder) if traceRecorder is not None else None
+            try:
+                if not itemContentType:
+                    rD = {self._returnApiErrorFlagKey: True, self._returnApiStatusTextKey: "Missing content type"}
+                else:
+                    rD = self.__fetchContent(self.__openSession, entryId, itemContentType, formatType, fp, timeout, policy, **params)
+            except Exception as e:  # pylint: disable=broad-except
+                log.exception("Failing for entry %r", entryId)
+                rD = {self._returnApiErrorFlagKey: True, self._returnApiStatusTextKey: "Entry request processing exception %s" % str(e)}
+            finally:
+                if traceRecorder is not None:
+                    self._setThreadTraceRecorder(prevRecorder)
+            rD = dict(rD)
+            rD["entry_id"] = entryId
+            rD["content_type"] = itemContentType
+            rD.setdefault("session_id", None)
+            rD["output_file"] = None if rD.get(self._returnApiErrorFlagKey, True) else fp
+            return rD
+
+        tracer = traceRecorder if traceRecorder is not None else self._getActiveTraceRecorder()
+        with tracer.span("batch", cat="batch", entries=len(entryIds), max_workers=maxWorkers) if tracer is not None else NULL_SPAN:
+            with ThreadPoolExecutor(max_workers=max(1, maxWorkers)) as executor:
+                return list(executor.map(worker, entryIds))
+
 
 #
 ###
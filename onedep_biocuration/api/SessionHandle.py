@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+SessionHandle.py
+^^^^^^^^^^^^^^^^
+
+Handle for a single OneDep Biocuration content service session.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  add iterOutputRecords()
+    18-Oct-2026  pass the compression option of getOutputByType() and iterOutputRecords()
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class SessionHandle(dict):
+    def __init__(self, client, rD):
+        """
+        Service response for a new session (as returned by ContentRequest.newSession()) with methods
+        bound to that session.
+
+        Every request made through the handle carries its own session identifier, so any number of
+        handles can be used concurrently from different threads. All handles share the connection
+        pool, poll policy and report cache of the parent client.
+
+        :param object client: parent ContentRequest instance
+        :param dict rD: service response for the session (with minimal keys: api_error_flag, api_status_text, session_id)
+
+        """
+        super(SessionHandle, self).__init__(rD)
+        self.__client = client
+
+    def getSessionId(self):
+        return self.get("session_id", None)
+
+    def __params(self, params):
+        _params = {"session_id": self.getSessionId()}
+        for p in params:
+            _params[p] = params[p]
+        return _params
+
+    def getStatus(self, **params):
+        """Return the service status for this session (see ContentRequest.getStatus())."""
+        return self.__client.getStatus(**self.__params(params))
+
+    def getIndex(self, **params):
+        """Return a catalog of the data content of this session (see ContentRequest.getIndex())."""
+        return self.__client.getIndex(**self.__params(params))
+
+    def requestEntryContent(self, entryId, contentType, formatType, **params):
+        """Request the 'contentType' report for 'entryId' in this session (see ContentRequest.requestEntryContent())."""
+        return self.__client.requestEntryContent(entryId, contentType, formatType, **self.__params(params))
+
+    def requestSummaryContent(self, contentType, formatType, **params):
+        """Request the 'contentType' summary report in this session (see ContentRequest.requestSummaryContent())."""
+        return self.__client.requestSummaryContent(contentType, formatType, **self.__params(params))
+
+    def waitForCompletion(self, timeout=None, policy=None, **params):
+        """Poll the status of this session until the request is completed or failed (see ContentRequest.waitForCompletion())."""
+        return self.__client.waitForCompletion(timeout=timeout, policy=policy, **self.__params(params))
+
+    def getOutputByType(self, filePath, contentType, formatType="json", compression=None, **params):
+        """Store the 'contentType'/'formatType' output of this session in filePath (see ContentRequest.getOutputByType())."""
+        return self.__client.getOutputByType(filePath, contentType, formatType=formatType, compression=compression, **self.__params(params))
+
+    def iterOutputRecords(self, contentType, formatType="json", filePath=None, keyPath=None, compression=None, **params):
+        """Return an iterator over the records of the 'contentType' output of this session (see ContentRequest.iterOutputRecords())."""
+        return self.__client.iterOutputRecords(contentType, formatType=formatType, filePath=filePath, keyPath=keyPath, compression=compression, **self.__params(params))
@@ -17,6 +17,16 @@ Updates:
     01-Dec-2016 jdw  make api key functions for this cli controlled by env var ONEDEP_USE_API_KEY
     14-Feb-2017 jdw  adapt options for biocuration api
     31-May-2022 ep   add site request for reports
+    18-Oct-2026      use one client for all operations and add one-shot --run/--wait mode
+    18-Oct-2026      add --batch mode for concurrent entry requests read from a file or stdin
+    18-Oct-2026      add optional local agent (--daemon) serving invocations over a Unix socket
+    18-Oct-2026      defer network and parsing imports so that local operations start quickly
+    18-Oct-2026      add --output_compression to store the output file gzip/zstd-compressed
+    18-Oct-2026      add --trace_file to write a Chrome trace-event timeline of batch runs
+    18-Oct-2026      save turnaround estimates across runs (opt-in for library clients)
+    18-Oct-2026      add --agent_timeout and run in process when the local agent does not respond
+    18-Oct-2026      run in process only when the local agent cannot be reached (not after a request was sent)
+    18-Oct-2026      decode batch input read from stdin (Python 2)
 
 """
 from __future__ import print_function
@@ -28,9 +38,10 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
 
+import io
 import logging
 import sys
-import six
+import threading
 import os.path
 
 
@@ -50,14 +61,26 @@ except:  # noqa: E722 pylint: disable=bare-except
 
 from onedep_biocuration import __apiUrl__  # noqa: E402
 
-from onedep_biocuration.api.ContentRequest import ContentRequest  # noqa: E402
+from onedep_biocuration.api.SessionHandle import SessionHandle  # noqa: E402
 
 
 log = logging.getLogger()
 
 
+# text type of command line arguments (unicode on Python 2, str on Python 3)
+textType = type("")
+
+# output target of the operations run by the current thread (default: sys.stdout)
+_output = threading.local()
+
+
 def print_(s):
-    sys.stdout.write(s)
+    getattr(_output, "target", sys.stdout).write(s)
+
+
+def setOutputTarget(target):
+    """Set the output stream for the operations run by the current thread (None for sys.stdout)."""
+    _output.target = target if target is not None else sys.stdout
 
 
 def version():
@@ -129,6 +152,90 @@ def displayIndex(sD):
         print_("Error processing session index")
 
 
+def readBatchFile(filePath, stdin=None):
+    """Return the list of (entryId, contentType) pairs in the input batch file ('-' for the stdin stream).
+
+    Each line holds an entry identifier optionally followed by a comma and a content type (None if omitted).
+    Blank lines and lines beginning with '#' are ignored.
+    """
+    import csv  # pylint: disable=import-outside-toplevel
+
+    try:
+        if filePath == "-":
+            lineL = (stdin if stdin is not None else sys.stdin).read().splitlines()
+        else:
+            with io.open(os.path.expanduser(filePath), "r") as ifh:
+                lineL = ifh.read().splitlines()
+    except (IOError, OSError) as e:
+        raise SystemExit("Error reading batch file %r: %s" % (filePath, str(e)))
+    #
+    pairL = []
+    for row in csv.reader([line for line in lineL if line.strip() and not line.strip().startswith("#")]):
+        fieldL = [field.strip() for field in row]
+        if fieldL and fieldL[0]:
+            pairL.append((fieldL[0], fieldL[1] if len(fieldL) > 1 and fieldL[1] else None))
+    return pairL
+
+
+def displayBatch(rL):
+    """Print one line for each batch entry and return the number of failed entries."""
+    nFail = 0
+    for rD in rL:
+        if rD.get("onedep_error_flag", True):
+            nFail += 1
+            print_("%s %s error: %s\n" % (rD["entry_id"], rD["content_type"], rD.get("onedep_status_text")))
+        else:
+            print_("%s %s %s\n" % (rD["entry_id"], rD["content_type"], rD["output_file"]))
+    print_("OneDep batch: %d completed, %d failed\n" % (len(rL) - nFail, nFail))
+    return nFail
+
+
+def agentArgs(args):
+    """Return the parsed arguments as a dictionary for the local agent with paths made absolute."""
+    aD = dict(vars(args))
+    for ky in ["sessionFile", "outputFile", "outputDir", "apiKeyFile", "logFile", "cacheDir", "traceFile"]:
+        if aD.get(ky):
+            aD[ky] = os.path.abspath(filterPath(aD[ky]))
+    if aD.get("batchFile") and aD["batchFile"] != "-":
+        aD["batchFile"] = os.path.abspath(filterPath(aD["batchFile"]))
+    return aD
+
+
+class AgentUnavailableError(IOError):
+    """The local agent could not be reached (no request was sent)."""
+
+    pass  # pylint: disable=unnecessary-pass
+
+
+def sendAgentRequest(socketPath, rqD, timeout=None, connectTimeout=5.0):
+    """Send a request to the local agent listening on socketPath and return its response.
+
+    Requests and responses are single lines of JSON. AgentUnavailableError is raised if the agent does
+    not accept the connection within connectTimeout seconds. Once the request is sent, socket.timeout
+    (an IOError/OSError) is raised if the agent does not respond within timeout seconds (None waits
+    indefinitely) and IOError/ValueError for a missing or malformed response.
+    """
+    import json  # pylint: disable=import-outside-toplevel
+    import socket  # pylint: disable=import-outside-toplevel
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(connectTimeout)
+        try:
+            sock.connect(socketPath)
+        except (IOError, OSError) as e:
+            raise AgentUnavailableError("Local agent unavailable at %s: %s" % (socketPath, str(e)))
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(rqD).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as ifh:
+            line = ifh.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise IOError("No response from local agent")
+    return json.loads(line.decode("utf-8"))
+
+
 def filterPath(inpPath):
     try:
         return os.path.expanduser(inpPath)
@@ -136,8 +243,8 @@ def filterPath(inpPath):
         return inpPath
 
 
-def run():
-    """Command line interface for OneDep Biocuration API"""
+def buildParser():
+    """Return the argument parser for the command line interface"""
 
     description = """
     Command line interface for OneDep biocuration API:
@@ -164,6 +271,17 @@ def run():
 
             onedep_biocuration --output_file status.json --output_content_type request-status-xxxx
 
+    Batch mode:  Request entry reports for the entries listed in a file (or on stdin with '-'), one entry
+                 per line optionally followed by a comma and a content type, and store the reports in
+                 <output_dir>/<entry_id>_<content_type>.<format_type>.
+
+            onedep_biocuration --batch entries.csv --entry_content_type <entry_content_type> --concurrency 16 --output_dir reports
+
+    One-shot mode:  Create a session, submit the request, wait for completion, recover the report
+                    and list the session index in a single invocation.
+
+            onedep_biocuration --run --wait --entry_content_type <entry_content_type> --entry_id <data_set_id> --output_file report.json
+
     """
 
     #
@@ -182,27 +300,29 @@ def run():
     parser.add_argument(
         "--session_file",
         dest="sessionFile",
-        type=six.text_type,
+        type=textType,
         default=filterPath("~/.onedep_biocuration_current_session"),
         help="File containing current session information (default: %(default)s)",
     )
     ##
     parser.add_argument("--new_session", dest="newSessionOp", action="store_true", default=False, help="Start a new session")
     ##
-    parser.add_argument("--entry_id", dest="dataSetId", type=six.text_type, default=None, help="Entry identifier [D_0000000000]")
+    parser.add_argument("--entry_id", dest="dataSetId", type=textType, default=None, help="Entry identifier [D_0000000000]")
 
-    parser.add_argument("--entry_content_type", dest="requestEntryContentType", type=six.text_type, default=None, help="Entry content type")
+    parser.add_argument("--entry_content_type", dest="requestEntryContentType", type=textType, default=None, help="Entry content type")
 
-    parser.add_argument("--summary_content_type", dest="requestSummaryContentType", type=six.text_type, default=None, help="Summary content type")
+    parser.add_argument("--summary_content_type", dest="requestSummaryContentType", type=textType, default=None, help="Summary content type")
 
-    parser.add_argument("--query_site", dest="requestSummaryQuerySite", type=six.text_type, default=None, help="For summary content types, option site id")
+    parser.add_argument("--query_site", dest="requestSummaryQuerySite", type=textType, default=None, help="For summary content types, option site id")
     #
     # Output options -
-    parser.add_argument("--output_file", dest="outputFile", type=six.text_type, default=None, help="Output file path")
+    parser.add_argument("--output_file", dest="outputFile", type=textType, default=None, help="Output file path")
 
-    parser.add_argument("--output_format_type", dest="outputFormatType", type=six.text_type, default="json", help="Output file format type")
+    parser.add_argument("--output_format_type", dest="outputFormatType", type=textType, default="json", help="Output file format type")
 
-    parser.add_argument("--output_type", dest="outputType", type=six.text_type, default=None, help="Target content type to output")
+    parser.add_argument("--output_type", dest="outputType", type=textType, default=None, help="Target content type to output")
+
+    parser.add_argument("--output_compression", dest="outputCompression", choices=["gzip", "zstd"], default=None, help="Store the output file compressed")
     ##
     #   Operational and status options for the service  --
     parser.add_argument("--status", dest="statusOp", action="store_true", default=False, help="Get the status of the current session")
@@ -213,86 +333,148 @@ def run():
     #
     parser.add_argument("--index", dest="indexOp", action="store_true", default=False, help="Request index of the data files in the current session")
     #
+    parser.add_argument(
+        "--run", dest="runOp", action="store_true", default=False, help="Start a new session, submit the content request, recover the output file and list the session index"
+    )
+    parser.add_argument("--wait", dest="waitOp", action="store_true", default=False, help="Wait for the current session request to complete before recovering output")
+    parser.add_argument("--batch", dest="batchFile", type=textType, default=None, help="File of entry identifiers [entry_id[,content_type] per line] or - for stdin")
+    parser.add_argument("--concurrency", dest="concurrency", type=int, default=8, help="Maximum number of concurrent batch requests (default: %(default)s)")
+    parser.add_argument("--output_dir", dest="outputDir", type=textType, default=".", help="Output directory for batch reports (default: %(default)s)")
+    parser.add_argument("--trace_file", dest="traceFile", type=textType, default=None, help="Write a timeline of the batch requests to this file (Chrome trace-event JSON)")
+    parser.add_argument("--timeout", dest="waitTimeout", type=float, default=None, help="Maximum time to wait for completion (seconds, default: no limit)")
+    #
     parser.add_argument("--version", action="store_true", help="Show the version number and exit")
     ##
     parser.add_argument("--verbose", action="store_true", help="Set verbose logging")
     parser.add_argument("--debug", action="store_true", help="Set debug logging")
     parser.add_argument("--test_mode", dest="testMode", action="store_true", help="Set service in test mode")
     parser.add_argument("--test_duration", dest="testModeDuration", type=int, default=10, help="Mock service duration in test mode (seconds, default=10)")
-    parser.add_argument("--log_file", dest="logFile", type=six.text_type, default=None, help="Local log file path")
+    parser.add_argument("--log_file", dest="logFile", type=textType, default=None, help="Local log file path")
 
-    parser.add_argument("--api_url", dest="apiUrl", type=six.text_type, default=__apiUrl__, help="API base URL")
+    parser.add_argument("--api_url", dest="apiUrl", type=textType, default=__apiUrl__, help="API base URL")
     #
     parser.add_argument(
         "--api_key_file",
         dest="apiKeyFile",
-        type=six.text_type,
+        type=textType,
         default=filterPath("~/.onedep_biocuration_apikey.jwt"),
         help="File containing a OneDep API key (default: %(default)s)",
     )
     #
-    #
-    options = parser.parse_args()
-    if isinstance(options, tuple):
-        args = options[0]
-    else:
-        args = options
-    del options
+    # Local agent options -
+    parser.add_argument("--daemon", dest="daemonOp", action="store_true", default=False, help="Run a local agent serving requests from other invocations")
+    parser.add_argument("--stop_daemon", dest="stopDaemonOp", action="store_true", default=False, help="Stop the local agent")
+    parser.add_argument(
+        "--agent_socket",
+        dest="agentSocket",
+        type=textType,
+        default=filterPath("~/.onedep_biocuration_agent.sock"),
+        help="Unix socket of the local agent (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--agent_timeout",
+        dest="agentTimeout",
+        type=float,
+        default=3600.0,
+        help="Seconds to wait for the reply of the local agent (default: %(default)s)",
+    )
+    parser.add_argument("--no_agent", dest="noAgent", action="store_true", default=False, help="Run in this process even if a local agent is running")
+    parser.add_argument("--session_pool_size", dest="sessionPoolSize", type=int, default=2, help="Spare sessions kept ready by the local agent (default: %(default)s)")
+    parser.add_argument("--cache_dir", dest="cacheDir", type=textType, default=None, help="Report cache directory used by the local agent (default: no cache)")
+    return parser
+
+
+def newClient(apiKey, apiUrl, poolMaxSize=10):
+    """Return a new content request client (saving turnaround estimates across runs in the home directory)."""
+    from onedep_biocuration.api.ContentRequest import ContentRequest  # pylint: disable=import-outside-toplevel
+    from onedep_biocuration.utils.PollPolicy import PollPolicy, TurnaroundEstimator  # pylint: disable=import-outside-toplevel
+
+    pollPolicy = PollPolicy(estimator=TurnaroundEstimator(filePath=TurnaroundEstimator.DEFAULT_FILE_PATH))
+    return ContentRequest(apiKey=apiKey, apiUrl=apiUrl, poolMaxSize=poolMaxSize, pollPolicy=pollPolicy)
 
-    # Print the version and exit
-    if args.version:
-        version()
-    #
-    # Configure logging -
-    logging.captureWarnings(True)
-    formatter = logging.Formatter("%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
-    logging.basicConfig(format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
-    if args.logFile:
-        handler = logging.FileHandler(args.logFile)
-        handler.setFormatter(formatter)
-        log.addHandler(handler)
-    #
-    if args.debug:
-        log.setLevel(logging.DEBUG)
-        log.debug("debug logging activated")
-    elif args.verbose:
-        log.setLevel(logging.INFO)
-        log.debug("info logging activated")
-    else:
-        log.setLevel(logging.ERROR)
 
+def runOperations(args, stdin=None, clientFactory=None):
+    """Perform the operations selected by the parsed command line arguments.
+
+    :param object args: parsed command line arguments
+    :param object stdin: (Optional) input stream for batch entries (default: sys.stdin)
+    :param callable clientFactory: (Optional) clientFactory(apiKey, apiUrl, poolMaxSize) returning the content request client
+    """
+    clientFactory = clientFactory if clientFactory else newClient
     #
     apiUrl = args.apiUrl
     apiKey = None
     #
+    if args.runOp:
+        args.newSessionOp = True
+        args.indexOp = True
+    # the output type defaults to the requested content type
+    if args.outputFile and not args.outputType:
+        args.outputType = args.requestEntryContentType if args.dataSetId else args.requestSummaryContentType
 
     #
     # Read API key file -
     if args.apiKeyFile:
         apiKey = readApiKey(args.apiKeyFile)
         if not apiKey:
-            parser.print_usage()
+            print_(buildParser().format_usage())
             raise SystemExit("\nError reading Api key file %s" % filterPath(args.apiKeyFile))
+    #
+    # A single client (and connection pool) serves all of the operations below -
+    cr = clientFactory(apiKey, apiUrl, max(10, args.concurrency))
+
+    # Batch entry requests each run in their own session -
+    if args.batchFile:
+        pD = {}
+        if args.testMode:
+            pD["worker_test_mode"] = True
+            pD["worker_test_duration"] = args.testModeDuration
+        outputDir = filterPath(args.outputDir)
+        if not os.path.isdir(outputDir):
+            os.makedirs(outputDir)
+        tracer = None
+        if args.traceFile:
+            from onedep_biocuration.utils.TraceRecorder import TraceRecorder  # pylint: disable=import-outside-toplevel
+
+            tracer = TraceRecorder(processName="onedep batch %s" % args.batchFile)
+        try:
+            # the recorder is passed with the call as the client may be shared with other invocations (local agent)
+            rL = cr.requestEntryContentMany(
+                readBatchFile(args.batchFile, stdin=stdin),
+                args.requestEntryContentType,
+                formatType=args.outputFormatType,
+                maxWorkers=args.concurrency,
+                outputDirPath=outputDir,
+                timeout=args.waitTimeout,
+                traceRecorder=tracer,
+                **pD
+            )
+        finally:
+            if tracer is not None:
+                tracer.write(filterPath(args.traceFile))
+        nFail = displayBatch(rL)
+        if nFail:
+            raise SystemExit("OneDep error: %d of %d entry requests failed" % (nFail, len(rL)))
+        return
 
     # Create a new session or recover cached session data -
     sessionId = None
     if args.newSessionOp:
-        cr = ContentRequest(apiKey=apiKey, apiUrl=apiUrl)
-        rD = cr.createSession()
-        displayStatus(rD)
-        sessionId = rD["session_id"]
+        sh = cr.newSession()
+        displayStatus(sh)
+        sessionId = sh["session_id"]
         writeSessionId(sessionId, args.sessionFile)
     else:
         sessionId = readSessionId(args.sessionFile)
         if not sessionId:
-            parser.print_usage()
+            print_(buildParser().format_usage())
             raise SystemExit("\nError reading session file %s" % filterPath(args.sessionFile))
+        # operations carry the session identifier so that a shared client can serve concurrent invocations
+        sh = SessionHandle(cr, {"session_id": sessionId})
 
     # Submit content service request -
     if (args.requestEntryContentType and args.dataSetId) or args.requestSummaryContentType:
         pD = {}
-        cr = ContentRequest(apiKey=apiKey, apiUrl=apiUrl)
-        cr.setSession(sessionId)
         # optional test mode configuration
         if args.testMode:
             pD["worker_test_mode"] = True
@@ -307,38 +489,37 @@ def run():
         #
         rD = {}
         if args.requestEntryContentType and args.dataSetId:
-            rD = cr.requestEntryContent(args.dataSetId, args.requestEntryContentType, args.outputFormatType, **pD)
+            rD = sh.requestEntryContent(args.dataSetId, args.requestEntryContentType, args.outputFormatType, **pD)
         elif args.requestSummaryContentType:
-            rD = cr.requestSummaryContent(args.requestSummaryContentType, args.outputFormatType, **pD)
+            rD = sh.requestSummaryContent(args.requestSummaryContentType, args.outputFormatType, **pD)
+
+        displayStatus(rD)
 
+    # Wait in-process for the session request to complete -
+    if args.waitOp:
+        rD = sh.waitForCompletion(timeout=args.waitTimeout)
         displayStatus(rD)
+        if rD.get("status") == "failed":
+            raise SystemExit("Content request failed")
 
     # Output files -
     if args.outputFile and args.outputType:
-        cr = ContentRequest(apiKey=apiKey, apiUrl=apiUrl)
-        cr.setSession(sessionId)
-        rD = cr.getOutputByType(filePath=filterPath(args.outputFile), contentType=args.outputType)
+        rD = sh.getOutputByType(filePath=filterPath(args.outputFile), contentType=args.outputType, formatType=args.outputFormatType, compression=args.outputCompression)
         displayStatus(rD)
 
     # Get index of session file content -
     if args.indexOp:
-        cr = ContentRequest(apiKey=apiKey, apiUrl=apiUrl)
-        cr.setSession(sessionId)
-        rD = cr.getIndex()
+        rD = sh.getIndex()
         displayStatus(rD)
         displayIndex(rD)
 
     # Get session service status details -
     if args.statusOp:
-        cr = ContentRequest(apiKey=apiKey, apiUrl=apiUrl)
-        cr.setSession(sessionId)
-        rD = cr.getStatus()
+        rD = sh.getStatus()
         displayStatus(rD)
 
     if args.completeOp:
-        cr = ContentRequest(apiKey=apiKey, apiUrl=apiUrl)
-        cr.setSession(sessionId)
-        rD = cr.getStatus()
+        rD = sh.getStatus()
         #
         if "status" in rD and rD["status"] in ["completed", "failed"]:
             iRet = 1
@@ -348,5 +529,73 @@ def run():
             print_("%d" % iRet)
 
 
+def run():
+    """Command line interface for OneDep Biocuration API"""
+    parser = buildParser()
+    options = parser.parse_args()
+    if isinstance(options, tuple):
+        args = options[0]
+    else:
+        args = options
+    del options
+
+    # Print the version and exit
+    if args.version:
+        version()
+    #
+    # Configure logging -
+    logging.captureWarnings(True)
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+    logging.basicConfig(format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+    if args.logFile:
+        handler = logging.FileHandler(args.logFile)
+        handler.setFormatter(formatter)
+        log.addHandler(handler)
+    #
+    if args.debug:
+        log.setLevel(logging.DEBUG)
+        log.debug("debug logging activated")
+    elif args.verbose:
+        log.setLevel(logging.INFO)
+        log.debug("info logging activated")
+    else:
+        log.setLevel(logging.ERROR)
+
+    #
+    # Local agent -
+    if args.daemonOp:
+        from onedep_biocuration.cli.request_agent import RequestAgent  # pylint: disable=import-outside-toplevel
+
+        RequestAgent(args.agentSocket, sessionPoolSize=args.sessionPoolSize, cachePath=args.cacheDir).serveForever()
+        return
+    if args.stopDaemonOp:
+        try:
+            sendAgentRequest(args.agentSocket, {"op": "shutdown"}, timeout=args.agentTimeout)
+        except (IOError, OSError) as e:
+            raise SystemExit("Error stopping agent at %s: %s" % (args.agentSocket, str(e)))
+        return
+    stdin = None
+    if args.batchFile == "-":
+        data = sys.stdin.read()
+        # Python 2 reads bytes
+        stdin = io.StringIO(data.decode("utf-8") if isinstance(data, bytes) else data)
+    if not args.noAgent and os.path.exists(args.agentSocket):
+        rD = None
+        try:
+            rD = sendAgentRequest(args.agentSocket, {"op": "run", "args": agentArgs(args), "stdin": stdin.getvalue() if stdin else None}, timeout=args.agentTimeout)
+        except AgentUnavailableError as e:
+            log.debug("%s - running in process", str(e))
+        except (IOError, OSError, ValueError) as e:
+            # the agent may still be running the request - running it again here would duplicate it
+            raise SystemExit("Error in request to local agent at %s: %s" % (args.agentSocket, str(e) or type(e).__name__))
+        if rD is not None:
+            print_(rD.get("stdout", ""))
+            if rD.get("exit"):
+                raise SystemExit(rD["exit"])
+            return
+    #
+    runOperations(args, stdin=stdin)
+
+
 if __name__ == "__main__":
     run()
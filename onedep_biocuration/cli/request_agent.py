@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+request_agent.py
+^^^^^^^^^^^^^^^^
+
+Local agent serving command line requests over a Unix domain socket.
+
+The agent keeps content request clients (with their kept-alive connections, spare sessions and
+optional report cache) between invocations of the command line interface.  Each invocation sends
+its parsed arguments as a single line of JSON and receives its output and exit status in reply.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  save turnaround estimates across runs as the command line client does
+    18-Oct-2026  keep one client per service and grow its connection pool to the largest concurrency requested
+    18-Oct-2026  reach the agent through the server instance (old-style handler classes on Python 2)
+    18-Oct-2026  keep the other connection pool settings of a client when growing its pool
+
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import argparse
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import threading
+
+try:
+    from socketserver import StreamRequestHandler, ThreadingMixIn, UnixStreamServer
+except ImportError:  # pragma: no cover
+    from SocketServer import StreamRequestHandler, ThreadingMixIn, UnixStreamServer  # noqa: F401
+
+from onedep_biocuration.api.ContentRequest import ContentRequest
+from onedep_biocuration.cli.biocuration_cli import runOperations, setOutputTarget
+from onedep_biocuration.utils.PollPolicy import PollPolicy, TurnaroundEstimator
+from onedep_biocuration.utils.ReportCache import ReportCache
+from onedep_biocuration.utils.SessionPool import SessionPool
+
+log = logging.getLogger(__name__)
+
+
+class _AgentServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+    # RequestAgent instance serving the requests
+    agent = None
+
+
+class _AgentHandler(StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            rqD = json.loads(line.decode("utf-8"))
+        except ValueError:
+            rD = {"stdout": "", "exit": "Malformed agent request"}
+        else:
+            rD = self.server.agent.dispatch(rqD)
+        self.wfile.write(json.dumps(rD).encode("utf-8") + b"\n")
+
+
+class RequestAgent(object):
+    def __init__(self, socketPath, sessionPoolSize=2, cachePath=None):
+        """
+        Local agent for the command line interface.
+
+        :param string socketPath: path of the Unix domain socket (created with owner-only access)
+        :param int sessionPoolSize: (Optional) spare sessions kept ready for each service (0 to create sessions on demand)
+        :param string cachePath: (Optional) report cache directory (default: no report cache)
+
+        """
+        self.__socketPath = socketPath
+        self.__sessionPoolSize = sessionPoolSize
+        self.__cache = ReportCache(cachePath=cachePath) if cachePath else None
+        self.__clientLock = threading.Lock()
+        self.__clientD = {}
+        self.__poolL = []
+        self.__server = None
+
+    def getClient(self, apiKey, apiUrl, poolMaxSize=10):
+        """Return the client kept for the input service settings (created on first use).
+
+        A single client (and spare session pool) is kept for each API key and service URL. Its connection
+        pool is grown when a larger poolMaxSize is requested (e.g. a batch with a higher --concurrency).
+        """
+        key = (apiKey, apiUrl)
+        with self.__clientLock:
+            if key not in self.__clientD:
+                pool = None
+                if self.__sessionPoolSize > 0:
+                    pool = SessionPool(ContentRequest(apiKey=apiKey, apiUrl=apiUrl), size=self.__sessionPoolSize)
+                    self.__poolL.append(pool)
+                pollPolicy = PollPolicy(estimator=TurnaroundEstimator(filePath=TurnaroundEstimator.DEFAULT_FILE_PATH))
+                self.__clientD[key] = ContentRequest(apiKey=apiKey, apiUrl=apiUrl, poolMaxSize=poolMaxSize, cache=self.__cache, sessionPool=pool, pollPolicy=pollPolicy)
+            elif poolMaxSize > self.__clientD[key].getPoolMaxSize():
+                poolD = self.__clientD[key].getConnectionPool()
+                poolD["poolMaxSize"] = poolMaxSize
+                self.__clientD[key].setConnectionPool(**poolD)
+            return self.__clientD[key]
+
+    def dispatch(self, rqD):
+        """Run the input agent request and return the response (with keys stdout and exit)."""
+        op = rqD.get("op")
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+            return {"stdout": "", "exit": 0}
+        if op != "run":
+            return {"stdout": "", "exit": "Unknown agent operation %r" % op}
+        #
+        out = io.StringIO()
+        exitCode = 0
+        setOutputTarget(out)
+        try:
+            stdin = io.StringIO(rqD["stdin"]) if rqD.get("stdin") is not None else io.StringIO()
+            runOperations(argparse.Namespace(**rqD["args"]), stdin=stdin, clientFactory=self.getClient)
+        except SystemExit as e:
+            exitCode = e.code if e.code is not None else 0
+        except Exception as e:  # pylint: disable=broad-except
+            log.exception("Agent request failing")
+            exitCode = "Agent request processing error %s" % str(e)
+        finally:
+            setOutputTarget(None)
+        return {"stdout": out.getvalue(), "exit": exitCode}
+
+    def __bind(self):
+        if os.path.exists(self.__socketPath):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.__socketPath)
+                raise SystemExit("Agent already running at %s" % self.__socketPath)
+            except (IOError, OSError):
+                # stale socket left by an agent which did not exit cleanly
+                os.remove(self.__socketPath)
+            finally:
+                sock.close()
+        saveMask = os.umask(0o077)
+        try:
+            self.__server = _AgentServer(self.__socketPath, _AgentHandler)
+        finally:
+            os.umask(saveMask)
+        self.__server.agent = self
+
+    def serveForever(self):
+        """Serve requests until shutdown() is called (or the process receives SIGTERM)."""
+        self.__bind()
+        try:
+            signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=self.shutdown).start())
+        except ValueError:
+            # signal handlers can only be set in the main thread
+            pass
+        log.info("Agent serving requests at %s", self.__socketPath)
+        self.__serveBound()
+
+    def start(self):
+        """Serve requests on a background thread and return once the socket is accepting connections."""
+        self.__bind()
+        thread = threading.Thread(target=self.__serveBound)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def __serveBound(self):
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.__server.server_close()
+            if os.path.exists(self.__socketPath):
+                os.remove(self.__socketPath)
+            for pool in self.__poolL:
+                pool.close()
+
+    def shutdown(self):
+        if self.__server is not None:
+            self.__server.shutdown()
@@ -0,0 +1,298 @@
+##
+# File: ApiBaseTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  skip the upload memory test where tracemalloc is not available (Python 2)
+#  18-Oct-2026  test that connections are reused after bodies are read from the underlying response
+##
+"""Test cases for core request and download methods using a local mock service"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+from onedep_biocuration.utils.ApiBase import ApiBase
+from onedep_biocuration.utils.CircuitBreaker import CircuitBreaker
+from onedep_biocuration.utils.DownloadEngine import DownloadEngine
+from onedep_biocuration.utils.RetryPolicy import RetryBudget, RetryPolicy
+
+
+class ApiBaseTests(unittest.TestCase):
+    def setUp(self):
+        self.__server = MockContentServer(workerDelay=0.0, summaryRecords=5000).start()
+        self.__workPath = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.__server.stop()
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def __newClient(self, **kwargs):
+        ab = ApiBase(apiUrl=self.__server.apiUrl, apiName="contentws", **kwargs)
+        rD = ab.createSession()
+        self.assertFalse(rD["onedep_error_flag"])
+        rD = ab.post("summary_content", request_content_type="report-summary-test", request_format_type="json")
+        self.assertFalse(rD["onedep_error_flag"])
+        return ab
+
+    def __expected(self, ab):
+        return self.__server.content(ab.getSession(), "report-summary-test", "json")
+
+    def testDownloadChecksum(self):
+        """Test streamed download with single-pass checksum (inline and pipelined)"""
+        for pipelined in [False, True]:
+            ab = self.__newClient(pipelinedChecksum=pipelined)
+            fp = os.path.join(self.__workPath, "summary.json")
+            rD = ab.download(fp, "report-summary-test", "json")
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            self.assertEqual(ab.getMD5(fp), hashlib.md5(self.__expected(ab)).hexdigest())
+
+    def testDownloadEngineBuffers(self):
+        """Test downloads through small reused buffers with and without preallocation"""
+        self.assertEqual(DownloadEngine().getBufferSize(100), 64 * 1024)
+        self.assertEqual(DownloadEngine().getBufferSize(1 << 30), 4 * 1024 * 1024)
+        for preallocate in [True, False]:
+            ab = self.__newClient(pipelinedChecksum=True, downloadEngine=DownloadEngine(bufferSize=1000, preallocate=preallocate))
+            fp = os.path.join(self.__workPath, "summary.json")
+            connBefore = self.__server.count("connection")
+            for _ in range(2):
+                rD = ab.download(fp, "report-summary-test", "json")
+                self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+                with open(fp, "rb") as ifh:
+                    self.assertEqual(ifh.read(), self.__expected(ab))
+            # the connection is returned to the pool once the body is read
+            self.assertEqual(self.__server.count("connection"), connBefore)
+
+    def testResumableDownload(self):
+        """Test that an interrupted download is continued with a Range request"""
+        ab = self.__newClient(resumableDownloads=True)
+        fp = os.path.join(self.__workPath, "summary.json")
+        self.__server.dropAfterBytes = 100000
+        self.__server.dropCount = 1
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertFalse(os.path.exists(fp))
+        self.assertEqual(os.path.getsize(fp + ".part"), 100000)
+        self.assertTrue(os.path.exists(fp + ".part.json"))
+        #
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        with open(fp, "rb") as ifh:
+            self.assertEqual(ifh.read(), self.__expected(ab))
+        self.assertFalse(os.path.exists(fp + ".part"))
+        self.assertFalse(os.path.exists(fp + ".part.json"))
+
+    def testResumableDownloadChangedContent(self):
+        """Test that a partial file is discarded when the service content has changed"""
+        ab = self.__newClient(resumableDownloads=True)
+        fp = os.path.join(self.__workPath, "summary.json")
+        self.__server.dropAfterBytes = 1000
+        self.__server.dropCount = 1
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.__server.summaryRecords = 10
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        with open(fp, "rb") as ifh:
+            self.assertEqual(ifh.read(), self.__expected(ab))
+
+    def testConditionalDownload(self):
+        """Test that unchanged local files are not transferred again"""
+        for honorIfNoneMatch in [True, False]:
+            self.__server.honorIfNoneMatch = honorIfNoneMatch
+            ab = self.__newClient(conditionalDownloads=True)
+            fp = os.path.join(self.__workPath, "summary-%r.json" % honorIfNoneMatch)
+            rD = ab.download(fp, "report-summary-test", "json")
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            self.assertNotIn("download_skipped", rD)
+            rD = ab.download(fp, "report-summary-test", "json")
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            self.assertTrue(rD["download_skipped"])
+            # changed local content is replaced
+            with open(fp, "ab") as ofh:
+                ofh.write(b"local edit")
+            rD = ab.download(fp, "report-summary-test", "json")
+            self.assertNotIn("download_skipped", rD)
+            with open(fp, "rb") as ifh:
+                self.assertEqual(ifh.read(), self.__expected(ab))
+
+    @unittest.skipIf(tracemalloc is None, "requires tracemalloc")
+    def testStreamingUpload(self):
+        """Test that multipart uploads are streamed from the file with flat memory use"""
+        fp = os.path.join(self.__workPath, "volume.map")
+        with open(fp, "wb") as ofh:
+            for _ in range(32):
+                ofh.write(os.urandom(1024 * 1024))
+        ab = self.__newClient()
+        ab.setContentTypes({"em-volume": ["map"]})
+        progressL = []
+        ab.setUploadProgressCallback(lambda sent, total: progressL.append((sent, total)))
+        tracemalloc.start()
+        try:
+            rD = ab.upload(fp, "em-volume", "map")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        self.assertEqual(rD["upload_size"], 32 * 1024 * 1024)
+        self.assertLess(peak, 4 * 1024 * 1024)
+        self.assertEqual(progressL[-1][0], progressL[-1][1])
+
+    def testConnectionPoolFanOut(self):
+        """Test that threads sharing one client reuse at most poolMaxSize kept-alive connections"""
+        ab = self.__newClient(poolMaxSize=8, poolBlock=True)
+        messageL = []
+        handler = logging.Handler()
+        handler.emit = lambda record: messageL.append(record.getMessage())
+        logging.getLogger("urllib3").addHandler(handler)
+        try:
+            connBefore = self.__server.count("connection")
+            threadL = [threading.Thread(target=lambda: [ab.post("session_status") for _ in range(10)]) for _ in range(16)]
+            for th in threadL:
+                th.start()
+            for th in threadL:
+                th.join()
+        finally:
+            logging.getLogger("urllib3").removeHandler(handler)
+        self.assertLessEqual(self.__server.count("connection") - connBefore, 8)
+        self.assertFalse([msg for msg in messageL if "pool is full" in msg])
+
+    def testKeepAliveIdleEviction(self):
+        """Test that connections idle beyond the keep-alive limit are reopened"""
+        for keepAliveIdle, expected in [(None, 0), (0.1, 1)]:
+            ab = self.__newClient(keepAliveIdle=keepAliveIdle)
+            ab.post("session_status")
+            connBefore = self.__server.count("connection")
+            time.sleep(0.3)
+            rD = ab.post("session_status")
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            self.assertEqual(self.__server.count("connection") - connBefore, expected)
+
+    def testDownloadChecksumFailure(self):
+        """Test checksum mismatch reporting"""
+        ab = self.__newClient()
+        self.__server.badChecksum = True
+        rD = ab.download(os.path.join(self.__workPath, "summary.json"), "report-summary-test", "json")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertEqual(rD["onedep_status_text"], "Checksum failure")
+
+    def testRetryTransientFailures(self):
+        """Test retries of idempotent requests after error responses, dropped connections and checksum failures"""
+        ab = self.__newClient(retryPolicy=RetryPolicy(initialDelay=0.01, maxDelay=0.05, maxRetryAfter=2.0))
+        nBefore = self.__server.count("session_status")
+        self.__server.failD["session_status"] = [(503, None), (502, None)]
+        rD = ab.post("session_status")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        self.assertEqual(rD["retry_count"], 2)
+        self.assertEqual(self.__server.count("session_status") - nBefore, 3)
+        # Retry-After sets the pause
+        self.__server.failD["session_status"] = [(429, "1")]
+        startTime = time.time()
+        rD = ab.post("session_status")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        self.assertGreaterEqual(time.time() - startTime, 0.9)
+        # requests which are not idempotent are not repeated
+        self.__server.failD["entry_content"] = [(503, None)]
+        rD = ab.post("entry_content", request_dataset_id="D_800001", request_content_type="report-entry-example-test")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertNotIn("retry_count", rD)
+        #
+        fp = os.path.join(self.__workPath, "summary.json")
+        self.__server.dropAfterBytes = 1000
+        self.__server.dropCount = 1
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        self.assertEqual(rD["retry_count"], 1)
+        self.__server.badChecksumCount = 1
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        self.assertEqual(rD["retry_count"], 1)
+        self.assertEqual(ab.getMD5(fp), hashlib.md5(self.__expected(ab)).hexdigest())
+        # persistent failures end after maxAttempts
+        nBefore = self.__server.count("download")
+        self.__server.badChecksum = True
+        rD = ab.download(fp, "report-summary-test", "json")
+        self.assertEqual(rD["onedep_status_text"], "Checksum failure")
+        self.assertEqual(self.__server.count("download") - nBefore, 4)
+
+    def testRetryLimits(self):
+        """Test that retries stop at the retry budget and at overlong Retry-After requests"""
+        policy = RetryPolicy(maxAttempts=10, initialDelay=0.01, maxDelay=0.01, maxRetryAfter=5.0, budget=RetryBudget(ratio=0.0, minRetries=2, window=60.0))
+        ab = self.__newClient(retryPolicy=policy)
+        self.__server.failD["session_status"] = [(503, None)] * 10
+        nBefore = self.__server.count("session_status")
+        rD = ab.post("session_status")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertEqual(self.__server.count("session_status") - nBefore, 3)
+        rD = ab.post("session_status")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertEqual(self.__server.count("session_status") - nBefore, 4)
+        #
+        self.__server.failD["session_status"] = [(503, "3600")]
+        ab.setRetryPolicy(RetryPolicy(initialDelay=0.01, maxRetryAfter=5.0))
+        rD = ab.post("session_status")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertEqual(RetryPolicy.parseRetryAfter("2"), 2.0)
+        self.assertAlmostEqual(RetryPolicy.parseRetryAfter("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412500.0), 10.0)
+        self.assertIsNone(RetryPolicy.parseRetryAfter("soon"))
+
+    def testCircuitBreaker(self):
+        """Test that an endpoint circuit opens after consecutive failures, refuses requests and closes after a trial request"""
+        breaker = CircuitBreaker(failureThreshold=3, resetTimeout=0.3)
+        ab = self.__newClient(circuitBreaker=breaker)
+        apiUrl = self.__server.apiUrl
+        self.__server.failD["session_status"] = [(503, None)] * 3
+        for _ in range(3):
+            self.assertTrue(ab.post("session_status")["onedep_error_flag"])
+        self.assertEqual(breaker.getState(apiUrl, "session_status"), "open")
+        nBefore = self.__server.count("session_status")
+        rD = ab.post("session_status")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertTrue(rD["circuit_open"])
+        self.assertEqual(self.__server.count("session_status"), nBefore)
+        # other endpoints and service errors other than unavailability are unaffected
+        self.assertFalse(ab.post("session_index")["onedep_error_flag"])
+        rD = ab.download(os.path.join(self.__workPath, "none.json"), "report-none", "json")
+        self.assertNotIn("circuit_open", rD)
+        self.assertEqual(breaker.getState(apiUrl, "download"), "closed")
+        # a failed trial request opens the circuit again and a successful one closes it
+        time.sleep(0.35)
+        self.assertEqual(breaker.getState(apiUrl, "session_status"), "half-open")
+        self.__server.failD["session_status"] = [(503, None)]
+        self.assertNotIn("circuit_open", ab.post("session_status"))
+        self.assertTrue(ab.post("session_status").get("circuit_open"))
+        time.sleep(0.35)
+        self.assertFalse(ab.post("session_status")["onedep_error_flag"])
+        self.assertEqual(breaker.getState(apiUrl, "session_status"), "closed")
+        # circuits are kept for each service URL
+        unreachable = ApiBase(apiUrl="http://127.0.0.1:1", apiName="contentws", circuitBreaker=breaker)
+        for _ in range(4):
+            rD = unreachable.post("session_status")
+        self.assertTrue(rD["circuit_open"])
+        self.assertEqual(breaker.getState("http://127.0.0.1:1", "session_status"), "open")
+        self.assertEqual(breaker.getState(apiUrl, "session_status"), "closed")
+
+    def testDownloadMissingContent(self):
+        """Test service error reporting for unknown content"""
+        ab = self.__newClient()
+        rD = ab.download(os.path.join(self.__workPath, "none.json"), "report-none", "json")
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertIn("No content", rD["onedep_status_text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+##
+# File: AsyncContentRequestHelpers.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Coroutines driving the asyncio content request client in AsyncContentRequestTests (Python 3 only)"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import asyncio
+import os
+
+from onedep_biocuration.api.AsyncContentRequest import AsyncContentRequest
+
+
+def runLoop(coro):
+    """Run the input coroutine to completion on a new event loop and return its result."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def fetchEntry(cr, entryId, contentType, dirPath, pollInterval=0.05):
+    """Request the entry content in a new session, wait for completion and download it to dirPath.
+
+    Returns a tuple: output file path, content request response dictionary, download response dictionary.
+    """
+    sD = await cr.newSession()
+    sessionId = sD["session_id"]
+    requestD = await cr.requestEntryContent(entryId, contentType, "json", session_id=sessionId)
+    while True:
+        rD = await cr.getStatus(session_id=sessionId)
+        if rD["status"] in ["completed", "failed"]:
+            break
+        await asyncio.sleep(pollInterval)
+    fp = os.path.join(dirPath, entryId + ".json")
+    return fp, requestD, await cr.getOutputByType(fp, contentType, session_id=sessionId)
+
+
+async def fetchEntries(apiUrl, entryIdL, contentType, dirPath):
+    """Fetch the content of all input entries concurrently with one client (see fetchEntry)."""
+    async with AsyncContentRequest(apiUrl=apiUrl) as cr:
+        return await asyncio.gather(*[fetchEntry(cr, entryId, contentType, dirPath) for entryId in entryIdL])
+
+
+async def getStatus(apiUrl, sessionId):
+    """Return the status response for the input session id."""
+    async with AsyncContentRequest(apiUrl=apiUrl) as cr:
+        cr.setSession(sessionId)
+        return await cr.getStatus()
@@ -0,0 +1,69 @@
+##
+# File: AsyncContentRequestTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  test downloads larger than the disk write block
+#  18-Oct-2026  move the coroutines to AsyncContentRequestHelpers so that Python 2 can import this module
+##
+"""Test cases for the asyncio content request client"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+
+try:
+    import aiohttp  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    aiohttp = None
+
+if aiohttp is not None and sys.version_info >= (3, 5):
+    # coroutines are a syntax error on Python 2 - these are kept in a separate module
+    from onedep_biocuration.tests.AsyncContentRequestHelpers import fetchEntries, getStatus, runLoop
+
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+
+
+@unittest.skipIf(aiohttp is None or sys.version_info < (3, 5), "requires aiohttp")
+class AsyncContentRequestTests(unittest.TestCase):
+    def setUp(self):
+        self.__server = MockContentServer(workerDelay=0.2).start()
+        self.__workPath = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.__server.stop()
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def testConcurrentEntryRequests(self):
+        """Test many sessions in flight on a single event loop"""
+        entryIdL = ["D_%010d" % (800000 + ii) for ii in range(20)]
+        resultL = runLoop(fetchEntries(self.__server.apiUrl, entryIdL, "report-entry-example-test", self.__workPath))
+        for (fp, requestD, rD), entryId in zip(resultL, entryIdL):
+            self.assertFalse(requestD["onedep_error_flag"])
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            with open(fp, "r") as ifh:
+                self.assertEqual(json.load(ifh)["entry_id"], entryId)
+        self.assertEqual(self.__server.count("session"), len(entryIdL))
+
+    def testLargeDownload(self):
+        """Test that content larger than the disk write block is written intact"""
+        self.__server.entryBytes = 3 * 1048576 + 12345
+        ((fp, _, rD),) = runLoop(fetchEntries(self.__server.apiUrl, ["D_8000000001"], "report-entry-example-test", self.__workPath))
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        with open(fp, "r") as ifh:
+            self.assertEqual(len(json.load(ifh)["padding"]), self.__server.entryBytes)
+
+    def testUnknownSession(self):
+        """Test error dictionary for an unknown session"""
+        rD = runLoop(getStatus(self.__server.apiUrl, "no-such-session"))
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertIn("Unknown session", rD["onedep_status_text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+##
+# File: CliTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  capture output without contextlib.redirect_stdout() (Python 2)
+#  18-Oct-2026  test the agent timeout and the single agent client for each service
+#  18-Oct-2026  test that requests sent to the agent are not repeated in process
+##
+"""Test cases for the command line interface using a local mock service"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from onedep_biocuration.cli.biocuration_cli import agentArgs, buildParser, run, sendAgentRequest
+from onedep_biocuration.cli.request_agent import RequestAgent
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        self.__server = MockContentServer(workerDelay=0.2).start()
+        self.__workPath = tempfile.mkdtemp()
+        self.__home = os.environ.get("HOME")
+        os.environ["HOME"] = self.__workPath
+        self.__keyPath = os.path.join(self.__workPath, "key.jwt")
+        with open(self.__keyPath, "w") as ofh:
+            ofh.write("test-key")
+
+    def tearDown(self):
+        if self.__home is not None:
+            os.environ["HOME"] = self.__home
+        self.__server.stop()
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def __run(self, *argL, **kwargs):
+        argv = ["onedep_request", "--api_url", self.__server.apiUrl, "--api_key_file", self.__keyPath, "--session_file", os.path.join(self.__workPath, "session")]
+        argv += ["--agent_socket", os.path.join(self.__workPath, "agent.sock")]
+        out = io.StringIO()
+        saveArgv, saveStdin, saveStdout = sys.argv, sys.stdin, sys.stdout
+        sys.argv = argv + list(argL)
+        sys.stdin = io.StringIO(kwargs.get("stdin", ""))
+        # contextlib.redirect_stdout() is not available on Python 2
+        sys.stdout = out
+        try:
+            try:
+                run()
+            except SystemExit as e:
+                if e.code:
+                    out.write("%s\n" % e.code)
+        finally:
+            sys.argv, sys.stdin, sys.stdout = saveArgv, saveStdin, saveStdout
+        return out.getvalue()
+
+    def testRunAndWait(self):
+        """Test the one-shot session/request/wait/download mode over a single connection"""
+        fp = os.path.join(self.__workPath, "report.json")
+        out = self.__run("--run", "--wait", "--entry_id", "D_800004", "--entry_content_type", "report-entry-example-test", "--output_file", fp)
+        self.assertNotIn("error", out)
+        self.assertIn("OneDep status: completed", out)
+        self.assertIn("OneDep Session File Index", out)
+        with open(fp, "r") as ifh:
+            self.assertEqual(json.load(ifh)["entry_id"], "D_800004")
+        self.assertEqual(self.__server.count("session"), 1)
+        self.assertEqual(self.__server.count("connection"), 1)
+
+    def testWaitTimeout(self):
+        """Test the wait deadline in one-shot mode"""
+        out = self.__run(
+            "--run", "--wait", "--timeout", "0.1", "--entry_id", "D_800004", "--entry_content_type", "report-entry-example-test", "--test_mode", "--test_duration", "5"
+        )
+        self.assertIn("Timeout waiting for session completion", out)
+
+    def testBatch(self):
+        """Test concurrent batch requests read from a file with optional content types"""
+        batchPath = os.path.join(self.__workPath, "entries.csv")
+        with open(batchPath, "w") as ofh:
+            ofh.write("# entry_id,content_type\nD_800001\nD_800002,report-entry-other\n\nD_800003\n")
+        outputDir = os.path.join(self.__workPath, "reports")
+        tracePath = os.path.join(self.__workPath, "trace.json")
+        out = self.__run("--batch", batchPath, "--entry_content_type", "report-entry-example-test", "--concurrency", "3", "--output_dir", outputDir, "--trace_file", tracePath)
+        self.assertIn("OneDep batch: 3 completed, 0 failed", out)
+        with open(tracePath, "r") as ifh:
+            self.assertEqual(len([eD for eD in json.load(ifh)["traceEvents"] if eD["name"] == "session"]), 3)
+        self.assertEqual(
+            sorted(os.listdir(outputDir)),
+            ["D_800001_report-entry-example-test.json", "D_800002_report-entry-other.json", "D_800003_report-entry-example-test.json"],
+        )
+        with open(os.path.join(outputDir, "D_800002_report-entry-other.json"), "r") as ifh:
+            self.assertEqual(json.load(ifh)["content_type"], "report-entry-other")
+        self.assertLessEqual(self.__server.count("connection"), 3)
+
+    def testBatchStdin(self):
+        """Test batch entries read from stdin with per-entry failures reported"""
+        outputDir = os.path.join(self.__workPath, "reports")
+        out = self.__run("--batch", "-", "--output_dir", outputDir, stdin="D_800001,report-entry-example-test\nD_800002\n")
+        self.assertIn("D_800002 None error: Missing content type", out)
+        self.assertIn("OneDep batch: 1 completed, 1 failed", out)
+        self.assertTrue(os.path.exists(os.path.join(outputDir, "D_800001_report-entry-example-test.json")))
+
+    def testAgent(self):
+        """Test invocations served by the local agent over warm connections"""
+        socketPath = os.path.join(self.__workPath, "agent.sock")
+        RequestAgent(socketPath, sessionPoolSize=0).start()
+        self.assertEqual(os.stat(socketPath).st_mode & 0o077, 0)
+        fp = os.path.join(self.__workPath, "report.json")
+        out = self.__run("--run", "--wait", "--entry_id", "D_800004", "--entry_content_type", "report-entry-example-test", "--output_file", fp)
+        self.assertIn("OneDep status: completed", out)
+        with open(fp, "r") as ifh:
+            self.assertEqual(json.load(ifh)["entry_id"], "D_800004")
+        out = self.__run("--test_complete")
+        self.assertEqual(out, "1")
+        out = self.__run("--batch", "-", "--output_dir", os.path.join(self.__workPath, "reports"), stdin="D_800001,report-entry-example-test\n")
+        self.assertIn("OneDep batch: 1 completed, 0 failed", out)
+        # all invocations shared the kept-alive connections of the agent
+        self.assertEqual(self.__server.count("connection"), 1)
+        out = self.__run("--index", "--session_file", os.path.join(self.__workPath, "none"))
+        self.assertIn("Error reading session file", out)
+        self.__run("--stop_daemon")
+        for _ in range(50):
+            if not os.path.exists(socketPath):
+                break
+            time.sleep(0.02)
+        self.assertFalse(os.path.exists(socketPath))
+
+    def testAgentConcurrentTracedBatches(self):
+        """Test that concurrent traced batches served by the local agent each record only their own sessions"""
+        socketPath = os.path.join(self.__workPath, "agent.sock")
+        agent = RequestAgent(socketPath, sessionPoolSize=0).start()
+        try:
+            entryD = {"a": ["D_800001", "D_800002", "D_800003"], "b": ["D_800004", "D_800005"]}
+            responseD = {}
+
+            def invoke(name):
+                argL = [
+                    "--api_url",
+                    self.__server.apiUrl,
+                    "--api_key_file",
+                    self.__keyPath,
+                    "--batch",
+                    "-",
+                    "--entry_content_type",
+                    "report-entry-example-test",
+                    "--concurrency",
+                    "2",
+                ]
+                argL += ["--output_dir", os.path.join(self.__workPath, name), "--trace_file", os.path.join(self.__workPath, "%s.json" % name)]
+                args = buildParser().parse_args(argL)
+                responseD[name] = sendAgentRequest(socketPath, {"op": "run", "args": agentArgs(args), "stdin": "\n".join(entryD[name]) + "\n"})
+
+            threadL = [threading.Thread(target=invoke, args=(name,)) for name in entryD]
+            for th in threadL:
+                th.start()
+            for th in threadL:
+                th.join()
+            for name, entryIdL in entryD.items():
+                self.assertEqual(responseD[name]["exit"], 0, responseD[name])
+                with open(os.path.join(self.__workPath, "%s.json" % name), "r") as ifh:
+                    eventL = json.load(ifh)["traceEvents"]
+                self.assertEqual(sorted([eD["args"]["entry_id"] for eD in eventL if eD["name"] == "session"]), entryIdL)
+                self.assertEqual(len([eD for eD in eventL if eD["name"] == "download"]), len(entryIdL))
+            cr = agent.getClient("test-key", self.__server.apiUrl)
+            self.assertIsNone(cr.getTraceRecorder())
+            # one client for each service whatever the concurrency, with a connection pool grown to fit
+            cr.setConnectionPool(poolConnections=4, poolMaxSize=2, poolBlock=True, keepAliveIdle=30.0)
+            self.assertIs(agent.getClient("test-key", self.__server.apiUrl, poolMaxSize=16), cr)
+            self.assertEqual(cr.getConnectionPool(), {"poolConnections": 4, "poolMaxSize": 16, "poolBlock": True, "keepAliveIdle": 30.0})
+            self.assertIs(agent.getClient("test-key", self.__server.apiUrl, poolMaxSize=4), cr)
+            self.assertEqual(cr.getPoolMaxSize(), 16)
+        finally:
+            agent.shutdown()
+
+    def testStaleAgentSocket(self):
+        """Test that invocations run in process when the agent socket is stale"""
+        with open(os.path.join(self.__workPath, "agent.sock"), "w") as ofh:
+            ofh.write("")
+        out = self.__run("--new_session", "--status")
+        self.assertIn("OneDep status", out)
+        self.assertEqual(self.__server.count("session"), 1)
+
+    def testUnresponsiveAgent(self):
+        """Test that a request sent to an agent which does not reply fails rather than running again in process"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(os.path.join(self.__workPath, "agent.sock"))
+            sock.listen(1)
+            out = self.__run("--new_session", "--status", "--agent_timeout", "0.2")
+        finally:
+            sock.close()
+        self.assertIn("Error in request to local agent", out)
+        self.assertEqual(self.__server.count("session"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,299 @@
+##
+# File: ClientBenchmarkTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  run only when ONEDEP_RUN_BENCHMARKS is set
+##
+"""Client throughput, latency, CPU and memory benchmarks against a local mock contentws service.
+
+The mock service runs in its own process so that the CPU time and memory measured here are those of the
+client. Each path (single requests, serial, threaded and batch entry requests) reports its throughput,
+p50/p99 latency, CPU time and resident memory growth and is checked against a budget. The benchmarks are
+skipped unless ONEDEP_RUN_BENCHMARKS is set. Scale the runs and budgets with the ONEDEP_BENCHMARK_*
+environment variables and set ONEDEP_BENCHMARK_OUTPUT to a file path to keep the results as JSON, e.g.
+
+    ONEDEP_RUN_BENCHMARKS=1 ONEDEP_BENCHMARK_ENTRIES=200 ONEDEP_BENCHMARK_OUTPUT=bench.json python -m unittest onedep_biocuration.tests.ClientBenchmarkTests
+"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from onedep_biocuration.api.ContentRequest import ContentRequest
+from onedep_biocuration.utils.PollPolicy import PollPolicy, TurnaroundEstimator
+from onedep_biocuration.utils.TraceRecorder import TraceRecorder
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(HERE))
+
+
+def percentile(valueL, q):
+    """Return the nearest-rank q-quantile (0 < q <= 1) of the input values (None if there are none)."""
+    if not valueL:
+        return None
+    valueL = sorted(valueL)
+    return valueL[min(len(valueL) - 1, max(0, int(q * len(valueL) + 0.5) - 1))]
+
+
+class ResourceSampler(object):
+    def __init__(self, interval=0.005):
+        """
+        Sampler of the CPU time and peak resident memory of this process while in use as a context manager.
+
+        :param float interval: (Optional) time between resident memory samples (seconds)
+
+        """
+        self.__interval = interval
+        self.__stopEvent = threading.Event()
+        self.__thread = None
+        self.__baseRss = None
+        self.__peakRss = None
+        self.__cpuStart = None
+        self.cpu = None
+        self.rssGrowth = None
+
+    @staticmethod
+    def currentRss():
+        """Return the resident memory of this process (bytes) or None where /proc is not available."""
+        try:
+            with open("/proc/self/statm", "r") as ifh:
+                return int(ifh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (IOError, OSError, ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def peakRss():
+        """Return the peak resident memory of this process (bytes) or None."""
+        if resource is None:
+            return None
+        maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxRss if sys.platform == "darwin" else maxRss * 1024
+
+    def __run(self):
+        while not self.__stopEvent.wait(self.__interval):
+            self.__peakRss = max(self.__peakRss, self.currentRss())
+
+    def __enter__(self):
+        self.__baseRss = self.currentRss()
+        self.__peakRss = self.__baseRss
+        if self.__baseRss is not None:
+            self.__thread = threading.Thread(target=self.__run, name="rss-sampler")
+            self.__thread.daemon = True
+            self.__thread.start()
+        self.__cpuStart = time.process_time()
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        self.cpu = time.process_time() - self.__cpuStart
+        self.__stopEvent.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.rssGrowth = max(0, max(self.__peakRss, self.currentRss()) - self.__baseRss)
+        return False
+
+
+@unittest.skipUnless(os.getenv("ONEDEP_RUN_BENCHMARKS"), "benchmarks - set ONEDEP_RUN_BENCHMARKS=1")
+class ClientBenchmarkTests(unittest.TestCase):
+    # entries requested by each of the serial, threaded and batch runs
+    entries = int(os.getenv("ONEDEP_BENCHMARK_ENTRIES", "16"))
+    # requests made by the single request run
+    requests = int(os.getenv("ONEDEP_BENCHMARK_REQUESTS", "200"))
+    # concurrent threads of the threaded and batch runs
+    workers = int(os.getenv("ONEDEP_BENCHMARK_WORKERS", "8"))
+    # mock service turnaround of each entry request (seconds) and size of each entry output (bytes)
+    workerDelay = float(os.getenv("ONEDEP_BENCHMARK_WORKER_DELAY", "0.05"))
+    entryBytes = int(os.getenv("ONEDEP_BENCHMARK_ENTRY_BYTES", "262144"))
+    # budgets: p99 latency (milliseconds) and client CPU time (milliseconds) of single requests,
+    # and the least speedup of the threaded and batch runs over the serial run
+    p99BudgetMs = float(os.getenv("ONEDEP_BENCHMARK_P99_MS", "250"))
+    cpuBudgetMs = float(os.getenv("ONEDEP_BENCHMARK_CPU_MS", "20"))
+    minSpeedup = float(os.getenv("ONEDEP_BENCHMARK_MIN_SPEEDUP", "2.0"))
+    outputPath = os.getenv("ONEDEP_BENCHMARK_OUTPUT")
+    resultD = {}
+
+    @classmethod
+    def setUpClass(cls):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join([TOPDIR, env.get("PYTHONPATH", "")])
+        cmdL = [sys.executable, "-m", "onedep_biocuration.tests.MockContentServer", "--worker_delay", str(cls.workerDelay), "--entry_bytes", str(cls.entryBytes)]
+        cls.server = subprocess.Popen(cmdL, cwd=TOPDIR, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True)
+        cls.apiUrl = cls.server.stdout.readline().strip()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stdin.close()
+        try:
+            cls.server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            cls.server.kill()
+            cls.server.wait()
+        cls.server.stdout.close()
+        if cls.outputPath and cls.resultD:
+            with open(cls.outputPath, "w") as ofh:
+                json.dump(cls.resultD, ofh, indent=2, sort_keys=True)
+
+    def setUp(self):
+        self.assertTrue(self.apiUrl.startswith("http://"), "Mock service failed to start")
+        self.__workPath = tempfile.mkdtemp()
+        self.__policy = PollPolicy(initialDelay=0.01, maxDelay=0.05, estimator=TurnaroundEstimator(filePath=None))
+
+    def tearDown(self):
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def __client(self, latencyL, tracer=None):
+        return ContentRequest(
+            apiUrl=self.apiUrl, pollPolicy=self.__policy, poolMaxSize=max(10, self.workers), metricsCallback=lambda mD: latencyL.append(mD["latency"]), traceRecorder=tracer
+        )
+
+    def __entryIds(self):
+        return ["D_%010d" % (800000 + ii) for ii in range(self.entries)]
+
+    def __report(self, name, nOps, seconds, sampler, latencyL, requestLatencyL):
+        """Log and keep the measurements of a run (latencies in seconds)."""
+        rD = {
+            "operations": nOps,
+            "seconds": seconds,
+            "throughput": nOps / seconds if seconds else None,
+            "p50_ms": percentile(latencyL, 0.5) * 1000.0,
+            "p99_ms": percentile(latencyL, 0.99) * 1000.0,
+            "requests": len(requestLatencyL),
+            "request_p50_ms": percentile(requestLatencyL, 0.5) * 1000.0,
+            "request_p99_ms": percentile(requestLatencyL, 0.99) * 1000.0,
+            "cpu_seconds": sampler.cpu,
+            "cpu_ms_per_request": sampler.cpu * 1000.0 / max(1, len(requestLatencyL)),
+            "rss_growth_mb": sampler.rssGrowth / 1048576.0 if sampler.rssGrowth is not None else None,
+            "rss_peak_mb": ResourceSampler.peakRss() / 1048576.0 if resource is not None else None,
+        }
+        logger.info(
+            "%-8s %4d ops %7.3f s %8.1f ops/s p50 %7.1f ms p99 %7.1f ms (%d requests p50 %.1f ms p99 %.1f ms) cpu %.3f s (%.2f ms/request) rss +%s MB",
+            name,
+            nOps,
+            seconds,
+            rD["throughput"],
+            rD["p50_ms"],
+            rD["p99_ms"],
+            rD["requests"],
+            rD["request_p50_ms"],
+            rD["request_p99_ms"],
+            rD["cpu_seconds"],
+            rD["cpu_ms_per_request"],
+            "%.1f" % rD["rss_growth_mb"] if rD["rss_growth_mb"] is not None else "?",
+        )
+        self.resultD[name] = rD
+        return rD
+
+    def __checkOutputs(self, rL):
+        for rD in rL:
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            self.assertGreaterEqual(os.path.getsize(rD["output_file"]), self.entryBytes)
+
+    def __runSerial(self):
+        latencyL, requestLatencyL = [], []
+        cr = self.__client(requestLatencyL)
+        rL = []
+        with ResourceSampler() as sampler:
+            startTime = time.time()
+            for entryId in self.__entryIds():
+                tS = time.time()
+                fp = os.path.join(self.__workPath, "serial_%s.json" % entryId)
+                rD = cr.fetchEntryContent(entryId, "report-entry-example-test", "json", fp)
+                rD["output_file"] = fp
+                rL.append(rD)
+                latencyL.append(time.time() - tS)
+            seconds = time.time() - startTime
+        self.__checkOutputs(rL)
+        return self.__report("serial", len(rL), seconds, sampler, latencyL, requestLatencyL)
+
+    def testSingleRequests(self):
+        """Benchmark serial status requests in one session (per-request client overhead)"""
+        requestLatencyL = []
+        cr = self.__client(requestLatencyL)
+        cr.newSession()
+        for _ in range(10):
+            cr.getStatus()
+        del requestLatencyL[:]
+        with ResourceSampler() as sampler:
+            startTime = time.time()
+            for _ in range(self.requests):
+                self.assertFalse(cr.getStatus()["onedep_error_flag"])
+            seconds = time.time() - startTime
+        rD = self.__report("request", self.requests, seconds, sampler, requestLatencyL, requestLatencyL)
+        self.assertLess(rD["request_p99_ms"], self.p99BudgetMs)
+        self.assertLess(rD["cpu_ms_per_request"], self.cpuBudgetMs)
+
+    def testSerialThreadedAndBatch(self):
+        """Benchmark entry requests made one at a time, from a pool of threads and as a batch"""
+        serialD = self.__runSerial()
+        #
+        latencyL, requestLatencyL = [], []
+        cr = self.__client(requestLatencyL)
+        rL = []
+        lock = threading.Lock()
+        pendingL = self.__entryIds()
+
+        def worker():
+            while True:
+                with lock:
+                    if not pendingL:
+                        return
+                    entryId = pendingL.pop(0)
+                tS = time.time()
+                fp = os.path.join(self.__workPath, "threaded_%s.json" % entryId)
+                rD = cr.fetchEntryContent(entryId, "report-entry-example-test", "json", fp)
+                rD["output_file"] = fp
+                with lock:
+                    rL.append(rD)
+                    latencyL.append(time.time() - tS)
+
+        with ResourceSampler() as sampler:
+            startTime = time.time()
+            threadL = [threading.Thread(target=worker) for _ in range(self.workers)]
+            for th in threadL:
+                th.start()
+            for th in threadL:
+                th.join()
+            seconds = time.time() - startTime
+        self.__checkOutputs(rL)
+        threadedD = self.__report("threaded", len(rL), seconds, sampler, latencyL, requestLatencyL)
+        #
+        requestLatencyL = []
+        tracer = TraceRecorder()
+        cr = self.__client(requestLatencyL, tracer=tracer)
+        outputDir = os.path.join(self.__workPath, "batch")
+        os.makedirs(outputDir)
+        with ResourceSampler() as sampler:
+            startTime = time.time()
+            rL = cr.requestEntryContentMany(self.__entryIds(), "report-entry-example-test", maxWorkers=self.workers, outputDirPath=outputDir)
+            seconds = time.time() - startTime
+        self.__checkOutputs(rL)
+        # entry latencies of the batch are the durations of its session timeline events
+        latencyL = [eD["dur"] / 1.0e6 for eD in tracer.getEvents() if eD["name"] == "session"]
+        batchD = self.__report("batch", len(rL), seconds, sampler, latencyL, requestLatencyL)
+        #
+        for rD in [threadedD, batchD]:
+            self.assertGreaterEqual(rD["throughput"], self.minSpeedup * serialD["throughput"])
+            self.assertLess(rD["request_p99_ms"], self.p99BudgetMs)
+            self.assertLess(rD["cpu_ms_per_request"], self.cpuBudgetMs)
+
+
+if __name__ == "__main__":
+    unittest.main()
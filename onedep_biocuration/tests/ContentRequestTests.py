@@ -0,0 +1,275 @@
+##
+# File: ContentRequestTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the content request client using a local mock service"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from onedep_biocuration.api.ContentRequest import ContentRequest
+from onedep_biocuration.utils.ApiBase import ApiException
+from onedep_biocuration.utils.CompressedFile import detectCompression, openReport, zstandard
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+from onedep_biocuration.utils.PollPolicy import PollPolicy, TurnaroundEstimator
+from onedep_biocuration.utils.ReportCache import ReportCache
+from onedep_biocuration.utils.SessionPool import SessionPool
+
+
+class ContentRequestTests(unittest.TestCase):
+    def setUp(self):
+        self.__server = MockContentServer(workerDelay=0.5).start()
+        self.__workPath = tempfile.mkdtemp()
+        self.__policy = PollPolicy(initialDelay=0.05, maxDelay=0.2, estimator=TurnaroundEstimator(filePath=None))
+
+    def tearDown(self):
+        self.__server.stop()
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def testFetchEntryContent(self):
+        """Test the single entry session/request/wait/download sequence"""
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy)
+        fp = os.path.join(self.__workPath, "D_800004.json")
+        rD = cr.fetchEntryContent("D_800004", "report-entry-example-test", "json", fp)
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        with open(fp, "r") as ifh:
+            self.assertEqual(json.load(ifh)["entry_id"], "D_800004")
+
+    def testRequestEntryContentMany(self):
+        """Test bounded-concurrency batch entry requests"""
+        entryIdL = ["D_%010d" % (800000 + ii) for ii in range(16)]
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy)
+        startTime = time.time()
+        rL = cr.requestEntryContentMany(entryIdL, "report-entry-example-test", maxWorkers=8, outputDirPath=self.__workPath)
+        # two waves of eight concurrent 0.5 second requests
+        self.assertLess(time.time() - startTime, 4.0)
+        self.assertEqual([rD["entry_id"] for rD in rL], entryIdL)
+        for rD in rL:
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            with open(rD["output_file"], "r") as ifh:
+                self.assertEqual(json.load(ifh)["entry_id"], rD["entry_id"])
+
+    def testRequestEntryContentManyErrors(self):
+        """Test that per-entry failures are reported in the result list"""
+        cr = ContentRequest(apiUrl="http://127.0.0.1:1")
+        rL = cr.requestEntryContentMany(["D_800001", "D_800002"], "report-entry-example-test", maxWorkers=2, outputDirPath=self.__workPath)
+        self.assertEqual(len(rL), 2)
+        for rD in rL:
+            self.assertTrue(rD["onedep_error_flag"])
+            self.assertIsNone(rD["output_file"])
+
+    def testWaitForCompletionTimeout(self):
+        """Test the wait deadline"""
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy)
+        cr.newSession()
+        cr.requestEntryContent("D_800004", "report-entry-example-test", "json", worker_test_mode=True, worker_test_duration=5)
+        startTime = time.time()
+        rD = cr.waitForCompletion(timeout=0.3)
+        self.assertLess(time.time() - startTime, 1.0)
+        self.assertTrue(rD["onedep_error_flag"])
+        self.assertEqual(rD["status"], "running")
+
+    def testTurnaroundEstimate(self):
+        """Test that observed turnaround is saved and schedules the first poll"""
+        fp = os.path.join(self.__workPath, "turnaround.json")
+        policy = PollPolicy(initialDelay=0.05, maxDelay=0.2, jitter=0.0, estimator=TurnaroundEstimator(filePath=fp))
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=policy)
+        cr.newSession()
+        cr.requestEntryContent("D_800004", "report-entry-example-test", "json")
+        rD = cr.waitForCompletion()
+        self.assertEqual(rD["status"], "completed")
+        #
+        estimate = TurnaroundEstimator(filePath=fp).estimate("report-entry-example-test")
+        self.assertGreater(estimate, 0.4)
+        self.assertLess(estimate, 0.8)
+        pauseL = PollPolicy(initialDelay=0.05, maxDelay=1.0, jitter=0.0, estimator=TurnaroundEstimator(filePath=fp)).pauses("report-entry-example-test")
+        self.assertAlmostEqual(next(pauseL), estimate)
+        self.assertAlmostEqual(next(pauseL), 0.05)
+
+    def testLongTurnaroundEstimate(self):
+        """Test that estimates longer than the largest pause are waited out before the backoff starts"""
+        estimator = TurnaroundEstimator(filePath=None)
+        estimator.record("report-entry-long", 300.0)
+        pauseL = PollPolicy(initialDelay=1.0, maxDelay=60.0, jitter=0.0, estimator=estimator).pauses("report-entry-long", elapsed=10.0)
+        self.assertEqual([next(pauseL) for _ in range(9)], [60.0, 60.0, 60.0, 60.0, 50.0, 1.0, 2.0, 4.0, 8.0])
+
+    def testReportCache(self):
+        """Test that cached summary reports skip the service request flow"""
+        cache = ReportCache(cachePath=os.path.join(self.__workPath, "cache"), ttlD={"report-summary-short": 0.0})
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy, cache=cache)
+        fp1 = os.path.join(self.__workPath, "s1.json")
+        fp2 = os.path.join(self.__workPath, "s2.json")
+        rD = cr.fetchSummaryContent("report-summary-test", "json", fp1, query_site="PDBe")
+        self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        self.assertNotIn("cache_hit", rD)
+        rD = cr.fetchSummaryContent("report-summary-test", "json", fp2, query_site="PDBe")
+        self.assertTrue(rD["cache_hit"])
+        self.assertEqual(self.__server.count("session"), 1)
+        with open(fp1, "rb") as ifh1, open(fp2, "rb") as ifh2:
+            self.assertEqual(ifh1.read(), ifh2.read())
+        # different site and expired content types are requested again
+        rD = cr.fetchSummaryContent("report-summary-test", "json", fp2, query_site="RCSB")
+        self.assertNotIn("cache_hit", rD)
+        cr.fetchSummaryContent("report-summary-short", "json", fp2)
+        rD = cr.fetchSummaryContent("report-summary-short", "json", fp2)
+        self.assertNotIn("cache_hit", rD)
+        self.assertEqual(self.__server.count("session"), 4)
+
+    def testReportCacheEviction(self):
+        """Test least recently used eviction beyond the cache size limit"""
+        cache = ReportCache(cachePath=os.path.join(self.__workPath, "cache"), maxBytes=250)
+        fp = os.path.join(self.__workPath, "data.txt")
+        keyL = [ReportCache.makeKey("url", "D_%d" % ii, "report", "json") for ii in range(3)]
+        with open(fp, "w") as ofh:
+            ofh.write("x" * 100)
+        cache.put(keyL[0], fp)
+        time.sleep(0.01)
+        cache.put(keyL[1], fp)
+        time.sleep(0.01)
+        self.assertTrue(cache.get(keyL[0], fp))
+        cache.put(keyL[2], fp)
+        self.assertTrue(cache.get(keyL[0], fp))
+        self.assertFalse(cache.get(keyL[1], fp))
+        self.assertTrue(cache.get(keyL[2], fp))
+
+    def testSessionHandles(self):
+        """Test concurrent sessions driven through handles of a single client"""
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy)
+        shL = [cr.newSession() for _ in range(3)]
+        self.assertEqual(cr.getSession(), shL[-1]["session_id"])
+        self.assertEqual(len(set([sh.getSessionId() for sh in shL])), 3)
+        for ii, sh in enumerate(shL):
+            rD = sh.requestEntryContent("D_80000%d" % ii, "report-entry-example-test", "json")
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+        for ii, sh in enumerate(shL):
+            rD = sh.waitForCompletion(timeout=10.0)
+            self.assertEqual(rD["status"], "completed")
+            rD = sh.getIndex()
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            fp = os.path.join(self.__workPath, "out-%d.json" % ii)
+            rD = sh.getOutputByType(fp, "report-entry-example-test")
+            self.assertFalse(rD["onedep_error_flag"], rD["onedep_status_text"])
+            with open(fp, "rb") as ifh:
+                self.assertEqual(ifh.read(), self.__server.content(sh.getSessionId(), "report-entry-example-test", "json"))
+
+    def testRequestDetailsReleased(self):
+        """Test that request details are released after the output is fetched and are bounded in number"""
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy)
+        sh = cr.newSession()
+        sh.requestEntryContent("D_800001", "report-entry-example-test", "json")
+        self.assertEqual(cr.getRequestDetails()["entry_id"], "D_800001")
+        self.assertEqual(sh.waitForCompletion(timeout=10.0)["status"], "completed")
+        self.assertIsNotNone(cr.getRequestDetails(sh.getSessionId()))
+        self.assertFalse(sh.getOutputByType(os.path.join(self.__workPath, "out.json"), "report-entry-example-test")["onedep_error_flag"])
+        self.assertIsNone(cr.getRequestDetails(sh.getSessionId()))
+        #
+        cr.MAX_TRACKED_REQUESTS = 2
+        shL = [cr.newSession() for _ in range(3)]
+        for sh in shL:
+            sh.requestEntryContent("D_800002", "report-entry-example-test", "json")
+        self.assertEqual([cr.getRequestDetails(sh.getSessionId()) is None for sh in shL], [True, False, False])
+
+    def testIterOutputRecords(self):
+        """Test streaming the records of a summary output and checksum failure reporting"""
+        self.__server.summaryRecords = 1000
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy)
+        sh = cr.newSession()
+        sh.requestSummaryContent("report-summary-test", "json")
+        self.assertEqual(sh.waitForCompletion(timeout=10.0)["status"], "completed")
+        recordL = list(sh.iterOutputRecords("report-summary-test", keyPath=["data"]))
+        self.assertEqual(len(recordL), 1000)
+        self.assertEqual(recordL[-1]["entry_id"], "D_0000800999")
+        self.__server.badChecksum = True
+        with self.assertRaises(ApiException):
+            next(cr.iterOutputRecords("report-summary-test"))
+
+    def testCompressedTransfer(self):
+        """Test gzip-coded downloads are decoded as they stream and verified over the content"""
+        self.__server.summaryRecords = 2000
+        self.__server.gzipDownloads = True
+        for compressedTransfer in [True, False]:
+            cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy, compressedTransfer=compressedTransfer)
+            sh = cr.newSession()
+            sh.requestSummaryContent("report-summary-test", "json")
+            self.assertEqual(sh.waitForCompletion(timeout=10.0)["status"], "completed")
+            fp = os.path.join(self.__workPath, "summary.json")
+            nBytes = self.__server.count("download_bytes")
+            rD = sh.getOutputByType(fp, "report-summary-test")
+            self.assertFalse(rD["onedep_error_flag"])
+            content = self.__server.content(sh.getSessionId(), "report-summary-test", "json")
+            with open(fp, "rb") as ifh:
+                self.assertEqual(ifh.read(), content)
+            nBytes = self.__server.count("download_bytes") - nBytes
+            if compressedTransfer:
+                self.assertLess(nBytes * 10, len(content))
+            else:
+                self.assertEqual(nBytes, len(content))
+
+    def testCompressedStorage(self):
+        """Test storing outputs compressed on disk and reading them back transparently"""
+        self.__server.summaryRecords = 2000
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy, conditionalDownloads=True)
+        sh = cr.newSession()
+        sh.requestSummaryContent("report-summary-test", "json")
+        self.assertEqual(sh.waitForCompletion(timeout=10.0)["status"], "completed")
+        content = self.__server.content(sh.getSessionId(), "report-summary-test", "json")
+        for compression in ["gzip", "zstd"]:
+            fp = os.path.join(self.__workPath, "summary.json." + compression)
+            if compression == "zstd" and zstandard is None:
+                self.assertRaises(ValueError, sh.getOutputByType, fp, "report-summary-test", compression=compression)
+                continue
+            rD = sh.getOutputByType(fp, "report-summary-test", compression=compression)
+            self.assertFalse(rD["onedep_error_flag"])
+            self.assertEqual(detectCompression(fp), compression)
+            self.assertLess(os.path.getsize(fp) * 10, len(content))
+            with openReport(fp) as ifh:
+                self.assertEqual(ifh.read(), content)
+            with openReport(fp, "r") as ifh:
+                self.assertEqual(json.load(ifh)["data"][-1]["entry_id"], "D_0000801999")
+            # the stored content is compared with the service checksum before any transfer
+            self.assertTrue(sh.getOutputByType(fp, "report-summary-test", compression=compression).get("download_skipped"))
+            recordL = list(sh.iterOutputRecords("report-summary-test", filePath=fp, keyPath=["data"], compression=compression))
+            self.assertEqual(len(recordL), 2000)
+
+    def testSessionPool(self):
+        """Test that new sessions are leased from pre-created spare sessions"""
+        pool = SessionPool(ContentRequest(apiUrl=self.__server.apiUrl), size=3, maxAge=60.0)
+        try:
+            for _ in range(50):
+                if pool.available() == 3:
+                    break
+                time.sleep(0.02)
+            self.assertEqual(pool.available(), 3)
+            cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy, sessionPool=pool)
+            rD = cr.newSession()
+            self.assertFalse(rD["onedep_error_flag"])
+            self.assertEqual(cr.getSession(), rD["session_id"])
+            sessionIdL = [rD["session_id"]] + [pool.lease(wait=1.0)["session_id"] for _ in range(5)]
+            self.assertEqual(len(set(sessionIdL)), 6)
+            rL = cr.requestEntryContentMany(["D_800001", "D_800002"], "report-entry-example-test", maxWorkers=2, outputDirPath=self.__workPath)
+            self.assertFalse(any([rD["onedep_error_flag"] for rD in rL]))
+        finally:
+            pool.close()
+
+    def testSessionPoolRetirement(self):
+        """Test that aged spare sessions are retired"""
+        pool = SessionPool(ContentRequest(apiUrl=self.__server.apiUrl), size=2, maxAge=0.2)
+        try:
+            time.sleep(0.5)
+            self.assertGreater(self.__server.count("session"), 2)
+            self.assertLessEqual(pool.available(), 2)
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+##
+# File: JsonCodecTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  compare decode times only when ONEDEP_RUN_BENCHMARKS is set
+##
+"""Test cases and micro-benchmark for decoding service responses with JsonCodec"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import time
+import unittest
+
+import requests
+
+from onedep_biocuration.utils.JsonCodec import JsonCodec, orjson
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+
+class JsonCodecTests(unittest.TestCase):
+    def setUp(self):
+        indexD = {}
+        for ii in range(200):
+            ct = "report-entry-example-%d" % ii
+            indexD[ct] = ["%s.json" % ct, "json"]
+        self.__payloadD = {
+            "session_index": json.dumps({"errorflag": False, "statusmessage": "ok", "index": indexD}).encode("utf-8"),
+            "session_status": json.dumps({"errorflag": False, "statusmessage": "ok", "status": "running", "session_id": "8d1f6a1c-58a2-4c44-a0c3"}).encode("utf-8"),
+        }
+
+    def __response(self, payload):
+        """Return a requests response for the input payload (JSON without a declared charset, as served)."""
+        response = requests.models.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = payload  # pylint: disable=protected-access
+        return response
+
+    def testBackends(self):
+        """Test decoding from bytes and text with each available backend"""
+        backendL = ["json"] + (["orjson"] if orjson is not None else [])
+        for backend in backendL:
+            codec = JsonCodec(backend=backend)
+            self.assertEqual(codec.getBackendName(), backend)
+            for payload in self.__payloadD.values():
+                self.assertEqual(codec.loads(payload), json.loads(payload.decode("utf-8")))
+                self.assertEqual(codec.loads(payload.decode("utf-8")), json.loads(payload.decode("utf-8")))
+            self.assertEqual(codec.loads(b'{"title": "Entr\\u00e9e \\ud83d\\ude00"}'), {"title": "Entr\u00e9e \U0001f600"})
+            self.assertEqual(json.loads(codec.dumps({"a": [1, "b"]})), {"a": [1, "b"]})
+            self.assertRaises(ValueError, codec.loads, b'{"a": ')
+        self.assertRaises(ValueError, JsonCodec, backend="yaml")
+
+    def testDecodeBenchmark(self):
+        """Micro-benchmark decoding session_index and status payloads from bytes against json.loads(response.text)"""
+        codec = JsonCodec()
+        repeat = 300
+        for name, payload in self.__payloadD.items():
+            # fresh responses so that the text (and charset detection) is not cached between decodes
+            responseL = [self.__response(payload) for _ in range(repeat)]
+            startTime = time.time()
+            baselineL = [json.loads(response.text) for response in responseL]
+            baseline = time.time() - startTime
+            startTime = time.time()
+            decodedL = [codec.loads(response.content) for response in responseL]
+            elapsed = time.time() - startTime
+            self.assertEqual(decodedL, baselineL)
+            logger.info("%s (%d bytes) x %d: response.text + json %.4f s, %s from bytes %.4f s", name, len(payload), repeat, baseline, codec.getBackendName(), elapsed)
+            # wall-clock comparisons are left to benchmark runs as they are unreliable on loaded hosts
+            if os.getenv("ONEDEP_RUN_BENCHMARKS"):
+                self.assertLess(elapsed, baseline)
+
+
+if __name__ == "__main__":
+    unittest.main()
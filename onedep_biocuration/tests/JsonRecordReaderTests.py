@@ -0,0 +1,137 @@
+##
+# File: JsonRecordReaderTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  test skipped members and keyPath within top-level arrays
+##
+"""Test cases for the incremental JSON record reader"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+from onedep_biocuration.utils.JsonRecordReader import JsonRecordReader, iterSummaryRecords
+
+
+class JsonRecordReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def __write(self, obj, indent=None):
+        fp = os.path.join(self.__workPath, "report.json")
+        with io.open(fp, "w", encoding="utf-8") as ofh:
+            ofh.write(json.dumps(obj, indent=indent, ensure_ascii=False))
+        return fp
+
+    def testRecordLayouts(self):
+        """Test records of top-level arrays and of arrays held by (nested) object members across small blocks"""
+        recordL = [{"entry_id": "D_%010d" % ii, "value": ii * 1234567.25, "title": 'Entrée "%d" \\ ☃' % ii, "flags": [True, None]} for ii in range(50)]
+        docL = [
+            (recordL, recordL),
+            ({"content_type": "report", "count": 12345, "data": recordL}, recordL),
+            ({"deposition": recordL[:20], "meta": {"em_admin": recordL[20:]}, "site": "PDBe"}, recordL),
+            ({"data": []}, []),
+            ({}, []),
+        ]
+        for obj, expectedL in docL:
+            for indent in [None, 2]:
+                fp = self.__write(obj, indent=indent)
+                for blockSize in [1, 7, 1024]:
+                    self.assertEqual(list(JsonRecordReader(fp, blockSize=blockSize)), expectedL)
+
+    def testKeyPath(self):
+        """Test selection of the records of one array"""
+        recordL = [{"id": ii} for ii in range(10)]
+        fp = self.__write({"data": [{"id": -1}], "tables": {"a": recordL, "b": [{"id": 99}]}})
+        self.assertEqual(list(iterSummaryRecords(fp, keyPath=["tables", "a"], blockSize=5)), recordL)
+        self.assertEqual(list(iterSummaryRecords(fp, keyPath=["data"])), [{"id": -1}])
+        self.assertEqual(list(iterSummaryRecords(fp, keyPath=["missing"])), [])
+
+    def testSkippedMembers(self):
+        """Test skipping members holding strings with escapes and brackets across small blocks"""
+        recordL = [{"id": ii} for ii in range(5)]
+        skipL = ['a "quoted" ] } [ { \\', "\\", '\\"', "é☃\U0001f600"]
+        obj = {"s": skipL[0], "nested": {"x": [skipL, {"y": skipL}], "n": -1.5e3}, "t": True, "z": None, "data": recordL, "after": skipL}
+        for indent in [None, 1]:
+            fp = self.__write(obj, indent=indent)
+            for blockSize in [1, 2, 3, 7, 1024]:
+                self.assertEqual(list(JsonRecordReader(fp, keyPath=["data"], blockSize=blockSize)), recordL)
+        fp = self.__write({"skip": {"a": ["unterminated"]}, "data": [1]})
+        with open(fp, "r") as ifh:
+            text = ifh.read()
+        with open(fp, "w") as ofh:
+            ofh.write(text[:20])
+        self.assertRaises(ValueError, list, JsonRecordReader(fp, keyPath=["data"], blockSize=4))
+
+    def testTopLevelArrayKeyPath(self):
+        """Test selection of the records along keyPath in the object elements of a top-level array"""
+        docL = [{"data": [{"id": 1}, {"id": 2}], "other": [{"id": -1}]}, [0, 1], "text", {"data": []}, {"meta": {}, "data": [{"id": 3}]}]
+        fp = self.__write(docL)
+        for blockSize in [1, 5, 1024]:
+            self.assertEqual(list(JsonRecordReader(fp, keyPath=["data"], blockSize=blockSize)), [{"id": 1}, {"id": 2}, {"id": 3}])
+        self.assertEqual(list(JsonRecordReader(fp, keyPath=["missing"])), [])
+        self.assertEqual(list(JsonRecordReader(fp)), docL)
+        for blockSize in [1, 2, 3]:
+            self.assertEqual(list(JsonRecordReader(io.StringIO("[1.5, -2.5e10, 3, {}]"), blockSize=blockSize)), [1.5, -2.5e10, 3, {}])
+            self.assertEqual(list(JsonRecordReader(io.StringIO('{"n": -25000000000.0, "data": [1]}'), blockSize=blockSize)), [1])
+
+    def testFileObjects(self):
+        """Test reading from binary file objects with multi-byte characters split across blocks"""
+        recordL = [{"name": "é☃\U0001f600" * 3, "n": ii} for ii in range(20)]
+        data = json.dumps({"data": recordL}, ensure_ascii=False).encode("utf-8")
+        self.assertEqual(list(JsonRecordReader(io.BytesIO(data), blockSize=3)), recordL)
+        self.assertEqual(list(JsonRecordReader(io.StringIO(data.decode("utf-8")), blockSize=3)), recordL)
+
+    def testMalformed(self):
+        """Test that truncated documents raise ValueError"""
+        fp = os.path.join(self.__workPath, "bad.json")
+        with open(fp, "w") as ofh:
+            ofh.write('{"data": [{"id": 1}, {"id": 2')
+        reader = iter(JsonRecordReader(fp, blockSize=4))
+        self.assertEqual(next(reader), {"id": 1})
+        self.assertRaises(ValueError, next, reader)
+
+    def testBoundedMemory(self):
+        """Test that memory use does not grow with the number of records"""
+        fp = os.path.join(self.__workPath, "large.json")
+        with open(fp, "w") as ofh:
+            ofh.write('{"content_type": "report-summary-test", "data": [')
+            for ii in range(200000):
+                ofh.write('%s{"entry_id": "D_%010d", "status_code": "REL", "title": "Mock entry %d"}' % ("," if ii else "", ii, ii))
+            ofh.write("]}")
+        tracemalloc.start()
+        try:
+            count = 0
+            for record in JsonRecordReader(fp, blockSize=65536):
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 200000)
+        self.assertEqual(record["entry_id"], "D_0000199999")
+        self.assertLess(peak, 2 * 1024 * 1024)
+        self.assertGreater(os.path.getsize(fp), 10 * peak)
+        # records of other arrays are skipped without being decoded
+        tracemalloc.start()
+        try:
+            recordL = list(JsonRecordReader(fp, keyPath=["missing"], blockSize=65536))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(recordL, [])
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
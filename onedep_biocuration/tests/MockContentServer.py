@@ -0,0 +1,338 @@
+##
+# File: MockContentServer.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  count accepted connections
+#  18-Oct-2026  optionally gzip download bodies for clients accepting gzip
+#  18-Oct-2026  inject error responses and checksum failures for a number of requests
+#  18-Oct-2026  optional delay before each response
+#  18-Oct-2026  optional entry output size and command line entry point running the server in its own process
+#  18-Oct-2026  disable Nagle's algorithm on accepted connections
+#  18-Oct-2026  reach the mock through the server instance and serve threaded on Python 2
+##
+"""Local stand-in for the OneDep contentws service used by the client test cases."""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+import uuid
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse  # noqa: F401
+
+    class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+
+class MockContentServer(object):
+    """Threaded HTTP server implementing the contentws endpoints used by ContentRequest.
+
+    Sessions complete after `workerDelay` seconds (or `worker_test_duration` when the request
+    is made with `worker_test_mode`). Output content is generated deterministically from the
+    requested entry/content type so that client downloads can be verified.
+    """
+
+    def __init__(self, workerDelay=0.0, apiName="contentws", summaryRecords=10, entryBytes=0):
+        self.workerDelay = workerDelay
+        self.apiName = apiName
+        self.summaryRecords = summaryRecords
+        # pad entry outputs to about this many bytes
+        self.entryBytes = entryBytes
+        self.badChecksum = False
+        # send a wrong checksum with this many of the next downloads
+        self.badChecksumCount = 0
+        # reply to the next requests to an endpoint with these (status code, Retry-After or None) e.g. {"session_status": [(503, "1")]}
+        self.failD = {}
+        # pause (seconds) before replying to each request (server queue time)
+        self.responseDelay = 0.0
+        self.honorIfNoneMatch = True
+        # send download bodies gzip-coded to clients accepting gzip (the checksum is that of the content)
+        self.gzipDownloads = False
+        # drop the connection after sending this many body bytes of the next 'dropCount' downloads
+        self.dropAfterBytes = None
+        self.dropCount = 0
+        self.sessionD = {}
+        self.countD = {}
+        self.lock = threading.Lock()
+        self.__httpd = None
+        self.__thread = None
+
+    @property
+    def apiUrl(self):
+        host, port = self.__httpd.server_address[:2]
+        return "http://%s:%d" % (host, port)
+
+    def start(self):
+        self.__httpd = ThreadingHTTPServer(("127.0.0.1", 0), MockContentHandler)
+        # handlers reach this instance as self.server.mock
+        self.__httpd.mock = self
+        self.__httpd.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__httpd.serve_forever)
+        self.__thread.daemon = True
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        if self.__httpd:
+            self.__httpd.shutdown()
+            self.__httpd.server_close()
+            self.__httpd = None
+
+    def count(self, endPoint):
+        with self.lock:
+            return self.countD.get(endPoint, 0)
+
+    def tally(self, endPoint, n=1):
+        with self.lock:
+            self.countD[endPoint] = self.countD.get(endPoint, 0) + n
+
+    def nextFailure(self, endPoint):
+        """Return the (status code, Retry-After) injected for the next request to endPoint or None."""
+        with self.lock:
+            failL = self.failD.get(endPoint)
+            return failL.pop(0) if failL else None
+
+    def content(self, sessionId, contentType, formatType):
+        """Return the output body for the input session content request or None."""
+        with self.lock:
+            sD = self.sessionD.get(sessionId)
+        if not sD or sD.get("request_content_type") != contentType:
+            return None
+        if sD.get("request_dataset_id"):
+            oD = {"entry_id": sD["request_dataset_id"], "content_type": contentType, "format_type": formatType}
+            if self.entryBytes:
+                line = "%s %s\n" % (sD["request_dataset_id"], contentType)
+                oD["padding"] = (line * (self.entryBytes // len(line) + 1))[: self.entryBytes]
+        else:
+            oD = {"content_type": contentType, "format_type": formatType, "query_site": sD.get("query_site"), "data": []}
+            for ii in range(self.summaryRecords):
+                oD["data"].append({"entry_id": "D_%010d" % (800000 + ii), "status_code": "REL", "title": "Mock entry %d" % ii})
+        return json.dumps(oD, indent=2, sort_keys=True).encode("utf-8")
+
+
+class MockContentHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes - without TCP_NODELAY each small response waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.mock.tally("connection")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def __reply(self, code, body, headers=None):
+        self.send_response(code)
+        for ky, val in (headers or {}).items():
+            self.send_header(ky, val)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def __replyJson(self, code, dD):
+        self.__reply(code, json.dumps(dD).encode("utf-8"), {"Content-Type": "application/json"})
+
+    def __replyFailure(self, endPoint):
+        failure = self.server.mock.nextFailure(endPoint)
+        if failure is None:
+            return False
+        code, retryAfter = failure
+        hD = {"Content-Type": "application/json"}
+        if retryAfter:
+            hD["Retry-After"] = retryAfter
+        self.__reply(code, json.dumps({"statustext": "Injected failure %d" % code}).encode("utf-8"), hD)
+        return True
+
+    def __endPoint(self):
+        path = urlparse(self.path).path
+        prefix = "/service/%s/" % self.server.mock.apiName
+        return path[len(prefix) :] if path.startswith(prefix) else None
+
+    def __body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            partL = []
+            while True:
+                size = int(self.rfile.readline().strip().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                partL.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(partL)
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        return self.rfile.read(length) if length else b""
+
+    def __params(self):
+        pD = {}
+        for ky, vL in parse_qs(urlparse(self.path).query).items():
+            pD[ky] = vL[-1]
+        body = self.__body()
+        if body:
+            if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+                for ky, vL in parse_qs(body.decode("utf-8")).items():
+                    pD[ky] = vL[-1]
+        return pD
+
+    def __upload(self):
+        """Stream a multipart upload (file part last) hashing the file content block by block."""
+        boundary = self.headers.get("Content-Type", "").split("boundary=")[-1]
+        length = int(self.headers["Content-Length"])
+        trailer = ("\r\n--%s--\r\n" % boundary).encode("utf-8")
+        head = b""
+        while b"filename=" not in head or not head.endswith(b"\r\n\r\n"):
+            head += self.rfile.read(1)
+        pD = {}
+        for part in head.decode("utf-8").split("--%s\r\n" % boundary)[1:-1]:
+            hdr, val = part.split("\r\n\r\n", 1)
+            pD[hdr.split('name="')[1].split('"')[0]] = val[:-2]
+        md5 = hashlib.md5()
+        remaining = length - len(head) - len(trailer)
+        nBytes = remaining
+        while remaining > 0:
+            block = self.rfile.read(min(65536, remaining))
+            md5.update(block)
+            remaining -= len(block)
+        self.rfile.read(len(trailer))
+        ok = md5.hexdigest() == pD.get("checksum_md5")
+        self.__replyJson(200, {"errorflag": not ok, "statusmessage": "ok" if ok else "checksum mismatch", "upload_size": nBytes, "content_type": pD.get("content_type")})
+
+    def do_POST(self):
+        endPoint = self.__endPoint()
+        if endPoint == "upload":
+            self.server.mock.tally(endPoint)
+            self.__upload()
+            return
+        pD = self.__params()
+        self.server.mock.tally(endPoint)
+        if self.server.mock.responseDelay:
+            time.sleep(self.server.mock.responseDelay)
+        if self.__replyFailure(endPoint):
+            return
+        if endPoint == "session":
+            sessionId = uuid.uuid4().hex
+            with self.server.mock.lock:
+                self.server.mock.sessionD[sessionId] = {"created": time.time()}
+            self.__replyJson(200, {"errorflag": False, "statusmessage": "ok", "session_id": sessionId})
+            return
+        sessionId = pD.get("session_id")
+        with self.server.mock.lock:
+            sD = self.server.mock.sessionD.get(sessionId)
+        if sD is None:
+            self.__replyJson(404, {"statustext": "Unknown session %r" % sessionId})
+            return
+        if endPoint in ["entry_content", "summary_content"]:
+            delay = self.server.mock.workerDelay
+            if pD.get("worker_test_mode") in ["True", "true", "1"]:
+                delay = float(pD.get("worker_test_duration", delay))
+            with self.server.mock.lock:
+                sD.update(pD)
+                sD["submitted"] = time.time()
+                sD["delay"] = delay
+            self.__replyJson(200, {"errorflag": False, "statusmessage": "ok", "status": "submitted"})
+        elif endPoint == "session_status":
+            self.__replyJson(200, {"errorflag": False, "statusmessage": "ok", "status": self.__status(sD)})
+        elif endPoint == "session_index":
+            iD = {}
+            if self.__status(sD) == "completed":
+                ct = sD["request_content_type"]
+                fmt = sD.get("request_format_type", "json")
+                iD[ct] = ["%s.%s" % (ct, fmt), fmt]
+            self.__replyJson(200, {"errorflag": False, "statusmessage": "ok", "index": iD})
+        else:
+            self.__replyJson(404, {"statustext": "Unknown endpoint %r" % endPoint})
+
+    def do_GET(self):
+        endPoint = self.__endPoint()
+        pD = self.__params()
+        self.server.mock.tally(endPoint)
+        if self.server.mock.responseDelay:
+            time.sleep(self.server.mock.responseDelay)
+        if self.__replyFailure(endPoint):
+            return
+        if endPoint != "download":
+            self.__replyJson(404, {"statustext": "Unknown endpoint %r" % endPoint})
+            return
+        body = self.server.mock.content(pD.get("session_id"), pD.get("contenttype"), pD.get("formattype", "json"))
+        if body is None:
+            self.__replyJson(404, {"statustext": "No content for %r" % pD.get("contenttype")})
+            return
+        with self.server.mock.lock:
+            badChecksum = self.server.mock.badChecksum or self.server.mock.badChecksumCount > 0
+            self.server.mock.badChecksumCount = max(0, self.server.mock.badChecksumCount - 1)
+        checksum = hashlib.md5(body + b"x" if badChecksum else body).hexdigest()
+        hD = {"Content-Type": "application/octet-stream", "checksum_md5": checksum, "Accept-Ranges": "bytes", "ETag": '"%s"' % checksum}
+        if self.server.mock.honorIfNoneMatch and self.headers.get("If-None-Match") == hD["ETag"]:
+            self.__reply(304, b"", hD)
+            return
+        code = 200
+        rangeSpec = self.headers.get("Range", "")
+        if rangeSpec.startswith("bytes=") and rangeSpec.endswith("-"):
+            start = int(rangeSpec[6:-1])
+            if start >= len(body):
+                self.__reply(416, b"", {"Content-Range": "bytes */%d" % len(body)})
+                return
+            hD["Content-Range"] = "bytes %d-%d/%d" % (start, len(body) - 1, len(body))
+            body = body[start:]
+            code = 206
+        elif self.server.mock.gzipDownloads and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            hD["Content-Encoding"] = "gzip"
+        self.server.mock.tally("download_bytes", len(body))
+        with self.server.mock.lock:
+            drop = self.server.mock.dropAfterBytes is not None and self.server.mock.dropCount > 0
+            if drop:
+                self.server.mock.dropCount -= 1
+        if drop:
+            self.send_response(code)
+            for ky, val in hD.items():
+                self.send_header(ky, val)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body[: self.server.mock.dropAfterBytes])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.__reply(code, body, hD)
+
+    def __status(self, sD):
+        if "submitted" not in sD:
+            return "created"
+        return "completed" if time.time() - sD["submitted"] >= sD["delay"] else "running"
+
+
+def main(argv=None):
+    """Run the server until standard input is closed, printing the service URL on the first line of standard output."""
+    parser = argparse.ArgumentParser(description="Local stand-in for the OneDep contentws service")
+    parser.add_argument("--worker_delay", type=float, default=0.0, help="Session request turnaround (seconds)")
+    parser.add_argument("--response_delay", type=float, default=0.0, help="Pause before each response (seconds)")
+    parser.add_argument("--summary_records", type=int, default=10, help="Records in summary outputs")
+    parser.add_argument("--entry_bytes", type=int, default=0, help="Pad entry outputs to about this many bytes")
+    args = parser.parse_args(argv)
+    server = MockContentServer(workerDelay=args.worker_delay, summaryRecords=args.summary_records, entryBytes=args.entry_bytes)
+    server.responseDelay = args.response_delay
+    server.start()
+    try:
+        sys.stdout.write(server.apiUrl + "\n")
+        sys.stdout.flush()
+        sys.stdin.read()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+##
+# File: RateLimiterTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for token-bucket rate limits shared by threads and processes"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+from onedep_biocuration.utils.ApiBase import ApiBase
+from onedep_biocuration.utils.RateLimiter import RateLimiter, TokenBucket
+
+
+class RateLimiterTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def testTokenBucketThreads(self):
+        """Test that threads sharing a bucket are admitted at the bucket rate after the initial burst"""
+        bucket = TokenBucket(20.0, burst=5)
+
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+
+        startTime = time.time()
+        threadL = [threading.Thread(target=worker) for _ in range(5)]
+        for th in threadL:
+            th.start()
+        for th in threadL:
+            th.join()
+        # 25 requests = 5 (burst) + 20 at 20 per second
+        self.assertGreaterEqual(time.time() - startTime, 0.9)
+        self.assertLess(time.time() - startTime, 2.0)
+        self.assertFalse(bucket.acquire(timeout=0.01))
+        self.assertTrue(bucket.acquire(timeout=0.1))
+        self.assertRaises(ValueError, TokenBucket, 0.0)
+
+    def testTokenBucketProcesses(self):
+        """Test that processes sharing a bucket state file are admitted at the combined bucket rate"""
+        statePath = os.path.join(self.__workPath, "status.json")
+        script = "\n".join(
+            [
+                "from onedep_biocuration.utils.RateLimiter import TokenBucket",
+                "bucket = TokenBucket(20.0, burst=1, statePath=%r)" % statePath,
+                "for _ in range(10):",
+                "    bucket.acquire()",
+            ]
+        )
+        startTime = time.time()
+        topPath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        procL = [subprocess.Popen([sys.executable, "-c", script], cwd=topPath) for _ in range(3)]
+        for proc in procL:
+            self.assertEqual(proc.wait(), 0)
+        # 30 requests at 20 per second (less the initial token)
+        self.assertGreaterEqual(time.time() - startTime, 1.4)
+
+    def testApiBaseBudgets(self):
+        """Test separate request budgets for session creation and status polling"""
+        server = MockContentServer().start()
+        try:
+            limiter = RateLimiter({"session": (1.0, 1), "status": (50.0, 5)}, statePath=os.path.join(self.__workPath, "budgets"), timeout=0.5)
+            self.assertEqual(limiter.getBudget("session_status"), "status")
+            self.assertIsNone(limiter.getBudget("entry_content"))
+            ab = ApiBase(apiUrl=server.apiUrl, apiName="contentws", rateLimiter=limiter)
+            self.assertFalse(ab.createSession()["onedep_error_flag"])
+            rD = ab.post("session")
+            self.assertTrue(rD["rate_limited"])
+            self.assertEqual(server.count("session"), 1)
+            startTime = time.time()
+            for _ in range(30):
+                self.assertFalse(ab.post("session_status")["onedep_error_flag"])
+            self.assertGreaterEqual(time.time() - startTime, 0.45)
+            self.assertTrue(os.path.exists(os.path.join(self.__workPath, "budgets", "status.json")))
+        finally:
+            server.stop()
+
+    def testUnavailableStateFile(self):
+        """Test that buckets fall back to the state of this process when the state directory is removed"""
+        server = MockContentServer().start()
+        try:
+            statePath = os.path.join(self.__workPath, "budgets")
+            limiter = RateLimiter({"status": (100.0, 2)}, statePath=statePath, timeout=1.0)
+            ab = ApiBase(apiUrl=server.apiUrl, apiName="contentws", rateLimiter=limiter)
+            self.assertFalse(ab.createSession()["onedep_error_flag"])
+            shutil.rmtree(statePath)
+            startTime = time.time()
+            for _ in range(12):
+                self.assertFalse(ab.post("session_status")["onedep_error_flag"])
+            # 12 requests = 2 (burst) + 10 at 100 per second
+            self.assertGreaterEqual(time.time() - startTime, 0.09)
+            self.assertFalse(os.path.exists(statePath))
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
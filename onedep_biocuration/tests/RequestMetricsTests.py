@@ -0,0 +1,104 @@
+##
+# File: RequestMetricsTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for request metrics records, histogram aggregation and the Prometheus textfile exporter"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+from onedep_biocuration.utils.ApiBase import ApiBase
+from onedep_biocuration.utils.RequestMetrics import RequestMetrics, TextfileExporter
+from onedep_biocuration.utils.RetryPolicy import RetryPolicy
+
+
+class RequestMetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.__server = MockContentServer(summaryRecords=2000).start()
+        self.__workPath = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.__server.stop()
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def testRequestRecords(self):
+        """Test the phases, sizes and outcomes recorded for each request"""
+        recordL = []
+        ab = ApiBase(apiUrl=self.__server.apiUrl, apiName="contentws", metricsCallback=recordL.append)
+        self.assertFalse(ab.createSession()["onedep_error_flag"])
+        self.assertFalse(ab.post("summary_content", request_content_type="report-summary-test", request_format_type="json")["onedep_error_flag"])
+        self.__server.responseDelay = 0.2
+        self.assertFalse(ab.post("session_status")["onedep_error_flag"])
+        self.__server.responseDelay = 0.0
+        fp = os.path.join(self.__workPath, "summary.json")
+        self.assertFalse(ab.download(fp, "report-summary-test", "json")["onedep_error_flag"])
+        self.assertEqual([mD["endpoint"] for mD in recordL], ["session", "summary_content", "session_status", "download"])
+        for mD in recordL:
+            self.assertEqual(mD["status_code"], 200)
+            self.assertFalse(mD["error"])
+            self.assertEqual(mD["retries"], 0)
+            self.assertGreater(mD["bytes_received"], 0)
+            for phase in ["latency", "wait", "connect", "ttfb", "transfer"]:
+                self.assertGreaterEqual(mD[phase], 0.0)
+        # a new connection is opened for the first request only and the server delay shows as time to first byte
+        self.assertGreater(recordL[0]["connect"], 0.0)
+        self.assertEqual(recordL[2]["connect"], 0.0)
+        self.assertGreater(recordL[1]["bytes_sent"], 0)
+        self.assertGreaterEqual(recordL[2]["ttfb"], 0.2)
+        self.assertLess(recordL[2]["transfer"], 0.2)
+        self.assertEqual(recordL[3]["checksum"], "ok")
+        self.assertGreaterEqual(recordL[3]["write"], 0.0)
+        self.assertEqual(recordL[3]["bytes_received"], os.path.getsize(fp))
+        self.assertIsNone(recordL[0]["checksum"])
+        #
+        ab.setRetryPolicy(RetryPolicy(initialDelay=0.01, maxAttempts=2))
+        self.__server.badChecksum = True
+        ab.download(fp, "report-summary-test", "json")
+        self.assertEqual(recordL[-1]["checksum"], "failed")
+        self.assertEqual(recordL[-1]["retries"], 1)
+        self.__server.failD["entry_content"] = [(503, None)]
+        ab.post("entry_content", request_dataset_id="D_800001", request_content_type="report-entry-example-test")
+        self.assertEqual(recordL[-1]["status_code"], 503)
+        self.assertTrue(recordL[-1]["error"])
+
+    def testAggregationAndExport(self):
+        """Test histogram aggregation and Prometheus textfile output"""
+        metrics = RequestMetrics()
+        ab = ApiBase(apiUrl=self.__server.apiUrl, apiName="contentws", metricsCallback=metrics)
+        ab.createSession()
+        for _ in range(5):
+            ab.post("session_status")
+        self.__server.failD["session_index"] = [(503, None)]
+        ab.post("session_index")
+        hist = metrics.getHistogram("latency", "session_status")
+        self.assertEqual(hist.count, 5)
+        self.assertLessEqual(hist.quantile(0.5), hist.quantile(0.99))
+        self.assertEqual(metrics.getCounter("requests_total", endpoint="session_status"), 5)
+        self.assertEqual(metrics.getCounter("requests_total", code="503"), 1)
+        self.assertEqual(metrics.getCounter("errors_total"), 1)
+        #
+        fp = os.path.join(self.__workPath, "onedep_client.prom")
+        exporter = TextfileExporter(metrics, fp, interval=60.0).start()
+        exporter.stop()
+        with open(fp, "r") as ifh:
+            lineL = ifh.read().splitlines()
+        self.assertIn("# TYPE onedep_client_request_latency_seconds histogram", lineL)
+        self.assertIn('onedep_client_request_latency_seconds_count{endpoint="session_status"} 5', lineL)
+        self.assertIn('onedep_client_request_latency_seconds_bucket{endpoint="session_status",le="+Inf"} 5', lineL)
+        self.assertIn('onedep_client_requests_total{endpoint="session_index",code="503"} 1', lineL)
+        for line in lineL:
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+        self.assertEqual(os.listdir(self.__workPath), ["onedep_client.prom"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+##
+# File: StartupBudgetTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  check the import time budget only when ONEDEP_RUN_BENCHMARKS is set and skip before Python 3.7
+##
+"""Test cases for command line startup cost (python -X importtime) and deferred imports"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(HERE))
+
+# modules which only network operations should load
+HTTP_STACK = ["requests", "urllib3", "six", "onedep_biocuration.api.ContentRequest", "onedep_biocuration.utils.ApiBase"]
+
+
+# subprocess.run(capture_output=True) and python -X importtime
+@unittest.skipIf(sys.version_info < (3, 7), "requires Python 3.7")
+class StartupBudgetTests(unittest.TestCase):
+    # cumulative import time budget (milliseconds) for the command line module
+    budgetMs = float(os.getenv("ONEDEP_STARTUP_BUDGET_MS", "150"))
+
+    def __python(self, *argL):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join([TOPDIR, env.get("PYTHONPATH", "")])
+        return subprocess.run([sys.executable] + list(argL), cwd=TOPDIR, env=env, capture_output=True, check=False, universal_newlines=True)
+
+    def __loadedModules(self, code):
+        """Return the names of the loaded modules (matching HTTP_STACK) after running the input code."""
+        code += "\nimport sys, json\nprint(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in %r or m in %r)))" % (HTTP_STACK, HTTP_STACK)
+        rsp = self.__python("-c", code)
+        self.assertEqual(rsp.returncode, 0, rsp.stderr)
+        return json.loads(rsp.stdout.splitlines()[-1])
+
+    @unittest.skipUnless(os.getenv("ONEDEP_RUN_BENCHMARKS"), "timing check - set ONEDEP_RUN_BENCHMARKS=1")
+    def testCliImportBudget(self):
+        """Test that the import cost of the command line module is within budget"""
+        costL = []
+        for _ in range(3):
+            rsp = self.__python("-X", "importtime", "-c", "import onedep_biocuration.cli.biocuration_cli")
+            self.assertEqual(rsp.returncode, 0, rsp.stderr)
+            for line in rsp.stderr.splitlines():
+                fieldL = [field.strip() for field in line.split(":", 1)[-1].split("|")]
+                if len(fieldL) == 3 and fieldL[2] == "onedep_biocuration.cli.biocuration_cli":
+                    costL.append(int(fieldL[1]) / 1000.0)
+        self.assertEqual(len(costL), 3)
+        self.assertLess(min(costL), self.budgetMs, "command line import takes %.1f ms (budget %.1f ms)" % (min(costL), self.budgetMs))
+
+    def testFastPathsSkipHttpStack(self):
+        """Test that --version, --help and local session file access do not load the HTTP stack"""
+        for argL in [["--version"], ["--help"]]:
+            code = "import sys\nfrom onedep_biocuration.cli.biocuration_cli import run\nsys.argv = ['onedep_request'] + %r\ntry:\n    run()\nexcept SystemExit:\n    pass" % argL
+            self.assertEqual(self.__loadedModules(code), [], argL)
+        code = "from onedep_biocuration.cli.biocuration_cli import readSessionId\nreadSessionId('~/.onedep_biocuration_current_session')"
+        self.assertEqual(self.__loadedModules(code), [])
+
+    def testClientDefersHttpStack(self):
+        """Test that the HTTP stack is loaded by the first service request rather than by client construction"""
+        code = "from onedep_biocuration.api.ContentRequest import ContentRequest\ncr = ContentRequest(apiUrl='http://127.0.0.1:1')"
+        self.assertNotIn("requests", self.__loadedModules(code))
+        code += "\ncr.getStatus()"
+        self.assertIn("requests", self.__loadedModules(code))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+##
+# File: TraceRecorderTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the Chrome trace-event timeline of client calls"""
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from onedep_biocuration.api.ContentRequest import ContentRequest
+from onedep_biocuration.tests.MockContentServer import MockContentServer
+from onedep_biocuration.utils.ApiBase import ApiBase
+from onedep_biocuration.utils.PollPolicy import PollPolicy, TurnaroundEstimator
+from onedep_biocuration.utils.RetryPolicy import RetryPolicy
+from onedep_biocuration.utils.TraceRecorder import NULL_SPAN, TraceRecorder
+
+
+class TraceRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self.__server = MockContentServer(workerDelay=0.3).start()
+        self.__workPath = tempfile.mkdtemp()
+        self.__policy = PollPolicy(initialDelay=0.05, maxDelay=0.1, estimator=TurnaroundEstimator(filePath=None))
+
+    def tearDown(self):
+        self.__server.stop()
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def testBatchTimeline(self):
+        """Test the session lifecycle phases of a batch run on per-thread tracks"""
+        tracer = TraceRecorder()
+        cr = ContentRequest(apiUrl=self.__server.apiUrl, pollPolicy=self.__policy, traceRecorder=tracer)
+        entryIdL = ["D_%010d" % (800000 + ii) for ii in range(4)]
+        rL = cr.requestEntryContentMany(entryIdL, "report-entry-example-test", maxWorkers=2, outputDirPath=self.__workPath)
+        self.assertFalse(any([rD["onedep_error_flag"] for rD in rL]))
+        #
+        eventL = tracer.getEvents()
+        sessionL = [eD for eD in eventL if eD["name"] == "session"]
+        self.assertEqual(sorted([eD["args"]["entry_id"] for eD in sessionL]), entryIdL)
+        for sD in sessionL:
+            sessionId = sD["args"]["session_id"]
+            phaseL = [eD for eD in eventL if eD["args"].get("session_id") == sessionId and eD["cat"] == "request"]
+            names = [eD["name"] for eD in sorted(phaseL, key=lambda eD: eD["ts"])]
+            self.assertEqual(names[:2], ["create", "submit"])
+            self.assertEqual(names[-2:], ["download", "checksum"])
+            self.assertGreaterEqual(names.count("poll"), 2)
+            self.assertEqual(set(names[2:-2]), set(["poll"]))
+            # all phases of a session run on the track of its worker thread within the session interval
+            for eD in phaseL:
+                self.assertEqual(eD["tid"], sD["tid"])
+                self.assertGreaterEqual(eD["ts"], sD["ts"])
+                self.assertLessEqual(eD["ts"] + eD["dur"], sD["ts"] + sD["dur"] + 1.0)
+            self.assertEqual([eD["args"]["outcome"] for eD in phaseL if eD["name"] == "checksum"], ["ok"])
+        self.assertEqual(len(set([eD["tid"] for eD in sessionL])), 2)
+        self.assertEqual(len([eD for eD in eventL if eD["name"] == "batch"]), 1)
+        #
+        fp = os.path.join(self.__workPath, "trace.json")
+        tracer.write(fp)
+        with open(fp, "r") as ifh:
+            tD = json.load(ifh)
+        threadNameL = [eD for eD in tD["traceEvents"] if eD["ph"] == "M" and eD["name"] == "thread_name"]
+        self.assertEqual(len(threadNameL), 3)
+        self.assertEqual(len(tD["traceEvents"]), len(eventL) + 1 + 2 * len(threadNameL))
+
+    def testRetriesAndTracingOff(self):
+        """Test backoff events of retried requests and the no-op span without a trace recorder"""
+        ab = ApiBase(apiUrl=self.__server.apiUrl, apiName="contentws")
+        self.assertIs(ab._traceSpan("create"), NULL_SPAN)  # pylint: disable=protected-access
+        tracer = TraceRecorder(maxEvents=4)
+        ab.setTraceRecorder(tracer)
+        ab.setRetryPolicy(RetryPolicy(initialDelay=0.01))
+        ab.createSession()
+        self.__server.failD["session_status"] = [(503, None)]
+        ab.post("session_status")
+        ab.setTraceRecorder(None)
+        ab.post("session_status")
+        self.assertEqual([eD["name"] for eD in tracer.getEvents()], ["create", "backoff", "poll"])
+        self.assertEqual(tracer.getEvents()[2]["args"]["retries"], 1)
+        self.assertEqual(tracer.getEvents()[2]["args"]["session_id"], ab.getSession())
+        for _ in range(3):
+            tracer.instant("cache_hit")
+        self.assertEqual(len(tracer.getEvents()), 4)
+        self.assertEqual(tracer.toChromeTrace()["otherData"]["dropped"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
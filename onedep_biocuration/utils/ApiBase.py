@@ -16,6 +16,22 @@ Updates:
     21-Sep-2016 jdw  make parameters optional in all prototypes
     25-Sep-2016 jdw  revise exception handling
     14-Feb-2017 jdw  add download() method which bypasses content/format checks.
+    18-Oct-2026      compute the download checksum while streaming (optionally on a worker thread)
+    18-Oct-2026      write downloads through a configurable large-buffer DownloadEngine
+    18-Oct-2026      add resumable downloads using HTTP Range requests
+    18-Oct-2026      stream multipart uploads from the file with bounded memory
+    18-Oct-2026      add conditional downloads skipping unchanged local files
+    18-Oct-2026      add connection pool size, blocking mode and keep-alive idle limit options
+    18-Oct-2026      defer importing requests until the first service request
+    18-Oct-2026      decode service responses from bytes through a pluggable JsonCodec
+    18-Oct-2026      negotiate compressed transfer of downloads and optionally store outputs compressed
+    18-Oct-2026      retry idempotent requests and checksum failures under an optional RetryPolicy
+    18-Oct-2026      fail fast on unavailable endpoints through an optional CircuitBreaker
+    18-Oct-2026      admit requests through an optional shared RateLimiter
+    18-Oct-2026      report per-request timings, sizes and outcomes to an optional metrics callback
+    18-Oct-2026      record requests, retry pauses and checksum verification on an optional trace timeline
+    18-Oct-2026      add per-thread trace recorders for tracing the calls of one caller of a shared client
+    18-Oct-2026      add getConnectionPool() returning the current connection pool settings
 """
 
 
@@ -33,25 +49,59 @@ import sys
 import os
 import copy
 import hashlib
+import threading
+import time
 
 # import warnings
 
-import requests
-import six
-
 try:
     import json
 except ImportError:
     import simplejson as json
 
+try:
+    from urllib.parse import quote_plus
+except ImportError:
+    from urllib import quote_plus  # noqa: F401
+
 from onedep_biocuration import __version__
-from requests.packages.urllib3.exceptions import InsecureRequestWarning  # pylint: disable=E0401
+from onedep_biocuration.utils.CompressedFile import checkCompression, detectCompression, openReport
+from onedep_biocuration.utils.DownloadEngine import DownloadEngine
+from onedep_biocuration.utils.JsonCodec import JsonCodec
+from onedep_biocuration.utils.MultipartEncoder import MultipartEncoder
+from onedep_biocuration.utils.StreamDigest import StreamDigest
+from onedep_biocuration.utils.TraceRecorder import NULL_SPAN
 
 log = logging.getLogger(__name__)
 
 
 class ApiBase(object):
-    def __init__(self, apiKey=None, userAgent=None, apiName=None, apiUrl=None, verify=True):
+    # trace timeline event names of the session lifecycle requests (other requests are named by endpoint)
+    TRACE_PHASES = {"session": "create", "entry_content": "submit", "summary_content": "submit", "session_status": "poll", "download": "download"}
+
+    def __init__(
+        self,
+        apiKey=None,
+        userAgent=None,
+        apiName=None,
+        apiUrl=None,
+        verify=True,
+        pipelinedChecksum=False,
+        downloadEngine=None,
+        resumableDownloads=False,
+        conditionalDownloads=False,
+        poolConnections=10,
+        poolMaxSize=10,
+        poolBlock=False,
+        keepAliveIdle=None,
+        jsonCodec=None,
+        compressedTransfer=True,
+        retryPolicy=None,
+        circuitBreaker=None,
+        rateLimiter=None,
+        metricsCallback=None,
+        traceRecorder=None,
+    ):
         """
         Core methods supporting the OneDep web client API.
 
@@ -60,18 +110,51 @@ class ApiBase(object):
         :param string apiName: (Optional) API service name
         :param string apiUrl: (Optional) API service base URL.
         :param string verify:  (Optional) verify SSL certificate
+        :param bool pipelinedChecksum: (Optional) compute download checksums on a worker thread
+        :param object downloadEngine: (Optional) DownloadEngine instance used to write downloaded content
+        :param bool resumableDownloads: (Optional) keep interrupted downloads in <dstPath>.part and resume these with Range requests
+        :param bool conditionalDownloads: (Optional) skip downloads when dstPath already holds the content with the service checksum
+        :param int poolConnections: (Optional) number of per-host connection pools kept
+        :param int poolMaxSize: (Optional) largest number of connections kept alive for each host (match the number of request threads)
+        :param bool poolBlock: (Optional) wait for a pooled connection rather than opening an extra one when all are in use
+        :param float keepAliveIdle: (Optional) close kept-alive connections idle for longer than this (seconds) rather than reuse them
+        :param object jsonCodec: (Optional) JsonCodec instance used to decode service responses
+        :param bool compressedTransfer: (Optional) accept compressed (e.g. gzip) transfer of downloads
+        :param object retryPolicy: (Optional) RetryPolicy instance for retrying idempotent requests (default: no retries)
+        :param object circuitBreaker: (Optional) CircuitBreaker instance refusing requests to endpoints which are failing
+        :param object rateLimiter: (Optional) RateLimiter instance admitting requests within per-endpoint rate limits
+        :param metricsCallback: (Optional) function called with a record of each request (e.g. a RequestMetrics instance)
+        :param object traceRecorder: (Optional) TraceRecorder instance recording a timeline of the requests
 
         """
         log.debug("Service initializing")
-        self.__chunkSize = 2048
+        self.__pipelinedChecksum = pipelinedChecksum
+        self.__downloadEngine = downloadEngine if downloadEngine else DownloadEngine()
+        self.__resumableDownloads = resumableDownloads
+        self.__conditionalDownloads = conditionalDownloads
+        self.__uploadCallback = None
+        self.__jsonCodec = jsonCodec if jsonCodec else JsonCodec()
+        self.__compressedTransfer = compressedTransfer
+        self.__retryPolicy = retryPolicy
+        self.__circuitBreaker = circuitBreaker
+        self.__rateLimiter = rateLimiter
+        self.__metricsCallback = metricsCallback
+        self.__traceRecorder = traceRecorder
+        # timings of the request in progress and of the last request made in each thread
+        self.__local = threading.local()
         #
         self._apiUrl = apiUrl if apiUrl else "https://localhost"
         self._apiKey = apiKey if apiKey else "anonymous"
         self._apiName = apiName if apiName else "onedep"
         #
-        self.__myreq = requests.session()
-        self.__myreq.headers["User-Agent"] = userAgent if userAgent else "OneDepApiClient/%s Python/%s " % (__version__, sys.version.split()[0])
-        self.__myreq.headers["wwpdb-api-token"] = "%s %s" % ("Bearer", self._apiKey)
+        # the requests session (and the HTTP stack) is created on the first service request
+        self.__myreq = None
+        self.__myreqLock = threading.Lock()
+        self.__headerD = {
+            "User-Agent": userAgent if userAgent else "OneDepApiClient/%s Python/%s " % (__version__, sys.version.split()[0]),
+            "wwpdb-api-token": "%s %s" % ("Bearer", self._apiKey),
+        }
+        self.setConnectionPool(poolConnections=poolConnections, poolMaxSize=poolMaxSize, poolBlock=poolBlock, keepAliveIdle=keepAliveIdle)
         #
         self._returnApiErrorFlagKey = "onedep_error_flag"
         self._returnApiStatusTextKey = "onedep_status_text"
@@ -80,8 +163,167 @@ class ApiBase(object):
         #
         self._verify = verify
         self._reservedContentTypes = {}
-        if not verify:
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)  # pylint: disable=no-member
+
+    def setConnectionPool(self, poolConnections=10, poolMaxSize=10, poolBlock=False, keepAliveIdle=None):
+        """Replace the HTTP(S) connection pools of this client.
+
+        :param int poolConnections: (Optional) number of per-host connection pools kept
+        :param int poolMaxSize: (Optional) largest number of connections kept alive for each host
+        :param bool poolBlock: (Optional) wait for a pooled connection rather than opening an extra one when all are in use
+        :param float keepAliveIdle: (Optional) close kept-alive connections idle for longer than this (seconds) rather than reuse them
+        """
+        self.__poolD = {"poolConnections": poolConnections, "poolMaxSize": poolMaxSize, "poolBlock": poolBlock, "maxIdle": keepAliveIdle}
+        with self.__myreqLock:
+            if self.__myreq is not None:
+                self.__mountAdapter(self.__myreq)
+        self.__poolMaxSize = poolMaxSize
+
+    def __mountAdapter(self, myreq):
+        """Internal method to mount a new connection pool adapter with the current pool settings on the input requests session."""
+        from onedep_biocuration.utils.PooledHTTPAdapter import PooledHTTPAdapter  # pylint: disable=import-outside-toplevel
+
+        adapter = PooledHTTPAdapter(**self.__poolD)
+        for prefix in ["https://", "http://"]:
+            oldAdapter = myreq.adapters.get(prefix)
+            myreq.mount(prefix, adapter)
+            if oldAdapter is not None:
+                oldAdapter.close()
+
+    def __getRequestSession(self):
+        """Internal method returning the requests session of this client (created and configured on first use)."""
+        if self.__myreq is None:
+            with self.__myreqLock:
+                if self.__myreq is None:
+                    import requests  # pylint: disable=import-outside-toplevel
+
+                    myreq = requests.session()
+                    myreq.headers.update(self.__headerD)
+                    self.__mountAdapter(myreq)
+                    if not self._verify:
+                        from requests.packages.urllib3.exceptions import InsecureRequestWarning  # pylint: disable=E0401,import-outside-toplevel
+
+                        requests.packages.urllib3.disable_warnings(InsecureRequestWarning)  # pylint: disable=no-member
+                    self.__myreq = myreq
+        return self.__myreq
+
+    def getPoolMaxSize(self):
+        """Return the largest number of connections kept alive for each host."""
+        return self.__poolMaxSize
+
+    def getConnectionPool(self):
+        """Return the connection pool settings as a dictionary of setConnectionPool() keyword arguments."""
+        return {
+            "poolConnections": self.__poolD["poolConnections"],
+            "poolMaxSize": self.__poolD["poolMaxSize"],
+            "poolBlock": self.__poolD["poolBlock"],
+            "keepAliveIdle": self.__poolD["maxIdle"],
+        }
+
+    def setJsonCodec(self, jsonCodec):
+        """Set the JsonCodec instance used to decode service responses."""
+        self.__jsonCodec = jsonCodec
+
+    def setDownloadEngine(self, downloadEngine):
+        """Set the DownloadEngine instance used to write downloaded content."""
+        self.__downloadEngine = downloadEngine
+
+    def setResumableDownloads(self, flag):
+        """Enable or disable resumable downloads.
+
+        In resumable mode content is written to <dstPath>.part with the request details kept in the sidecar
+        file <dstPath>.part.json. An interrupted download is continued from the end of the partial file by
+        a subsequent download of the same content, and the file is moved to dstPath once the checksum of
+        the complete content is verified.
+        """
+        self.__resumableDownloads = flag
+
+    def setConditionalDownloads(self, flag):
+        """Enable or disable conditional downloads.
+
+        When dstPath exists its MD5 digest is sent in an If-None-Match request header. The transfer is
+        skipped when the service answers 304 (Not Modified) or reports the same checksum_md5 in the
+        response headers, in which case the response body is not read.
+        """
+        self.__conditionalDownloads = flag
+
+    def setCompressedTransfer(self, flag):
+        """Enable or disable compressed transfer of downloads.
+
+        When enabled, downloads offer every content coding the HTTP stack can decode (gzip and deflate, plus
+        br/zstd when the brotli/zstandard packages are installed) and the body is decoded as it streams, so the
+        checksum is verified over the uncompressed content. Resumed (Range) downloads are always uncompressed.
+        """
+        self.__compressedTransfer = flag
+
+    def setRetryPolicy(self, retryPolicy):
+        """Set the RetryPolicy instance for retrying idempotent requests (None to disable retries)."""
+        self.__retryPolicy = retryPolicy
+
+    def getRetryPolicy(self):
+        return self.__retryPolicy
+
+    def setCircuitBreaker(self, circuitBreaker):
+        """Set the CircuitBreaker instance refusing requests to endpoints which are failing (None to disable)."""
+        self.__circuitBreaker = circuitBreaker
+
+    def getCircuitBreaker(self):
+        return self.__circuitBreaker
+
+    def setRateLimiter(self, rateLimiter):
+        """Set the RateLimiter instance admitting requests within per-endpoint rate limits (None to disable)."""
+        self.__rateLimiter = rateLimiter
+
+    def getRateLimiter(self):
+        return self.__rateLimiter
+
+    def setMetricsCallback(self, metricsCallback):
+        """Set the function called with a record of each request (None to disable).
+
+        The record is a dictionary with the keys:
+
+            api_url, endpoint, status_code (None without a response), error, status_text, exception (class name or None),
+            retries, checksum ('ok', 'failed', 'skipped' or None for requests other than downloads),
+            bytes_sent (request body), bytes_received (response body as transferred),
+            latency (seconds for the whole call including retries) and, for the last attempt, the phases (seconds):
+            wait (for the rate limiter), connect (TCP/TLS setup, 0 on a kept-alive connection),
+            ttfb (from sending the request to the response headers), transfer (reading the body) and
+            write (writing downloaded content to disk)
+
+        A RequestMetrics instance aggregates the records into histograms.
+        """
+        self.__metricsCallback = metricsCallback
+
+    def setTraceRecorder(self, traceRecorder):
+        """Set the TraceRecorder instance recording a timeline of the requests (None to disable)."""
+        self.__traceRecorder = traceRecorder
+
+    def getTraceRecorder(self):
+        return self.__traceRecorder
+
+    def _setThreadTraceRecorder(self, traceRecorder):
+        """Set the trace recorder for the requests made by the calling thread (None for the client trace recorder) and return the previous one.
+
+        This traces the calls of one caller of a client shared with other threads without tracing theirs.
+        """
+        prevRecorder = getattr(self.__local, "traceRecorder", None)
+        self.__local.traceRecorder = traceRecorder
+        return prevRecorder
+
+    def _getActiveTraceRecorder(self):
+        """Return the trace recorder for the requests made by the calling thread (or None)."""
+        tracer = getattr(self.__local, "traceRecorder", None)
+        return tracer if tracer is not None else self.__traceRecorder
+
+    def _traceSpan(self, name, cat="client", **args):
+        """Return a context manager recording its body as the event 'name' on the trace timeline (doing nothing when tracing is off)."""
+        tracer = self._getActiveTraceRecorder()
+        if tracer is None:
+            return NULL_SPAN
+        return tracer.span(name, cat=cat, **args)
+
+    def setUploadProgressCallback(self, callback):
+        """Set a callback(bytesSent, totalBytes) reporting the progress of the request body of each upload."""
+        self.__uploadCallback = callback
 
     def createSession(self):
         """Create and maintain a session context in all subsequent API requests.
@@ -185,13 +427,15 @@ class ApiBase(object):
         #
         return self.__download(dstPath, endPoint=endPoint, **_params)
 
-    def download(self, dstPath, contentType, formatType, endPoint="download", **params):
+    def download(self, dstPath, contentType, formatType, endPoint="download", compression=None, **params):
         """Construct GET request to download the target data object type to dstPath.
 
         :param string contentType: data object content type target download
         :param string formatType: data object format type target download
         :param string dstPath: full local path to file for download
         :param string endPoint:  API endPoint  - valws.
+        :param string compression: (Optional) store the content 'gzip' or 'zstd' compressed (read back with CompressedFile.openReport())
+        :raises ValueError: for an unsupported compression
         :param params: (Optional) Parameters as keyword arguments.
 
         :rtype: json response converted to dictionary
@@ -202,14 +446,17 @@ class ApiBase(object):
             _params[p] = params[p]
         _params["contenttype"] = contentType
         _params["formattype"] = formatType
+        if compression:
+            checkCompression(compression)
         #
-        return self.__download(dstPath, endPoint=endPoint, **_params)
+        return self.__download(dstPath, endPoint=endPoint, compression=compression, **_params)
 
-    def __download(self, dstPath, endPoint="download", **params):
+    def __download(self, dstPath, endPoint="download", compression=None, **params):
         """Internal method to construct GET request to download the content/format type to dstPath.
 
         :param string dstPath: full path to file for download
         :param string endPoint:  API endPoint  - valws.
+        :param string compression: (Optional) store the content 'gzip' or 'zstd' compressed
         :param params: Parameters as keyword arguments including file type/format specification and session details.
 
         :rtype: json response converted to dictionary
@@ -222,34 +469,64 @@ class ApiBase(object):
         self.__addSessionContext(_params)
         log.debug(" DOWNLOAD BEGINS for : %s %r", dstPath, _params)
         #
-        rD = {}
-        rD[self._returnApiErrorFlagKey] = True
-        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
-        #
         url = self.__encodeUrl(self._apiUrl, self._apiName, endPoint, **_params)
         #
         log.debug("Request: URL: %r", url)
         #
+        return self.__retry(endPoint, lambda: self.__downloadOnce(dstPath, url, _params, compression), isDownload=True, sessionId=_params.get("session_id"))
+
+    def __downloadOnce(self, dstPath, url, params, compression=None):
+        """Internal method making one download request for url to dstPath.
+
+        :rtype: tuple: response dictionary, response object (or None), exception (or None)
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
+        #
+        myDigest = None
+        checksumStart = None
+        # compressed output is not resumable as offsets in the compressed file do not match the content
+        resumable = self.__resumableDownloads and not compression
+        partPath = dstPath + ".part" if resumable else dstPath
+        statePath = dstPath + ".part.json" if resumable else None
+        localDigest = None
         try:
-            response = self.__myreq.get(url, data=_params, verify=self._verify, stream=True)
-            if response.status_code == 200:
-                with open(dstPath, "wb") as f:
-                    for chunk in response.iter_content(self.__chunkSize):
-                        f.write(chunk)
+            if self.__conditionalDownloads and os.path.isfile(dstPath) and detectCompression(dstPath) == compression:
+                localDigest = self.__getContentMD5(dstPath)
+            response, offset = self.__openDownload(url, params, partPath, statePath, localDigest=localDigest)
+            if localDigest and (response.status_code == 304 or (response.status_code == 200 and response.headers.get("checksum_md5") == localDigest)):
+                response.close()
+                log.debug("Download skipped - local file %r is unchanged", dstPath)
+                rD[self._returnApiErrorFlagKey] = False
+                rD[self._returnApiStatusTextKey] = "ok"
+                rD["download_skipped"] = True
+                return rD, response, None
+            if response.status_code in [200, 206]:
+                # checksum is computed from the streamed chunks - avoiding a second read of dstPath
+                digest = StreamDigest(algorithm="md5", pipelined=self.__pipelinedChecksum)
+                try:
+                    if offset:
+                        self.__updateDigestFromFile(digest, partPath, offset)
+                    self.__downloadEngine.fetch(response, partPath, digest=digest, offset=offset, compression=compression, statsD=getattr(self.__local, "attemptD", None))
+                finally:
+                    checksumStart = time.time()
+                    myDigest = digest.hexdigest()
             rD[self._returnApiErrorFlagKey] = False
             rD[self._returnApiStatusTextKey] = "ok"
             log.debug("download request headers %r", response.request.headers)
             log.debug("download response headers %r", response.headers)
         except Exception as e:
-            return self.__filterExceptions(e, msgDefault="Download request processing exception")
+            return self.__filterExceptions(e, msgDefault="Download request processing exception"), None, e
 
         errFlag, errD = self.__filterErrors(response)
         if errFlag:
-            return errD
+            return errD, response, None
 
         try:
-            myDigest = self.getMD5(dstPath)
             theDigest = response.headers["checksum_md5"]
+            if myDigest is None:
+                raise ValueError("No content")
             if myDigest != theDigest:
                 rD[self._returnApiErrorFlagKey] = True
                 rD[self._returnApiStatusTextKey] = "Checksum failure"
@@ -260,7 +537,106 @@ class ApiBase(object):
             rD[self._returnApiStatusTextKey] = "Download checksum processing error %r " % dstPath
             # log.exception("Local file processing error %r" % dstPath)
 
-        return rD
+        tracer = self._getActiveTraceRecorder()
+        if tracer is not None and myDigest is not None:
+            tracer.addComplete(
+                "checksum",
+                "request",
+                checksumStart,
+                time.time(),
+                {"session_id": params.get("session_id"), "outcome": "failed" if rD[self._returnApiErrorFlagKey] else "ok", "pipelined": self.__pipelinedChecksum},
+            )
+        if statePath and myDigest is not None:
+            self.__finishResumable(dstPath, partPath, statePath, keep=not rD[self._returnApiErrorFlagKey])
+        if myDigest is None:
+            # release the connection of an unread error response
+            response.close()
+        return rD, response, None
+
+    def __openDownload(self, url, params, partPath, statePath, localDigest=None):
+        """Internal method to issue the streamed download request.
+
+        In resumable mode a Range request continues an existing partial file when it belongs to the same
+        request and the service reports the same content checksum. Otherwise the full content is requested,
+        conditional on the digest of the existing local file (localDigest) if provided.
+
+        :rtype: tuple: response object, offset in the partial file at which the response body starts
+        """
+        offset = 0
+        stateD = {}
+        if statePath and os.path.exists(partPath) and os.path.exists(statePath):
+            try:
+                with open(statePath, "r") as ifh:
+                    stateD = json.load(ifh)
+                if stateD.get("url") == url:
+                    offset = os.path.getsize(partPath)
+            except Exception as e:  # pylint: disable=broad-except
+                log.debug("Ignoring resume state %r %s", statePath, str(e))
+        #
+        if offset and not localDigest:
+            # offsets count content bytes - the remainder is requested without a content coding
+            response = self.__getRequestSession().get(url, data=params, verify=self._verify, stream=True, headers={"Range": "bytes=%d-" % offset, "Accept-Encoding": "identity"})
+            contentRange = response.headers.get("Content-Range", "")
+            if response.status_code == 206 and contentRange.startswith("bytes %d-" % offset) and response.headers.get("checksum_md5") == stateD.get("checksum_md5"):
+                log.debug("Resuming download %r at offset %d", partPath, offset)
+                return response, offset
+            if response.status_code == 200:
+                # the service returned the full content
+                offset = 0
+            else:
+                response.close()
+                response = None
+        else:
+            response = None
+        #
+        if response is None:
+            headers = {"If-None-Match": '"%s"' % localDigest} if localDigest else {}
+            headers["Accept-Encoding"] = self.__getAcceptEncoding()
+            response = self.__getRequestSession().get(url, data=params, verify=self._verify, stream=True, headers=headers)
+        if statePath and response.status_code == 200 and not (localDigest and response.headers.get("checksum_md5") == localDigest):
+            with open(statePath, "w") as ofh:
+                json.dump({"url": url, "checksum_md5": response.headers.get("checksum_md5")}, ofh)
+        return response, 0
+
+    def __getAcceptEncoding(self):
+        """Internal method returning the Accept-Encoding request header for downloads."""
+        if not self.__compressedTransfer:
+            return "identity"
+        from urllib3.util.request import ACCEPT_ENCODING  # pylint: disable=import-outside-toplevel
+
+        return ACCEPT_ENCODING
+
+    def __getContentMD5(self, filePath, blockSize=1048576):
+        """Internal method returning the MD5 hex digest of the (uncompressed) content of a plain or compressed file."""
+        md5 = hashlib.md5()
+        with openReport(filePath, "rb") as ifh:
+            for block in iter(lambda: ifh.read(blockSize), b""):
+                md5.update(block)
+        return md5.hexdigest()
+
+    def __updateDigestFromFile(self, digest, filePath, length, blockSize=1048576):
+        """Internal method to add the leading 'length' bytes of filePath to the input digest."""
+        with open(filePath, "rb") as ifh:
+            while length > 0:
+                block = ifh.read(min(blockSize, length))
+                if not block:
+                    break
+                digest.update(block)
+                length -= len(block)
+
+    def __finishResumable(self, dstPath, partPath, statePath, keep=True):
+        """Internal method to move a verified partial file to dstPath or to discard a corrupt one."""
+        try:
+            if keep:
+                if os.path.exists(dstPath):
+                    os.remove(dstPath)
+                os.rename(partPath, dstPath)
+            elif os.path.exists(partPath):
+                os.remove(partPath)
+            if os.path.exists(statePath):
+                os.remove(statePath)
+        except Exception as e:  # pylint: disable=broad-except
+            log.debug("Failed completing resumable download %r %s", dstPath, str(e))
 
     def upload(self, filePath, contentType, fileFormat, endPoint="upload", **params):
         """Construct POST request to perform multipart/ file upload and return the JSON response.
@@ -302,13 +678,12 @@ class ApiBase(object):
         log.debug(" C _params %r", _params)
         #
         try:
-            md5 = self.getMD5(filePath)
+            md5 = self.getMD5(filePath, block_size=1048576)
             _params["checksum_md5"] = md5
-            _, fn = os.path.split(filePath)
-            fobj = open(filePath, "rb")
-            fD = {"file": (fn, fobj)}
             _params["content_type"] = contentType
             _params["file_format"] = fileFormat
+            # the multipart body is read from the open file as it is sent
+            body = MultipartEncoder(_params, "file", filePath, callback=self.__uploadCallback)
         except:  # noqa: E722 pylint: disable=bare-except
             rD[self._returnApiErrorFlagKey] = True
             rD[self._returnApiStatusTextKey] = "Input file access or processing error "
@@ -319,19 +694,30 @@ class ApiBase(object):
         #
         log.debug("Request: URL: %s PARAMS: %r", url, _params)
         #
+        return self.__retry(endPoint, lambda: self.__uploadOnce(url, body), sessionId=_params.get("session_id"))
+
+    def __uploadOnce(self, url, body):
+        """Internal method making one upload request (the multipart body can be sent once).
+
+        :rtype: tuple: response dictionary, response object (or None), exception (or None)
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
         try:
-            response = self.__myreq.post(url, files=fD, data=_params, verify=self._verify)
+            with body:
+                response = self.__getRequestSession().post(url, data=body, headers={"Content-Type": body.contentType}, verify=self._verify)
             log.debug("post headers %r", response.request.headers)
         except Exception as e:
-            return self.__filterExceptions(e, msgDefault="Upload request processing exception")
+            return self.__filterExceptions(e, msgDefault="Upload request processing exception"), None, e
 
         #
         errFlag, errD = self.__filterErrors(response)
         if errFlag:
-            return errD
+            return errD, response, None
 
         try:
-            rD.update(json.loads(response.text))
+            rD.update(self.__jsonCodec.loads(response.content))
             rD[self._returnApiErrorFlagKey] = rD["errorflag"]
             rD[self._returnApiStatusTextKey] = rD["statusmessage"]
         except Exception as e:
@@ -339,7 +725,7 @@ class ApiBase(object):
             rD[self._returnApiStatusTextKey] = "Upload response processing error %s" % str(e)
             # log.exception("Local upload response processing error ")
 
-        return rD
+        return rD, response, None
 
     def __filterExceptions(self, exception, msgDefault="OneDep API service failure"):
         """Handle typical exceptions and map these to response dictionary -
@@ -377,7 +763,7 @@ class ApiBase(object):
                 errorFlag = True
                 msg = msgDefault
                 try:
-                    errD = json.loads(response.text)
+                    errD = self.__jsonCodec.loads(response.content)
                     msg = errD["statustext"]
                 except:  # noqa: E722 pylint: disable=bare-except
                     pass
@@ -398,9 +784,6 @@ class ApiBase(object):
 
         :rtype: json response converted to dictionary
         """
-        rD = {}
-        rD[self._returnApiErrorFlagKey] = True
-        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
         url = "%s/service/%s/%s" % (self._apiUrl, self._apiName, endPoint)
         #
         _params = {}
@@ -409,25 +792,35 @@ class ApiBase(object):
         self.__addSessionContext(_params)
         #
         log.debug("Request: %s %s", url, _params)
+        return self.__retry(endPoint, lambda: self.__postOnce(url, _params), sessionId=_params.get("session_id"))
+
+    def __postOnce(self, url, params):
+        """Internal method making one POST request.
+
+        :rtype: tuple: response dictionary, response object (or None), exception (or None)
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
         try:
-            response = self.__myreq.post(url, data=_params, verify=self._verify)
+            response = self.__getRequestSession().post(url, data=params, verify=self._verify)
             log.debug("post headers %r", response.request.headers)
         except Exception as e:
-            return self.__filterExceptions(e, msgDefault="POST request processing exception")
+            return self.__filterExceptions(e, msgDefault="POST request processing exception"), None, e
 
         errFlag, errD = self.__filterErrors(response)
         if errFlag:
-            return errD
+            return errD, response, None
 
         try:
-            rD.update(json.loads(response.text))
+            rD.update(self.__jsonCodec.loads(response.content))
             rD[self._returnApiErrorFlagKey] = rD["errorflag"]
             rD[self._returnApiStatusTextKey] = rD["statusmessage"]
         except Exception as e:
             rD[self._returnApiErrorFlagKey] = True
             rD[self._returnApiStatusTextKey] = "POST request processing error %r " % str(e)
 
-        return rD
+        return rD, response, None
 
     def get(self, endPoint, **params):
         """Construct GET request and return the JSON response.
@@ -437,35 +830,209 @@ class ApiBase(object):
 
         :rtype: json response converted to dictionary
         """
-        rD = {}
-        rD[self._returnApiErrorFlagKey] = True
-        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
         _params = {}
         for p in params:
             _params[p] = params[p]
         self.__addSessionContext(_params)
         #
         url = self.__encodeUrl(self._apiUrl, self._apiName, endPoint, **_params)
+        return self.__retry(endPoint, lambda: self.__getOnce(url), sessionId=_params.get("session_id"))
+
+    def __getOnce(self, url):
+        """Internal method making one GET request.
+
+        :rtype: tuple: response dictionary, response object (or None), exception (or None)
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
         try:
-            response = self.__myreq.get(url, verify=self._verify)
+            response = self.__getRequestSession().get(url, verify=self._verify)
             log.debug("get headers %r", response.request.headers)
         except Exception as e:
-            return self.__filterExceptions(e, msgDefault="GET request processing exception")
+            return self.__filterExceptions(e, msgDefault="GET request processing exception"), None, e
 
         errFlag, errD = self.__filterErrors(response)
         if errFlag:
-            return errD
+            return errD, response, None
         #
         try:
-            rD.update(json.loads(response.text))
+            rD.update(self.__jsonCodec.loads(response.content))
             rD[self._returnApiErrorFlagKey] = rD["errorflag"]
             rD[self._returnApiStatusTextKey] = rD["statusmessage"]
         except Exception as e:
             rD[self._returnApiErrorFlagKey] = True
             rD[self._returnApiStatusTextKey] = "Request processing error %r" % str(e)
 
+        return rD, response, None
+
+    def __retry(self, endPoint, attempt, isDownload=False, sessionId=None):
+        """Internal method repeating a request until it succeeds or the retry policy gives up.
+
+        :param string endPoint: API endPoint of the request
+        :param attempt: function making one request and returning a tuple: response dictionary, response object (or None), exception (or None)
+        :param bool isDownload: (Optional) the request is a checksum-verified download
+        :param string sessionId: (Optional) session identifier of the request (for the trace timeline)
+
+        :rtype: response dictionary of the last attempt (including retry_count when the request was retried)
+        """
+        tracer = self._getActiveTraceRecorder()
+        if tracer is None:
+            return self.__retryAttempts(endPoint, attempt, isDownload)
+        with tracer.span(self.TRACE_PHASES.get(endPoint, endPoint), cat="request", endpoint=endPoint, session_id=sessionId) as span:
+            rD = self.__retryAttempts(endPoint, attempt, isDownload)
+            span.set(error=rD.get(self._returnApiErrorFlagKey, True), status_text=rD.get(self._returnApiStatusTextKey), retries=rD.get("retry_count", 0))
+            if sessionId is None and rD.get("session_id"):
+                span.set(session_id=rD["session_id"])
+            if rD.get("status"):
+                span.set(status=rD["status"])
+        return rD
+
+    def __retryAttempts(self, endPoint, attempt, isDownload):
+        """Internal method making the attempts of a request under the retry policy (see __retry())."""
+        policy = self.__retryPolicy
+        retryable = policy is not None and policy.isRetryable(endPoint)
+        startTime = None
+        if self.__metricsCallback is not None:
+            startTime = time.time()
+            self.__local.lastAttemptD = None
+        if retryable:
+            policy.budget.recordRequest()
+        rD, response, exception = self.__guard(endPoint, attempt)
+        nAttempt = 1
+        while retryable and rD.get(self._returnApiErrorFlagKey, True) and self.__isTransient(policy, rD, response, exception):
+            retryAfter = policy.parseRetryAfter(response.headers.get("Retry-After")) if response is not None else None
+            pause = policy.getPause(nAttempt, retryAfter=retryAfter)
+            if pause is None:
+                break
+            if not policy.budget.acquire():
+                log.info("Retry budget exhausted - %s request failed with %r", endPoint, rD.get(self._returnApiStatusTextKey))
+                break
+            log.info("Retrying %s request failed with %r in %.2f seconds", endPoint, rD.get(self._returnApiStatusTextKey), pause)
+            with self._traceSpan("backoff", cat="request", endpoint=endPoint, attempt=nAttempt):
+                time.sleep(pause)
+            rD, response, exception = self.__guard(endPoint, attempt)
+            nAttempt += 1
+            rD["retry_count"] = nAttempt - 1
+        if startTime is not None:
+            self.__reportMetrics(endPoint, startTime, rD, response, exception, nAttempt - 1, isDownload)
         return rD
 
+    def __reportMetrics(self, endPoint, startTime, rD, response, exception, retries, isDownload):
+        """Internal method passing the record of a completed request to the metrics callback."""
+        aD = getattr(self.__local, "lastAttemptD", None) or {}
+        elapsed = response.elapsed.total_seconds() if response is not None and response.elapsed is not None else None
+        checksum = None
+        if isDownload:
+            if rD.get("download_skipped"):
+                checksum = "skipped"
+            elif rD.get(self._returnApiStatusTextKey) == "Checksum failure":
+                checksum = "failed"
+            elif not rD.get(self._returnApiErrorFlagKey, True):
+                checksum = "ok"
+        mD = {
+            "api_url": self._apiUrl,
+            "endpoint": endPoint,
+            "status_code": response.status_code if response is not None else None,
+            "error": rD.get(self._returnApiErrorFlagKey, True),
+            "status_text": rD.get(self._returnApiStatusTextKey),
+            "exception": type(exception).__name__ if exception is not None else None,
+            "retries": retries,
+            "checksum": checksum,
+            "bytes_sent": self.__getBytesSent(response),
+            "bytes_received": self.__getBytesReceived(response),
+            "latency": time.time() - startTime,
+            "wait": aD.get("wait"),
+            "connect": aD.get("connect"),
+            "ttfb": max(0.0, elapsed - aD.get("connect", 0.0)) if elapsed is not None else None,
+            "transfer": max(0.0, aD["seconds"] - elapsed - (aD.get("write") or 0.0)) if elapsed is not None and "seconds" in aD else None,
+            "write": aD.get("write"),
+        }
+        try:
+            self.__metricsCallback(mD)
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning("Request metrics callback failed %s", str(e))
+
+    def __getBytesSent(self, response):
+        """Internal method returning the length of the request body of the input response (or None)."""
+        if response is None or response.request is None:
+            return None
+        body = response.request.body
+        try:
+            return len(body) if body is not None else 0
+        except TypeError:
+            return None
+
+    def __getBytesReceived(self, response):
+        """Internal method returning the number of response body bytes read from the connection (or None)."""
+        if response is None:
+            return None
+        try:
+            return response.raw.tell()
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    def __guard(self, endPoint, attempt):
+        """Internal method making one request for endPoint through the circuit breaker and rate limiter (if any).
+
+        :rtype: tuple: response dictionary, response object (or None), exception (or None)
+        """
+        breaker = self.__circuitBreaker
+        if breaker is not None and not breaker.allow(self._apiUrl, endPoint):
+            rD = {}
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "Service endpoint %s is unavailable (circuit open, retry in %.0f seconds)" % (endPoint, breaker.getRetryTime(self._apiUrl, endPoint))
+            rD["circuit_open"] = True
+            return rD, None, None
+        waitStart = time.time() if self.__metricsCallback is not None else None
+        if self.__rateLimiter is not None and not self.__rateLimiter.acquire(endPoint):
+            if breaker is not None:
+                breaker.cancel(self._apiUrl, endPoint)
+            rD = {}
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "Request rate limit for %s not available within the timeout" % endPoint
+            rD["rate_limited"] = True
+            return rD, None, None
+        if waitStart is not None:
+            return self.__timedAttempt(endPoint, attempt, breaker, time.time() - waitStart)
+        return self.__breakerAttempt(endPoint, attempt, breaker)
+
+    def __timedAttempt(self, endPoint, attempt, breaker, wait):
+        """Internal method making one request and keeping the time spent in each phase for the metrics callback."""
+        from onedep_biocuration.utils.PooledHTTPAdapter import popConnectTime, resetConnectTime  # pylint: disable=import-outside-toplevel
+
+        attemptD = {"wait": wait}
+        self.__local.attemptD = attemptD
+        resetConnectTime()
+        startTime = time.time()
+        try:
+            return self.__breakerAttempt(endPoint, attempt, breaker)
+        finally:
+            attemptD["seconds"] = time.time() - startTime
+            attemptD["connect"] = popConnectTime()
+            self.__local.attemptD = None
+            self.__local.lastAttemptD = attemptD
+
+    def __breakerAttempt(self, endPoint, attempt, breaker):
+        """Internal method making one request and recording its outcome with the circuit breaker (if any)."""
+        if breaker is None:
+            return attempt()
+        try:
+            rD, response, exception = attempt()
+        except Exception:
+            breaker.record(self._apiUrl, endPoint, True)
+            raise
+        breaker.record(self._apiUrl, endPoint, breaker.isFailure(response=response, exception=exception))
+        return rD, response, exception
+
+    def __isTransient(self, policy, rD, response, exception):
+        """Internal method returning True if a failed request may succeed when repeated."""
+        if exception is not None:
+            return policy.isRetryableException(exception)
+        if policy.isRetryableResponse(response):
+            return True
+        return policy.refetchOnChecksumFailure and rD.get(self._returnApiStatusTextKey) == "Checksum failure"
+
     def getMD5(self, path, block_size=4096, hr=True):
         """
         Chunked MD5 function -
@@ -497,7 +1064,7 @@ class ApiBase(object):
         """
         qs = []
         for k, v in params.items():
-            qs.append("%s=%s" % (k, six.moves.urllib.parse.quote_plus(str(v))))
+            qs.append("%s=%s" % (k, quote_plus(str(v))))
         #
         return "%s/service/%s/%s?%s" % (apiUrl, api, endPoint, "&".join(qs))
 
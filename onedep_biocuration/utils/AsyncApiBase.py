@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""
+AsyncApiBase.py
+^^^^^^^^^^^^^^^
+
+Core asyncio methods supporting the wwPDB OneDep webservice API.
+
+This module parallels ApiBase.py on top of the optional aiohttp package
+so that a single event loop may keep many service sessions in flight.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial asyncio version following ApiBase
+    18-Oct-2026  decode service responses from bytes through a pluggable JsonCodec
+    18-Oct-2026  write downloads in large blocks overlapped with the transfer, use the running loop and ssl=True/False
+"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Apache 2.0"
+
+import asyncio
+import copy
+import hashlib
+import logging
+import os
+import sys
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from onedep_biocuration import __version__
+from onedep_biocuration.utils.JsonCodec import JsonCodec
+
+log = logging.getLogger(__name__)
+
+
+class AsyncApiBase(object):
+    def __init__(self, apiKey=None, userAgent=None, apiName=None, apiUrl=None, verify=True, maxConnections=100, chunkSize=65536, jsonCodec=None, writeSize=1048576):
+        """
+        Core asyncio methods supporting the OneDep web client API.
+
+        :param string apiKey: (Optional) security token.
+        :param string userAgent: (Optional) alternative identifier for calling application.
+        :param string apiName: (Optional) API service name
+        :param string apiUrl: (Optional) API service base URL.
+        :param string verify:  (Optional) verify SSL certificate
+        :param int maxConnections: (Optional) limit on simultaneous connections held by the client
+        :param int chunkSize: (Optional) read size for streamed downloads
+        :param object jsonCodec: (Optional) JsonCodec instance used to decode service responses
+        :param int writeSize: (Optional) size of the blocks of downloaded content written to disk
+
+        The underlying aiohttp client session is created on first use within the running
+        event loop. Release it with close() or by using the client as an async context manager.
+
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncApiBase requires the aiohttp package")
+        log.debug("Async service initializing")
+        self.__chunkSize = chunkSize
+        self.__writeSize = max(chunkSize, writeSize)
+        self.__maxConnections = maxConnections
+        self.__jsonCodec = jsonCodec if jsonCodec else JsonCodec()
+        #
+        self._apiUrl = apiUrl if apiUrl else "https://localhost"
+        self._apiKey = apiKey if apiKey else "anonymous"
+        self._apiName = apiName if apiName else "onedep"
+        #
+        self.__headers = {
+            "User-Agent": userAgent if userAgent else "OneDepApiClient/%s Python/%s " % (__version__, sys.version.split()[0]),
+            "wwpdb-api-token": "%s %s" % ("Bearer", self._apiKey),
+        }
+        self.__myreq = None
+        #
+        self._returnApiErrorFlagKey = "onedep_error_flag"
+        self._returnApiStatusTextKey = "onedep_status_text"
+        #
+        self._sessionId = None
+        #
+        self._verify = verify
+        self._reservedContentTypes = {}
+
+    async def __aenter__(self):
+        self.__getClient()
+        return self
+
+    async def __aexit__(self, excType, excValue, traceback):
+        await self.close()
+
+    async def close(self):
+        """Release the connections held by this client."""
+        if self.__myreq is not None:
+            await self.__myreq.close()
+            self.__myreq = None
+
+    def __getClient(self):
+        if self.__myreq is None or self.__myreq.closed:
+            connector = aiohttp.TCPConnector(limit=self.__maxConnections, ssl=True if self._verify else False)
+            self.__myreq = aiohttp.ClientSession(headers=self.__headers, connector=connector)
+        return self.__myreq
+
+    async def createSession(self):
+        """Create and maintain a session context in all subsequent API requests.
+
+        :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text, session_id)
+        """
+        pD = {}
+        rD = await self.post("session", **pD)
+        self._sessionId = rD.get("session_id", None)
+        return rD
+
+    def setSession(self, sessionId):
+        """Set the identifier for the current session context."""
+        self._sessionId = sessionId
+
+    def getSession(self):
+        return self._sessionId
+
+    def __addSessionContext(self, pD):
+        """Internal method to add the current session context to the input parameter dictionary."""
+        if "session_id" not in pD:
+            pD["session_id"] = self.getSession()
+
+    def setApiReturnStatusKeys(self, errorFlagKey, statusTextKey):
+        self._returnApiErrorFlagKey = errorFlagKey
+        self._returnApiStatusTextKey = statusTextKey
+
+    def setContentTypes(self, contentTypeDict):
+        try:
+            self._reservedContentTypes = copy.deepcopy(contentTypeDict)
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            return False
+
+    def getContentTypes(self):
+        try:
+            return self._reservedContentTypes.keys()
+        except:  # noqa: E722 pylint: disable=bare-except
+            return []
+
+    def getContentFormatDefault(self, contentType):
+        try:
+            if contentType in self._reservedContentTypes:
+                return self._reservedContentTypes[contentType][0]
+            else:
+                return None
+        except:  # noqa: E722 pylint: disable=bare-except
+            return None
+
+    def __formParams(self, params):
+        """Internal method to render parameters as form fields (None values are omitted as in requests)."""
+        _params = {}
+        for p in params:
+            if params[p] is not None:
+                _params[p] = "%s" % params[p]
+        return _params
+
+    async def downloadByName(self, dstPath, fileName, endPoint="download", **params):
+        """Construct GET request to download the target fileName to dstPath.
+
+        :rtype: json response converted to dictionary
+        """
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        _params["filename"] = fileName
+        return await self.__download(dstPath, endPoint, **_params)
+
+    async def downloadByType(self, dstPath, contentType, endPoint="download", **params):
+        """Construct GET request to download the target data object type to dstPath.
+
+        :rtype: json response converted to dictionary
+        """
+        rD = {}
+        if contentType not in self._reservedContentTypes:
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "Unrecognized content type"
+            return rD
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        _params["contenttype"] = contentType
+        _params["formattype"] = self.getContentFormatDefault(contentType)
+        return await self.__download(dstPath, endPoint=endPoint, **_params)
+
+    async def download(self, dstPath, contentType, formatType, endPoint="download", **params):
+        """Construct GET request to download the target data object type to dstPath.
+
+        :param string contentType: data object content type target download
+        :param string formatType: data object format type target download
+        :param string dstPath: full local path to file for download
+        :param string endPoint:  API endPoint  - valws.
+        :param params: (Optional) Parameters as keyword arguments.
+
+        :rtype: json response converted to dictionary
+        """
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        _params["contenttype"] = contentType
+        _params["formattype"] = formatType
+        return await self.__download(dstPath, endPoint=endPoint, **_params)
+
+    async def __download(self, dstPath, endPoint="download", **params):
+        """Internal method to stream the content/format type to dstPath.
+
+        Chunks are hashed as they arrive and collected into blocks of writeSize bytes. Each block is
+        written by the default executor while the next one is received, so that the event loop is not
+        blocked by local disk I/O and there is one executor call per block rather than per chunk.
+
+        :rtype: json response converted to dictionary
+        """
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        self.__addSessionContext(_params)
+        log.debug(" DOWNLOAD BEGINS for : %s %r", dstPath, _params)
+        #
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
+        #
+        url = "%s/service/%s/%s" % (self._apiUrl, self._apiName, endPoint)
+        loop = asyncio.get_running_loop()
+        md5 = hashlib.md5()
+        try:
+            async with self.__getClient().get(url, params=self.__formParams(_params)) as response:
+                errFlag, errD = await self.__filterErrors(response)
+                if errFlag:
+                    return errD
+                if response.status == 200:
+                    fh = await loop.run_in_executor(None, open, dstPath, "wb")
+                    pending = None
+                    try:
+                        block = bytearray()
+                        async for chunk in response.content.iter_chunked(self.__chunkSize):
+                            md5.update(chunk)
+                            block += chunk
+                            if len(block) >= self.__writeSize:
+                                if pending is not None:
+                                    await pending
+                                pending = loop.run_in_executor(None, fh.write, block)
+                                block = bytearray()
+                        if pending is not None:
+                            await pending
+                            pending = None
+                        if block:
+                            await loop.run_in_executor(None, fh.write, block)
+                    finally:
+                        if pending is not None:
+                            await asyncio.wait([pending])
+                        await loop.run_in_executor(None, fh.close)
+                rD[self._returnApiErrorFlagKey] = False
+                rD[self._returnApiStatusTextKey] = "ok"
+                log.debug("download response headers %r", response.headers)
+                theDigest = response.headers.get("checksum_md5")
+        except Exception as e:
+            return self.__filterExceptions(e, msgDefault="Download request processing exception")
+        #
+        if theDigest is None:
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "Download checksum processing error %r " % dstPath
+        elif md5.hexdigest() != theDigest:
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "Checksum failure"
+        else:
+            log.debug("checksum comparison success")
+        return rD
+
+    async def upload(self, filePath, contentType, fileFormat, endPoint="upload", **params):
+        """Construct POST request to perform multipart/ file upload and return the JSON response.
+
+        The file is streamed from disk by aiohttp so memory use does not grow with the file size.
+
+        :rtype: json response converted to dictionary
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
+        #
+        if contentType not in self._reservedContentTypes:
+            rD[self._returnApiStatusTextKey] = "Unrecognized file type"
+            return rD
+        if fileFormat not in self._reservedContentTypes[contentType]:
+            rD[self._returnApiStatusTextKey] = "Unrecognized file format"
+            return rD
+        #
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        self.__addSessionContext(_params)
+        loop = asyncio.get_running_loop()
+        try:
+            _params["checksum_md5"] = await loop.run_in_executor(None, self.getMD5, filePath)
+            _params["content_type"] = contentType
+            _params["file_format"] = fileFormat
+            _, fn = os.path.split(filePath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            rD[self._returnApiStatusTextKey] = "Input file access or processing error "
+            return rD
+        #
+        url = "%s/service/%s/%s" % (self._apiUrl, self._apiName, endPoint)
+        try:
+            with open(filePath, "rb") as fobj:
+                fD = aiohttp.FormData()
+                for ky, val in self.__formParams(_params).items():
+                    fD.add_field(ky, val)
+                fD.add_field("file", fobj, filename=fn)
+                async with self.__getClient().post(url, data=fD) as response:
+                    return await self.__processJsonResponse(response, rD, "Upload response processing error")
+        except Exception as e:
+            return self.__filterExceptions(e, msgDefault="Upload request processing exception")
+
+    def __filterExceptions(self, exception, msgDefault="OneDep API service failure"):
+        """Map exceptions to the response dictionary."""
+        msg = msgDefault
+        try:
+            msg = str(exception) or msgDefault
+        except:  # noqa: E722 pylint: disable=bare-except
+            pass
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = msg
+        return rD
+
+    async def __filterErrors(self, response, msgDefault="OneDep API service failure"):
+        """Check the response for typical error types and map these to the response dictionary.
+
+        :rtype tuple:  errorFlag, response dictionary (with mininal keys: api_error_flag, api_status_text)
+        """
+        errorFlag = False
+        msg = "unprocessed"
+        if response.status in [401, 404, 500]:
+            errorFlag = True
+            msg = msgDefault
+            try:
+                errD = self.__jsonCodec.loads(await response.read())
+                msg = errD["statustext"]
+            except:  # noqa: E722 pylint: disable=bare-except
+                pass
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = errorFlag
+        rD[self._returnApiStatusTextKey] = msg
+        return errorFlag, rD
+
+    async def __processJsonResponse(self, response, rD, msgError):
+        errFlag, errD = await self.__filterErrors(response)
+        if errFlag:
+            return errD
+        try:
+            rD.update(self.__jsonCodec.loads(await response.read()))
+            rD[self._returnApiErrorFlagKey] = rD["errorflag"]
+            rD[self._returnApiStatusTextKey] = rD["statusmessage"]
+        except Exception as e:
+            rD[self._returnApiErrorFlagKey] = True
+            rD[self._returnApiStatusTextKey] = "%s %r" % (msgError, str(e))
+        return rD
+
+    async def post(self, endPoint, **params):
+        """Construct POST request and return the JSON response.
+
+        :param string endPoint:  API endPoint  - valws.
+        :param params: (Optional) Parameters as keyword arguments.
+
+        :rtype: json response converted to dictionary
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
+        url = "%s/service/%s/%s" % (self._apiUrl, self._apiName, endPoint)
+        #
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        self.__addSessionContext(_params)
+        #
+        log.debug("Request: %s %s", url, _params)
+        try:
+            async with self.__getClient().post(url, data=self.__formParams(_params)) as response:
+                return await self.__processJsonResponse(response, rD, "POST request processing error")
+        except Exception as e:
+            return self.__filterExceptions(e, msgDefault="POST request processing exception")
+
+    async def get(self, endPoint, **params):
+        """Construct GET request and return the JSON response.
+
+        :param string endPoint:  API endPoint  - valws.
+        :param params: (Optional) Parameters as keyword arguments.
+
+        :rtype: json response converted to dictionary
+        """
+        rD = {}
+        rD[self._returnApiErrorFlagKey] = True
+        rD[self._returnApiStatusTextKey] = "Miscellaneous api failure"
+        _params = {}
+        for p in params:
+            _params[p] = params[p]
+        self.__addSessionContext(_params)
+        #
+        url = "%s/service/%s/%s" % (self._apiUrl, self._apiName, endPoint)
+        try:
+            async with self.__getClient().get(url, params=self.__formParams(_params)) as response:
+                return await self.__processJsonResponse(response, rD, "Request processing error")
+        except Exception as e:
+            return self.__filterExceptions(e, msgDefault="GET request processing exception")
+
+    def getMD5(self, path, block_size=65536, hr=True):
+        """Chunked MD5 function (blocking - run in an executor from coroutines)."""
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(block_size), b""):
+                md5.update(chunk)
+        if hr:
+            return md5.hexdigest()
+        return md5.digest()
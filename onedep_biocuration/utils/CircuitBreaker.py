@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+CircuitBreaker.py
+^^^^^^^^^^^^^^^^^
+
+Circuit breaker failing requests fast while a service endpoint is unavailable.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  add cancel() for allowed requests which are not made
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+import threading
+import time
+
+from onedep_biocuration.utils.RetryPolicy import isTransientException
+
+log = logging.getLogger(__name__)
+
+
+class CircuitBreaker(object):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failureThreshold=5, resetTimeout=30.0, halfOpenMaxCalls=1, failureStatusCodes=(429, 500, 502, 503, 504)):
+        """
+        Circuit breaker with a separate circuit for each service URL and endpoint.
+
+        A circuit opens after failureThreshold consecutive failures (connection failures or responses
+        with one of the failure status codes). While it is open requests are refused without contacting
+        the service. After resetTimeout seconds the circuit is half-open and admits up to halfOpenMaxCalls
+        trial requests: a success closes the circuit and a failure opens it again.
+
+        Share one instance between clients (and threads) to share the state of each circuit.
+
+        :param int failureThreshold: (Optional) consecutive failures which open the circuit
+        :param float resetTimeout: (Optional) time (seconds) the circuit stays open before trial requests are admitted
+        :param int halfOpenMaxCalls: (Optional) largest number of concurrent trial requests in the half-open state
+        :param list failureStatusCodes: (Optional) HTTP status codes counted as failures
+
+        """
+        self.__failureThreshold = failureThreshold
+        self.__resetTimeout = resetTimeout
+        self.__halfOpenMaxCalls = halfOpenMaxCalls
+        self.__failureStatusCodes = failureStatusCodes
+        self.__lock = threading.Lock()
+        # (apiUrl, endPoint) -> {"state", "failures", "openedAt", "trials"}
+        self.__circuitD = {}
+
+    def __circuit(self, apiUrl, endPoint):
+        return self.__circuitD.setdefault((apiUrl, endPoint), {"state": self.CLOSED, "failures": 0, "openedAt": 0.0, "trials": 0})
+
+    def __updateState(self, cD, now):
+        if cD["state"] == self.OPEN and now - cD["openedAt"] >= self.__resetTimeout:
+            cD["state"] = self.HALF_OPEN
+            cD["trials"] = 0
+
+    def getState(self, apiUrl, endPoint):
+        """Return the state ('closed', 'open' or 'half-open') of the circuit for the input service URL and endpoint."""
+        with self.__lock:
+            cD = self.__circuit(apiUrl, endPoint)
+            self.__updateState(cD, time.time())
+            return cD["state"]
+
+    def getRetryTime(self, apiUrl, endPoint):
+        """Return the time (seconds) until trial requests are admitted to an open circuit (0 otherwise)."""
+        with self.__lock:
+            cD = self.__circuit(apiUrl, endPoint)
+            if cD["state"] != self.OPEN:
+                return 0.0
+            return max(0.0, cD["openedAt"] + self.__resetTimeout - time.time())
+
+    def allow(self, apiUrl, endPoint):
+        """Return True if a request to the input service URL and endpoint may be made now.
+
+        Each allowed request must be followed by a call to record() with its outcome.
+        """
+        with self.__lock:
+            cD = self.__circuit(apiUrl, endPoint)
+            self.__updateState(cD, time.time())
+            if cD["state"] == self.CLOSED:
+                return True
+            if cD["state"] == self.HALF_OPEN and cD["trials"] < self.__halfOpenMaxCalls:
+                cD["trials"] += 1
+                return True
+            return False
+
+    def cancel(self, apiUrl, endPoint):
+        """Withdraw a request allowed by allow() which was not made."""
+        with self.__lock:
+            cD = self.__circuit(apiUrl, endPoint)
+            if cD["state"] == self.HALF_OPEN:
+                cD["trials"] = max(0, cD["trials"] - 1)
+
+    def isFailure(self, response=None, exception=None):
+        """Return True if the outcome of a request (response or raised exception) indicates an unavailable service."""
+        if exception is not None:
+            return isTransientException(exception)
+        return response is not None and response.status_code in self.__failureStatusCodes
+
+    def record(self, apiUrl, endPoint, failed):
+        """Record the outcome of a request allowed by allow()."""
+        with self.__lock:
+            cD = self.__circuit(apiUrl, endPoint)
+            if cD["state"] == self.HALF_OPEN:
+                cD["trials"] = max(0, cD["trials"] - 1)
+            if not failed:
+                if cD["state"] != self.CLOSED:
+                    log.info("Circuit for %s %s closed", apiUrl, endPoint)
+                cD["state"] = self.CLOSED
+                cD["failures"] = 0
+                return
+            cD["failures"] += 1
+            if cD["state"] == self.HALF_OPEN or (cD["state"] == self.CLOSED and cD["failures"] >= self.__failureThreshold):
+                log.warning("Circuit for %s %s opened after %d consecutive failures", apiUrl, endPoint, cD["failures"])
+                cD["state"] = self.OPEN
+                cD["openedAt"] = time.time()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+CompressedFile.py
+^^^^^^^^^^^^^^^^^
+
+Compressed (gzip/zstd) storage of downloaded reports and a transparent reader.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import gzip
+import io
+import logging
+import os
+import shutil
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+# leading bytes of each supported compressed file format
+_magicD = {"gzip": b"\x1f\x8b", "zstd": b"\x28\xb5\x2f\xfd"}
+
+
+def checkCompression(compression):
+    """Raise ValueError unless the input compression ('gzip' or 'zstd') is supported in this environment."""
+    if compression not in _magicD:
+        raise ValueError("Unsupported compression %r" % compression)
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+
+def detectCompression(filePath):
+    """Return the compression of the input file ('gzip', 'zstd') or None for an uncompressed file."""
+    with open(filePath, "rb") as ifh:
+        head = ifh.read(4)
+    for compression, magic in _magicD.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def openCompressedWriter(filePath, compression, level=None):
+    """Return a binary file object compressing the content written to filePath.
+
+    :param string filePath: output file path
+    :param string compression: 'gzip' or 'zstd'
+    :param int level: (Optional) compression level (default: 6 for gzip, 3 for zstd)
+    """
+    checkCompression(compression)
+    if compression == "gzip":
+        return gzip.open(filePath, "wb", compresslevel=level if level is not None else 6)
+    cctx = zstandard.ZstdCompressor(level=level if level is not None else 3)
+    return cctx.stream_writer(open(filePath, "wb"), closefd=True)
+
+
+def openReport(filePath, mode="rb", encoding="utf-8"):
+    """Open a report written either plain or compressed (gzip/zstd) for reading.
+
+    :param string filePath: report file path
+    :param string mode: (Optional) 'rb' for bytes or 'r' for text
+    :param string encoding: (Optional) text encoding in mode 'r'
+
+    :rtype: file object returning the uncompressed content
+    """
+    if mode not in ["r", "rb"]:
+        raise ValueError("Unsupported mode %r" % mode)
+    compression = detectCompression(filePath)
+    if compression == "gzip":
+        fh = gzip.open(filePath, "rb")
+    elif compression == "zstd":
+        checkCompression(compression)
+        fh = zstandard.ZstdDecompressor().stream_reader(open(filePath, "rb"), closefd=True)
+    else:
+        fh = open(filePath, "rb")
+    return fh if mode == "rb" else io.TextIOWrapper(fh, encoding=encoding)
+
+
+def compressFile(srcPath, dstPath, compression, level=None, blockSize=1048576):
+    """Store a compressed copy of the plain file srcPath in dstPath (which may be srcPath)."""
+    tmpPath = dstPath + ".tmp"
+    try:
+        with open(srcPath, "rb") as ifh, openCompressedWriter(tmpPath, compression, level=level) as ofh:
+            shutil.copyfileobj(ifh, ofh, blockSize)
+        if os.path.exists(dstPath):
+            os.remove(dstPath)
+        os.rename(tmpPath, dstPath)
+    finally:
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
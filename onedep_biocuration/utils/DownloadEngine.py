@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+DownloadEngine.py
+^^^^^^^^^^^^^^^^^
+
+Large-buffer writer for streamed HTTP response bodies.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  optionally store the body gzip/zstd-compressed
+    18-Oct-2026  optionally accumulate the time spent writing to disk
+    18-Oct-2026  read directly from the underlying HTTP response (urllib3 readinto() copies through read())
+    18-Oct-2026  use the underlying HTTP response only with the urllib3 internals present (urllib3>=1.26,<3)
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import socket
+import time
+
+try:
+    from http.client import HTTPException, IncompleteRead
+except ImportError:  # pragma: no cover
+    from httplib import HTTPException, IncompleteRead
+
+from onedep_biocuration.utils.CompressedFile import openCompressedWriter
+
+log = logging.getLogger(__name__)
+
+
+class DownloadEngine(object):
+    def __init__(self, bufferSize=None, minBufferSize=64 * 1024, maxBufferSize=4 * 1024 * 1024, defaultBufferSize=1024 * 1024, preallocate=True):
+        """
+        Copy a streamed response body to a local file through a single reused buffer.
+
+        The body is read into a bytearray/memoryview allocated once per transfer and sized to the
+        transfer (Content-Length clamped to [minBufferSize, maxBufferSize]).  The urllib3 response
+        readinto() reads into a new bytes object and copies it, so the body is read with readinto()
+        of the underlying http.client response where available, which fills the buffer from the socket.
+        When the length of the transfer is known the target file is preallocated.
+
+        :param int bufferSize: (Optional) fixed buffer size (bytes) overriding the sizing rule
+        :param int minBufferSize: (Optional) lower limit on the buffer size (bytes)
+        :param int maxBufferSize: (Optional) upper limit on the buffer size (bytes)
+        :param int defaultBufferSize: (Optional) buffer size (bytes) when the transfer length is unknown
+        :param bool preallocate: (Optional) reserve the file size before writing
+
+        """
+        self.__bufferSize = bufferSize
+        self.__minBufferSize = minBufferSize
+        self.__maxBufferSize = maxBufferSize
+        self.__defaultBufferSize = defaultBufferSize
+        self.__preallocate = preallocate
+
+    def getBufferSize(self, contentLength=None):
+        """Return the buffer size (bytes) used for a transfer of the input length."""
+        if self.__bufferSize:
+            return self.__bufferSize
+        size = contentLength if contentLength else self.__defaultBufferSize
+        return int(max(self.__minBufferSize, min(self.__maxBufferSize, size)))
+
+    def __reserve(self, fh, length):
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fh.fileno(), 0, length)
+            else:
+                fh.truncate(length)
+            return True
+        except (OSError, IOError) as e:
+            log.debug("Preallocation of %d bytes skipped: %s", length, str(e))
+            return False
+
+    def __reader(self, raw):
+        """Internal method to return a function reading the next part of the body of the urllib3 response raw into a buffer.
+
+        This relies on urllib3 response internals (_fp, the http.client response, and the _fp_bytes_read count
+        behind tell()) which are present in the releases allowed by setup.py (urllib3>=1.26,<3).  The public
+        readinto() of the urllib3 response is used if these are missing.
+        """
+        fp = getattr(raw, "_fp", None)
+        if fp is None or not hasattr(fp, "readinto") or not hasattr(raw, "_fp_bytes_read") or getattr(raw, "_decoded_buffer", None):
+            return raw.readinto
+        from urllib3.exceptions import ProtocolError  # pylint: disable=import-outside-toplevel
+
+        def readinto(mv):
+            try:
+                nRead = fp.readinto(mv)
+            except socket.timeout:
+                raw.close()
+                raise
+            except (HTTPException, socket.error) as e:
+                # as urllib3 does - discard the connection and report a broken transfer
+                raw.close()
+                raise ProtocolError("Connection broken: %r" % e, e)
+            # keep the urllib3 response tell() (bytes of the body received) up to date
+            raw._fp_bytes_read += nRead  # pylint: disable=protected-access
+            if not nRead:
+                # http.client does not check that the Content-Length was received (urllib3 does)
+                remaining = getattr(fp, "length", None)
+                if remaining:
+                    raw.close()
+                    raise ProtocolError("Connection broken: %d bytes of the body not received" % remaining, IncompleteRead(b"", remaining))
+                if fp.isclosed():
+                    # the body is complete - return the connection to the pool
+                    raw.release_conn()
+            return nRead
+
+        return readinto
+
+    def fetch(self, response, dstPath, digest=None, offset=0, compression=None, statsD=None):
+        """Write the body of the streamed response to dstPath.
+
+        :param object response: streamed requests response object
+        :param string dstPath: local file path
+        :param object digest: (Optional) StreamDigest updated with each block written
+        :param int offset: (Optional) file offset at which the body is written (existing content before offset is kept)
+        :param string compression: (Optional) store the body 'gzip' or 'zstd' compressed (the digest covers the uncompressed body)
+        :param dict statsD: (Optional) dictionary in which the time spent writing the file (seconds) is added to key 'write'
+
+        :rtype: int number of body bytes written
+        """
+        encoded = response.headers.get("Content-Encoding", "").strip().lower() not in ["", "identity"]
+        try:
+            contentLength = None if encoded else int(response.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            contentLength = None
+        #
+        bufSize = self.getBufferSize(contentLength)
+        buf = bytearray(bufSize)
+        mv = memoryview(buf)
+        copyChunks = digest is not None and digest.isPipelined()
+        raw = response.raw
+        readinto = None if encoded else self.__reader(raw)
+        nBytes = 0
+        if compression and offset:
+            raise ValueError("Compressed output cannot be written at an offset")
+        with openCompressedWriter(dstPath, compression) if compression else open(dstPath, "r+b" if offset else "wb") as fh:
+            if offset:
+                fh.truncate(offset)
+                fh.seek(offset)
+            reserved = self.__preallocate and contentLength and not compression and self.__reserve(fh, offset + contentLength)
+            try:
+                while True:
+                    if encoded:
+                        # content codings are undone by urllib3 - read decoded blocks rather than raw bytes
+                        block = raw.read(bufSize, decode_content=True)
+                        nRead = len(block)
+                    else:
+                        nRead = readinto(mv)
+                        block = mv[:nRead]
+                    if not nRead:
+                        break
+                    if statsD is None:
+                        fh.write(block)
+                    else:
+                        startTime = time.time()
+                        fh.write(block)
+                        statsD["write"] = statsD.get("write", 0.0) + time.time() - startTime
+                    if digest is not None:
+                        digest.update(bytes(block) if copyChunks and not encoded else block)
+                    nBytes += nRead
+            finally:
+                # an interrupted transfer must leave only the bytes received (see resumable downloads)
+                if reserved and nBytes != contentLength:
+                    fh.truncate(offset + nBytes)
+        return nBytes
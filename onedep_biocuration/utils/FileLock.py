@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+FileLock.py
+^^^^^^^^^^^
+
+Advisory inter-process lock on a local file (fcntl where available).
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+
+class FileLock(object):
+    def __init__(self, lockPath):
+        """
+        Exclusive lock shared by the threads of this process and, where fcntl is available,
+        by other processes using the same lock file.
+
+        :param string lockPath: path of the lock file (created if missing)
+
+        """
+        self.__lockPath = lockPath
+        self.__threadLock = threading.Lock()
+        self.__fh = None
+
+    def acquire(self):
+        self.__threadLock.acquire()
+        try:
+            self.__fh = open(self.__lockPath, "a")
+            if fcntl is not None:
+                fcntl.flock(self.__fh.fileno(), fcntl.LOCK_EX)
+        except Exception:
+            self.__release()
+            raise
+
+    def __release(self):
+        try:
+            if self.__fh is not None:
+                if fcntl is not None:
+                    fcntl.flock(self.__fh.fileno(), fcntl.LOCK_UN)
+                self.__fh.close()
+        finally:
+            self.__fh = None
+            self.__threadLock.release()
+
+    def release(self):
+        self.__release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.release()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+JsonCodec.py
+^^^^^^^^^^^^
+
+JSON encoding and decoding of service payloads with an optional accelerated backend.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import sys
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+
+class JsonCodec(object):
+    def __init__(self, backend=None):
+        """
+        JSON codec decoding response payloads directly from bytes.
+
+        The orjson backend is used when it is installed (payloads it rejects are decoded by the
+        standard library json module instead).
+
+        :param string backend: (Optional) 'orjson' or 'json' (default: 'orjson' if installed otherwise 'json')
+
+        """
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        if backend == "orjson" and orjson is None:
+            raise ValueError("JSON backend orjson is not installed")
+        if backend not in ["orjson", "json"]:
+            raise ValueError("Unsupported JSON backend %r" % backend)
+        self.__backend = backend
+
+    def getBackendName(self):
+        return self.__backend
+
+    def loads(self, data):
+        """Return the object decoded from the input JSON bytes (UTF-8) or text.
+
+        :raises ValueError: for malformed input
+        """
+        if self.__backend == "orjson":
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError as e:
+                log.debug("orjson decoding failed (%s) - using json", str(e))
+        if isinstance(data, bytes) and sys.version_info < (3, 6):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """Return the JSON text for the input object."""
+        if self.__backend == "orjson":
+            try:
+                return orjson.dumps(obj).decode("utf-8")
+            except TypeError as e:
+                log.debug("orjson encoding failed (%s) - using json", str(e))
+        return json.dumps(obj)
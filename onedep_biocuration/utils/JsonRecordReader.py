@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+JsonRecordReader.py
+^^^^^^^^^^^^^^^^^^^
+
+Incremental reader yielding the records of large JSON report files one at a time.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  skip unwanted values without decoding them and follow keyPath within top-level arrays
+    18-Oct-2026  decode numbers split across blocks
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import codecs
+import io
+import json
+import logging
+import re
+
+log = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+_STRING_PATTERN = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+# text without brackets (complete strings included) and containers holding no other container
+_RUN_PATTERN = r'[^"\\\[\]{}]*(?:%s[^"\\\[\]{}]*)*' % _STRING_PATTERN
+_STRING = re.compile(_STRING_PATTERN)
+_FLAT_CONTAINER = re.compile(r"[\[{]%s[\]}]" % _RUN_PATTERN)
+_BETWEEN_BRACKETS = re.compile(r"%s(?:[\[{]%s[\]}]%s)*" % (_RUN_PATTERN, _RUN_PATTERN, _RUN_PATTERN))
+# longest text matched at once when skipping (bounds the memory used by the regular expression engine)
+_SKIP_WINDOW = 8192
+
+
+class JsonRecordReader(object):
+    def __init__(self, source, keyPath=None, blockSize=1048576):
+        """
+        Iterate over the records of a JSON document read in blocks, so that memory use is bounded
+        by the size of the largest record rather than the size of the document.
+
+        The records are the elements of the arrays in the document which are reached through objects
+        only: the elements of a top-level array, or the elements of the arrays held by the (nested)
+        object members of a top-level object (e.g. {"data": [...]} or {"table_a": [...], "table_b": [...]}).
+        Other object members are skipped without being decoded (and without checking their syntax).
+        With keyPath and a top-level array, the records are looked up along keyPath in each of its
+        object elements (e.g. [{"data": [...]}, {"data": [...]}]).
+
+        :param source: path of the JSON file or a readable file object (text or binary)
+        :param list keyPath: (Optional) object member names leading to the arrays whose records are wanted (e.g. ["data"])
+        :param int blockSize: (Optional) number of characters read from the source at once
+
+        """
+        self.__source = source
+        self.__keyPath = list(keyPath) if keyPath is not None else None
+        self.__blockSize = blockSize
+        self.__decoder = json.JSONDecoder()
+        self.__fh = None
+        self.__textDecoder = None
+        self.__buf = ""
+        self.__pos = 0
+        self.__eof = False
+
+    def __iter__(self):
+        ownFile = not hasattr(self.__source, "read")
+        self.__fh = io.open(self.__source, "r", encoding="utf-8") if ownFile else self.__source
+        self.__textDecoder = None
+        self.__buf = ""
+        self.__pos = 0
+        self.__eof = False
+        try:
+            for record in self.__records():
+                yield record
+        finally:
+            if ownFile:
+                self.__fh.close()
+            self.__fh = None
+
+    def __fill(self):
+        """Internal method to append the next block of the source to the buffer (returns False at the end of the source)."""
+        if self.__eof:
+            return False
+        data = self.__fh.read(self.__blockSize)
+        while isinstance(data, bytes):
+            if self.__textDecoder is None:
+                self.__textDecoder = codecs.getincrementaldecoder("utf-8")()
+            text = self.__textDecoder.decode(data, final=not data)
+            # a block may end within a multi-byte character
+            data = text if text or not data else self.__fh.read(self.__blockSize)
+        if not data:
+            self.__eof = True
+            return False
+        # drop the consumed part of the buffer
+        self.__buf = self.__buf[self.__pos :] + data
+        self.__pos = 0
+        return True
+
+    def __peek(self):
+        """Internal method to return the next non-whitespace character (None at the end of the source)."""
+        while True:
+            while self.__pos < len(self.__buf) and self.__buf[self.__pos] in _WHITESPACE:
+                self.__pos += 1
+            if self.__pos < len(self.__buf):
+                return self.__buf[self.__pos]
+            if not self.__fill():
+                return None
+
+    def __expect(self, chars):
+        ch = self.__peek()
+        if ch is None or ch not in chars:
+            raise ValueError("Expecting one of %r at character %d of the current block, found %r" % (chars, self.__pos, ch))
+        self.__pos += 1
+        return ch
+
+    def __value(self):
+        """Internal method to decode the next complete JSON value."""
+        self.__peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buf, self.__pos)
+                # a number may continue in the next block (e.g. 1 followed by .5)
+                if self.__eof or (end < len(self.__buf) and self.__buf[end] not in _NUMBER_CHARS):
+                    self.__pos = end
+                    return value
+            except ValueError:
+                if self.__eof:
+                    raise
+            if not self.__fill():
+                value, self.__pos = self.__decoder.raw_decode(self.__buf, self.__pos)
+                return value
+
+    def __skip(self):
+        """Internal method to pass over the next JSON value without decoding it."""
+        ch = self.__peek()
+        if ch == '"':
+            while True:
+                match = _STRING.match(self.__buf, self.__pos)
+                if match is not None:
+                    self.__pos = match.end()
+                    return
+                if not self.__fill():
+                    raise ValueError("Unterminated string at the end of the document")
+        if ch is None or ch not in "[{":
+            # numbers and literals are short
+            self.__value()
+            return
+        match = _FLAT_CONTAINER.match(self.__buf, self.__pos)
+        if match is not None:
+            self.__pos = match.end()
+            return
+        depth = 1
+        self.__pos += 1
+        while True:
+            # pass over the text up to the next bracket of a nested container in one match
+            buf = self.__buf
+            pos = _BETWEEN_BRACKETS.match(buf, self.__pos, self.__pos + _SKIP_WINDOW).end()
+            if pos < len(buf):
+                if buf[pos] in "[]{}":
+                    depth += 1 if buf[pos] in "[{" else -1
+                    self.__pos = pos + 1
+                    if depth == 0:
+                        return
+                    continue
+                if pos > self.__pos:
+                    self.__pos = pos
+                    continue
+                # a string longer than the window
+                match = _STRING.match(buf, pos)
+                if match is not None:
+                    self.__pos = match.end()
+                    continue
+            # a string continuing in the next block
+            self.__pos = pos
+            if not self.__fill():
+                raise ValueError("Unterminated JSON value at the end of the document")
+
+    def __records(self):
+        ch = self.__peek()
+        if ch == "[":
+            if not self.__keyPath:
+                for record in self.__array():
+                    yield record
+            else:
+                for record in self.__elementObjects():
+                    yield record
+        elif ch == "{":
+            for record in self.__object([]):
+                yield record
+        elif ch is not None:
+            self.__skip()
+
+    def __array(self):
+        self.__expect("[")
+        if self.__peek() == "]":
+            self.__pos += 1
+            return
+        while True:
+            yield self.__value()
+            if self.__expect(",]") == "]":
+                return
+
+    def __elementObjects(self):
+        """Internal method to yield the records found along keyPath in each object element of an array."""
+        self.__expect("[")
+        if self.__peek() == "]":
+            self.__pos += 1
+            return
+        while True:
+            if self.__peek() == "{":
+                for record in self.__object([]):
+                    yield record
+            else:
+                self.__skip()
+            if self.__expect(",]") == "]":
+                return
+
+    def __object(self, path):
+        self.__expect("{")
+        if self.__peek() == "}":
+            self.__pos += 1
+            return
+        while True:
+            if self.__peek() != '"':
+                raise ValueError("Expecting an object member name")
+            key = self.__value()
+            self.__expect(":")
+            memberPath = path + [key]
+            ch = self.__peek()
+            if self.__wanted(memberPath, ch):
+                if ch == "[":
+                    for record in self.__array():
+                        yield record
+                else:
+                    for record in self.__object(memberPath):
+                        yield record
+            else:
+                self.__skip()
+            if self.__expect(",}") == "}":
+                return
+
+    def __wanted(self, path, ch):
+        """Internal method to test if the member at path (starting with character ch) holds wanted records."""
+        if ch is None or ch not in "[{":
+            return False
+        if self.__keyPath is None:
+            return True
+        if ch == "[":
+            return path == self.__keyPath
+        return path == self.__keyPath[: len(path)] and len(path) < len(self.__keyPath)
+
+
+def iterSummaryRecords(source, keyPath=None, blockSize=1048576):
+    """Return an iterator over the records of a JSON summary report file (see JsonRecordReader).
+
+    :param source: path of the JSON file or a readable file object (text or binary)
+    :param list keyPath: (Optional) object member names leading to the array of wanted records (e.g. ["data"])
+    :param int blockSize: (Optional) number of characters read from the source at once
+    """
+    return iter(JsonRecordReader(source, keyPath=keyPath, blockSize=blockSize))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+MultipartEncoder.py
+^^^^^^^^^^^^^^^^^^^
+
+Streaming multipart/form-data request body with bounded memory use.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import uuid
+
+log = logging.getLogger(__name__)
+
+
+class MultipartEncoder(object):
+    def __init__(self, fields, fileFieldName, filePath, fileName=None, fileContentType="application/octet-stream", blockSize=65536, callback=None, boundary=None):
+        """
+        File-like multipart/form-data body which reads the upload file in fixed-size blocks as the
+        request is sent. The body length is known in advance so the request carries a Content-Length.
+
+        :param dict fields: form field names and values (None values are omitted)
+        :param string fileFieldName: form field name of the file part
+        :param string filePath: path of the file to upload
+        :param string fileName: (Optional) file name reported in the file part (default: base name of filePath)
+        :param string fileContentType: (Optional) content type of the file part
+        :param int blockSize: (Optional) largest block read from the file at once
+        :param callable callback: (Optional) progress callback(bytesSent, totalBytes) called after each read
+        :param string boundary: (Optional) multipart boundary
+
+        Close the encoder (or use it as a context manager) to release the upload file.
+        """
+        self.__boundary = boundary if boundary else uuid.uuid4().hex
+        self.__blockSize = blockSize
+        self.__callback = callback
+        fileName = fileName if fileName else os.path.basename(filePath)
+        #
+        head = []
+        for ky, val in fields.items():
+            if val is None:
+                continue
+            if isinstance(val, bytes):
+                val = val.decode("utf-8")
+            head.append('--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n%s\r\n' % (self.__boundary, ky, val))
+        head.append('--%s\r\nContent-Disposition: form-data; name="%s"; filename="%s"\r\nContent-Type: %s\r\n\r\n' % (self.__boundary, fileFieldName, fileName, fileContentType))
+        self.__fh = open(filePath, "rb")
+        fileSize = os.fstat(self.__fh.fileno()).st_size
+        # body segments: leading form fields, file content, closing boundary
+        self.__segmentL = [("".join(head).encode("utf-8"), None), (None, fileSize), (("\r\n--%s--\r\n" % self.__boundary).encode("utf-8"), None)]
+        self.__length = sum([len(seg) if seg is not None else size for seg, size in self.__segmentL])
+        self.__index = 0
+        self.__offset = 0
+        self.__sent = 0
+
+    @property
+    def contentType(self):
+        return "multipart/form-data; boundary=%s" % self.__boundary
+
+    def __len__(self):
+        return self.__length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        if self.__fh is not None:
+            self.__fh.close()
+            self.__fh = None
+
+    def tell(self):
+        return self.__sent
+
+    def read(self, size=-1):
+        """Return up to 'size' bytes of the request body (all remaining bytes for size < 0).
+
+        Memory use is bounded by 'size' - the HTTP client reads the body in small fixed-size blocks.
+        """
+        if size is None or size < 0:
+            size = self.__length - self.__sent
+        partL = []
+        remaining = size
+        while remaining > 0 and self.__index < len(self.__segmentL):
+            seg, segSize = self.__segmentL[self.__index]
+            if seg is not None:
+                part = seg[self.__offset : self.__offset + remaining]
+                segSize = len(seg)
+            else:
+                part = self.__fh.read(min(remaining, self.__blockSize))
+                if not part and self.__offset < segSize:
+                    raise IOError("Upload file truncated during transfer")
+            partL.append(part)
+            self.__offset += len(part)
+            remaining -= len(part)
+            if self.__offset >= segSize:
+                self.__index += 1
+                self.__offset = 0
+        data = b"".join(partL)
+        self.__sent += len(data)
+        if self.__callback and data:
+            self.__callback(self.__sent, self.__length)
+        return data
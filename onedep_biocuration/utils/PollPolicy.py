@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+PollPolicy.py
+^^^^^^^^^^^^^
+
+Polling schedules for service completion and persistent turnaround time estimates.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  wait for estimates longer than maxDelay in maxDelay steps and keep estimates in memory by default
+"""
+
+from __future__ import division
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class TurnaroundEstimator(object):
+    # conventional file for estimates shared across runs (used by the command line client)
+    DEFAULT_FILE_PATH = "~/.onedep_biocuration_turnaround.json"
+
+    def __init__(self, filePath=None, alpha=0.3):
+        """
+        Exponentially weighted estimates of request turnaround time for each content type.
+
+        :param string filePath: (Optional) file in which estimates are saved across runs (default: None - estimates are kept in memory)
+        :param float alpha: (Optional) weight of the most recent observation
+
+        """
+        self.__filePath = os.path.expanduser(filePath) if filePath else None
+        self.__alpha = alpha
+        self.__lock = threading.Lock()
+        self.__estimateD = None
+
+    def __load(self):
+        if self.__estimateD is None:
+            self.__estimateD = {}
+            if self.__filePath and os.path.exists(self.__filePath):
+                try:
+                    with open(self.__filePath, "r") as ifh:
+                        self.__estimateD = json.load(ifh)
+                except Exception as e:  # pylint: disable=broad-except
+                    log.debug("Ignoring unreadable turnaround estimate file %r %s", self.__filePath, str(e))
+        return self.__estimateD
+
+    def __save(self):
+        if not self.__filePath:
+            return
+        try:
+            dirPath = os.path.dirname(self.__filePath) or "."
+            fd, tmpPath = tempfile.mkstemp(prefix=".turnaround-", dir=dirPath)
+            with os.fdopen(fd, "w") as ofh:
+                json.dump(self.__estimateD, ofh, indent=1, sort_keys=True)
+            os.rename(tmpPath, self.__filePath)
+        except Exception as e:  # pylint: disable=broad-except
+            log.debug("Failed saving turnaround estimate file %r %s", self.__filePath, str(e))
+
+    def estimate(self, contentType):
+        """Return the estimated turnaround time (seconds) for the input content type or None."""
+        with self.__lock:
+            return self.__load().get(contentType)
+
+    def record(self, contentType, seconds):
+        """Update the turnaround estimate for the input content type with an observed duration (seconds)."""
+        if not contentType or seconds is None or seconds < 0:
+            return
+        with self.__lock:
+            eD = self.__load()
+            prev = eD.get(contentType)
+            eD[contentType] = seconds if prev is None else self.__alpha * seconds + (1.0 - self.__alpha) * prev
+            self.__save()
+
+
+class PollPolicy(object):
+    def __init__(self, initialDelay=1.0, maxDelay=60.0, multiplier=2.0, jitter=0.1, estimator=None):
+        """
+        Capped exponential backoff schedule with jitter for polling session completion.
+
+        When a turnaround estimate is available for the requested content type, polls are spaced by
+        maxDelay until the expected completion time and the backoff sequence starts from there.
+
+        :param float initialDelay: (Optional) first pause (seconds)
+        :param float maxDelay: (Optional) upper limit on any single pause (seconds)
+        :param float multiplier: (Optional) growth factor between successive pauses
+        :param float jitter: (Optional) fractional random spread applied to each pause
+        :param object estimator: (Optional) TurnaroundEstimator instance (default: estimates kept in memory)
+
+        """
+        self.initialDelay = initialDelay
+        self.maxDelay = maxDelay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.estimator = estimator if estimator is not None else TurnaroundEstimator()
+
+    def __spread(self, delay):
+        if self.jitter:
+            delay *= random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        return max(0.0, delay)
+
+    def pauses(self, contentType=None, elapsed=0.0):
+        """Generate the sequence of pauses (seconds) between successive status requests.
+
+        :param string contentType: (Optional) requested content type used to look up the turnaround estimate
+        :param float elapsed: (Optional) seconds already elapsed since the request was submitted
+
+        Each pause is assumed to be taken in full before the next one is requested.
+        """
+        expected = self.estimator.estimate(contentType) if contentType and self.estimator else None
+        while expected is not None and expected - elapsed > self.initialDelay:
+            pause = self.__spread(min(expected - elapsed, self.maxDelay))
+            elapsed += pause
+            yield pause
+        delay = self.initialDelay
+        while True:
+            yield self.__spread(min(delay, self.maxDelay))
+            delay = min(delay * self.multiplier, self.maxDelay)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+PooledHTTPAdapter.py
+^^^^^^^^^^^^^^^^^^^^
+
+Transport adapter with tunable connection pools and keep-alive idle eviction.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  time connection setup for request metrics
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection, HTTPSConnection  # pylint: disable=E0401
+from requests.packages.urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool  # pylint: disable=E0401
+
+log = logging.getLogger(__name__)
+
+# seconds spent opening connections (TCP and TLS setup) by requests made in each thread
+_connectTime = threading.local()
+
+
+def resetConnectTime():
+    """Reset the connection setup time accumulated by requests made in the calling thread."""
+    _connectTime.seconds = 0.0
+
+
+def popConnectTime():
+    """Return and reset the connection setup time (seconds) accumulated by requests made in the calling thread."""
+    seconds = getattr(_connectTime, "seconds", 0.0)
+    _connectTime.seconds = 0.0
+    return seconds
+
+
+class _TimedConnectMixin(object):
+    """Connection behaviour adding the duration of each connection setup to the time of the calling thread."""
+
+    def connect(self):
+        startTime = time.time()
+        try:
+            return super(_TimedConnectMixin, self).connect()
+        finally:
+            _connectTime.seconds = getattr(_connectTime, "seconds", 0.0) + time.time() - startTime
+
+
+_TimedHTTPConnection = type(str("TimedHTTPConnection"), (_TimedConnectMixin, HTTPConnection), {})
+_TimedHTTPSConnection = type(str("TimedHTTPSConnection"), (_TimedConnectMixin, HTTPSConnection), {})
+
+
+class _IdleEvictionMixin(object):
+    """Connection pool behaviour closing kept-alive connections which have been idle longer than maxIdle seconds.
+
+    A connection which has been closed reconnects on its next request, so an evicted connection is
+    reopened rather than reused after the server may already have dropped it.
+    """
+
+    maxIdle = None
+
+    def _get_conn(self, timeout=None):
+        conn = super(_IdleEvictionMixin, self)._get_conn(timeout=timeout)
+        idleSince = getattr(conn, "_onedepIdleSince", None)
+        if idleSince is not None and self.maxIdle is not None and time.time() - idleSince > self.maxIdle:
+            log.debug("Closing connection to %s idle for %.1f seconds", self.host, time.time() - idleSince)
+            conn.close()
+        conn._onedepIdleSince = None  # pylint: disable=protected-access
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._onedepIdleSince = time.time()  # pylint: disable=protected-access
+        super(_IdleEvictionMixin, self)._put_conn(conn)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    __attrs__ = HTTPAdapter.__attrs__ + ["_maxIdle"]
+
+    def __init__(self, poolConnections=10, poolMaxSize=10, poolBlock=False, maxIdle=None, maxRetries=0):
+        """
+        HTTP(S) transport adapter for a requests session.
+
+        :param int poolConnections: (Optional) number of per-host connection pools kept
+        :param int poolMaxSize: (Optional) largest number of connections kept alive for each host
+        :param bool poolBlock: (Optional) wait for a free connection when all poolMaxSize connections to a host
+                               are in use (otherwise open an extra connection which is discarded after use)
+        :param float maxIdle: (Optional) close kept-alive connections idle for longer than this (seconds) before reuse
+        :param int maxRetries: (Optional) connection retries passed to requests.adapters.HTTPAdapter
+
+        """
+        self._maxIdle = maxIdle
+        super(PooledHTTPAdapter, self).__init__(pool_connections=poolConnections, pool_maxsize=poolMaxSize, pool_block=poolBlock, max_retries=maxRetries)
+
+    def init_poolmanager(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        super(PooledHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        mixinL = [_IdleEvictionMixin] if self._maxIdle is not None else []
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(str("TimedHTTPConnectionPool"), tuple(mixinL + [HTTPConnectionPool]), {"maxIdle": self._maxIdle, "ConnectionCls": _TimedHTTPConnection}),
+            "https": type(str("TimedHTTPSConnectionPool"), tuple(mixinL + [HTTPSConnectionPool]), {"maxIdle": self._maxIdle, "ConnectionCls": _TimedHTTPSConnection}),
+        }
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+RateLimiter.py
+^^^^^^^^^^^^^^
+
+Token-bucket request rate limits shared by threads and, through a state file, by processes.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+    18-Oct-2026  fall back to in-process state when the state file cannot be used and save only when tokens are taken
+"""
+
+from __future__ import division
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from onedep_biocuration.utils.FileLock import FileLock
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket(object):
+    def __init__(self, rate, burst=1.0, statePath=None):
+        """
+        Token bucket admitting requests at an average rate with bursts of up to 'burst' requests.
+
+        With a state file the bucket is shared by every process using the same file (the file is
+        updated under an inter-process FileLock), otherwise by the threads of this process. While the
+        state file cannot be locked or written the bucket falls back to the state kept in this process.
+
+        :param float rate: tokens added per second
+        :param float burst: (Optional) bucket capacity (tokens)
+        :param string statePath: (Optional) file holding the shared bucket state
+
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.__rate = float(rate)
+        self.__burst = max(1.0, float(burst))
+        self.__statePath = os.path.expanduser(statePath) if statePath else None
+        self.__lock = threading.Lock()
+        self.__fileLock = FileLock(self.__statePath + ".lock") if self.__statePath else None
+        self.__stateD = {"tokens": self.__burst, "updated": time.time()}
+
+    def getRate(self):
+        return self.__rate
+
+    def __load(self):
+        if not self.__statePath or not os.path.exists(self.__statePath):
+            return
+        try:
+            with open(self.__statePath, "r") as ifh:
+                sD = json.load(ifh)
+            self.__stateD = {"tokens": float(sD["tokens"]), "updated": float(sD["updated"])}
+        except Exception as e:  # pylint: disable=broad-except
+            log.debug("Ignoring unreadable token bucket state %r %s", self.__statePath, str(e))
+
+    def __save(self):
+        tmpPath = None
+        try:
+            dirPath = os.path.dirname(self.__statePath) or "."
+            fd, tmpPath = tempfile.mkstemp(prefix=".bucket-", dir=dirPath)
+            with os.fdopen(fd, "w") as ofh:
+                json.dump(self.__stateD, ofh)
+            os.rename(tmpPath, self.__statePath)
+        except Exception as e:  # pylint: disable=broad-except
+            log.debug("Failed saving token bucket state %r %s", self.__statePath, str(e))
+            if tmpPath and os.path.exists(tmpPath):
+                os.remove(tmpPath)
+
+    def __update(self, tokens):
+        """Refill the bucket and take tokens if available. Return the time (seconds) until they are available (0 if taken)."""
+        now = time.time()
+        sD = self.__stateD
+        sD["tokens"] = min(self.__burst, sD["tokens"] + max(0.0, now - sD["updated"]) * self.__rate)
+        sD["updated"] = now
+        if sD["tokens"] >= tokens:
+            sD["tokens"] -= tokens
+            return 0.0
+        return (tokens - sD["tokens"]) / self.__rate
+
+    def __take(self, tokens):
+        """Take tokens if available and return 0 or otherwise return the time (seconds) until they are available."""
+        with self.__lock:
+            if self.__fileLock is not None:
+                try:
+                    with self.__fileLock:
+                        self.__load()
+                        wait = self.__update(tokens)
+                        # the refill is recomputed from the saved state so it is saved only when tokens are taken
+                        if wait <= 0.0:
+                            self.__save()
+                        return wait
+                except (IOError, OSError) as e:
+                    log.debug("Token bucket state %r unavailable - using the state of this process %s", self.__statePath, str(e))
+            return self.__update(tokens)
+
+    def acquire(self, tokens=1.0, timeout=None):
+        """Wait until tokens are available and take them.
+
+        :param float tokens: (Optional) number of tokens
+        :param float timeout: (Optional) longest wait (seconds, default: no limit)
+
+        :rtype: bool True if the tokens were taken or False if they would not be available within timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            wait = self.__take(tokens)
+            if wait <= 0.0:
+                return True
+            if deadline is not None and time.time() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class RateLimiter(object):
+    # service endpoints drawing on each budget
+    DEFAULT_BUDGETS = {"session": "session", "entry_content": "submit", "summary_content": "submit", "session_status": "status"}
+
+    def __init__(self, limitD, statePath=None, budgetD=None, timeout=None):
+        """
+        Request rate limits on groups of service endpoints (budgets).
+
+        By default the 'session' budget covers session creation, 'submit' covers content requests
+        (entry_content, summary_content) and 'status' covers status polling (session_status). Requests to
+        other endpoints are not limited. With a state directory each budget is kept in a file there, so
+        that every process (and host sharing the directory) using it stays within the same limits.
+
+        :param dict limitD: budget name -> (rate, burst) e.g. {"session": (0.5, 2), "submit": (2.0, 5), "status": (10.0, 10)}
+        :param string statePath: (Optional) directory holding the budget state files shared by processes
+        :param dict budgetD: (Optional) endpoint -> budget name (default: DEFAULT_BUDGETS)
+        :param float timeout: (Optional) longest wait (seconds) for a request to be admitted (default: no limit)
+
+        """
+        self.__budgetD = budgetD if budgetD is not None else dict(self.DEFAULT_BUDGETS)
+        self.__timeout = timeout
+        self.__bucketD = {}
+        if statePath:
+            statePath = os.path.expanduser(statePath)
+            if not os.path.isdir(statePath):
+                os.makedirs(statePath)
+        for name, (rate, burst) in limitD.items():
+            self.__bucketD[name] = TokenBucket(rate, burst=burst, statePath=os.path.join(statePath, "%s.json" % name) if statePath else None)
+
+    def getBudget(self, endPoint):
+        """Return the name of the budget for the input endpoint or None if requests to it are not limited."""
+        name = self.__budgetD.get(endPoint)
+        return name if name in self.__bucketD else None
+
+    def acquire(self, endPoint):
+        """Wait until a request to the input endpoint is admitted.
+
+        :rtype: bool False if the request was not admitted within the timeout
+        """
+        name = self.getBudget(endPoint)
+        if name is None:
+            return True
+        return self.__bucketD[name].acquire(timeout=self.__timeout)
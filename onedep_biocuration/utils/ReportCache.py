@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+ReportCache.py
+^^^^^^^^^^^^^^
+
+Size-bounded on-disk LRU cache with per content type expiry for downloaded reports.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from onedep_biocuration.utils.FileLock import FileLock
+
+log = logging.getLogger(__name__)
+
+
+class ReportCache(object):
+    def __init__(self, cachePath="~/.onedep_biocuration_cache", maxBytes=1024 * 1024 * 1024, ttlD=None, defaultTtl=3600):
+        """
+        On-disk cache of downloaded report files.
+
+        Entries expire after the time-to-live of their content type and the least recently used
+        entries are evicted when the total size of the cache exceeds maxBytes. The cache index is
+        shared safely by the threads and processes using the same cache directory.
+
+        :param string cachePath: (Optional) cache directory
+        :param int maxBytes: (Optional) upper limit on the total size of cached files
+        :param dict ttlD: (Optional) time-to-live (seconds) for each content type
+        :param float defaultTtl: (Optional) time-to-live (seconds) for other content types
+
+        """
+        self.__cachePath = os.path.expanduser(cachePath)
+        self.__maxBytes = maxBytes
+        self.__ttlD = ttlD if ttlD else {}
+        self.__defaultTtl = defaultTtl
+        try:
+            os.makedirs(self.__cachePath)
+        except OSError:
+            if not os.path.isdir(self.__cachePath):
+                raise
+        self.__indexPath = os.path.join(self.__cachePath, "index.json")
+        self.__lock = FileLock(os.path.join(self.__cachePath, "index.lock"))
+
+    @staticmethod
+    def makeKey(apiUrl, target, contentType, formatType, querySite=None):
+        """Return the cache key for a report.
+
+        :param string apiUrl: API service base URL
+        :param string target: entry identifier for entry reports or 'summary' for summary reports
+        :param string contentType: requested content type
+        :param string formatType: requested format type
+        :param string querySite: (Optional) site identifier for summary reports
+
+        """
+        tS = json.dumps([apiUrl, target, contentType, formatType, querySite])
+        return hashlib.sha256(tS.encode("utf-8")).hexdigest()
+
+    def getTtl(self, contentType):
+        return self.__ttlD.get(contentType, self.__defaultTtl)
+
+    def __readIndex(self):
+        try:
+            with open(self.__indexPath, "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def __writeIndex(self, indexD):
+        fd, tmpPath = tempfile.mkstemp(prefix=".index-", dir=self.__cachePath)
+        with os.fdopen(fd, "w") as ofh:
+            json.dump(indexD, ofh)
+        os.rename(tmpPath, self.__indexPath)
+
+    def __remove(self, indexD, key):
+        indexD.pop(key, None)
+        try:
+            os.remove(os.path.join(self.__cachePath, key))
+        except OSError:
+            pass
+
+    def get(self, key, dstPath):
+        """Copy the cached file for key to dstPath if a current entry exists.
+
+        :rtype: bool True for a cache hit
+        """
+        now = time.time()
+        with self.__lock:
+            indexD = self.__readIndex()
+            eD = indexD.get(key)
+            if eD is None:
+                return False
+            if now - eD["created"] > self.getTtl(eD.get("content_type")):
+                log.debug("Cache entry expired %r", key)
+                self.__remove(indexD, key)
+                self.__writeIndex(indexD)
+                return False
+            try:
+                shutil.copyfile(os.path.join(self.__cachePath, key), dstPath)
+            except (IOError, OSError) as e:
+                log.debug("Cache entry unreadable %r %s", key, str(e))
+                self.__remove(indexD, key)
+                self.__writeIndex(indexD)
+                return False
+            eD["accessed"] = now
+            self.__writeIndex(indexD)
+            return True
+
+    def put(self, key, srcPath, contentType=None):
+        """Store a copy of srcPath as the cache entry for key and evict entries beyond the size limit."""
+        try:
+            size = os.path.getsize(srcPath)
+            if size > self.__maxBytes:
+                return False
+            fd, tmpPath = tempfile.mkstemp(prefix=".entry-", dir=self.__cachePath)
+            os.close(fd)
+            shutil.copyfile(srcPath, tmpPath)
+        except (IOError, OSError) as e:
+            log.debug("Cache store failed for %r %s", srcPath, str(e))
+            return False
+        now = time.time()
+        with self.__lock:
+            indexD = self.__readIndex()
+            os.rename(tmpPath, os.path.join(self.__cachePath, key))
+            indexD[key] = {"size": size, "created": now, "accessed": now, "content_type": contentType}
+            # least recently used entries are evicted first
+            total = sum([eD["size"] for eD in indexD.values()])
+            for ky, _ in sorted(indexD.items(), key=lambda t: t[1]["accessed"]):
+                if total <= self.__maxBytes:
+                    break
+                if ky != key:
+                    total -= indexD[ky]["size"]
+                    self.__remove(indexD, ky)
+            self.__writeIndex(indexD)
+        return True
+
+    def clear(self):
+        """Remove all cache entries."""
+        with self.__lock:
+            indexD = self.__readIndex()
+            for key in list(indexD.keys()):
+                self.__remove(indexD, key)
+            self.__writeIndex(indexD)
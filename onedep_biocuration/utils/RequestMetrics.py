@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+RequestMetrics.py
+^^^^^^^^^^^^^^^^^
+
+Aggregation of per-request client metrics into histograms and export in Prometheus textfile format.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import tempfile
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class Histogram(object):
+    def __init__(self, buckets):
+        """
+        Cumulative histogram of observed values.
+
+        :param list buckets: increasing upper bounds of the histogram buckets
+
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for ii, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[ii] += 1
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket holding the q-quantile (None if there are no observations)."""
+        if not self.count:
+            return None
+        for ii, bound in enumerate(self.buckets):
+            if self.counts[ii] >= q * self.count:
+                return bound
+        return float("inf")
+
+
+class RequestMetrics(object):
+    # latency bucket bounds (seconds)
+    TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+    # latency phases recorded for each request (see ApiBase.setMetricsCallback())
+    PHASES = ("latency", "wait", "connect", "ttfb", "transfer", "write")
+
+    def __init__(self, buckets=None):
+        """
+        Request metrics callback for ApiBase aggregating each request record into histograms and counters
+        by endpoint.
+
+        :param list buckets: (Optional) latency bucket bounds (seconds) (default: TIME_BUCKETS)
+
+        """
+        self.__buckets = tuple(buckets) if buckets else self.TIME_BUCKETS
+        self.__lock = threading.Lock()
+        # (phase, endpoint) -> Histogram
+        self.__histogramD = {}
+        # (counter name, labels) -> value
+        self.__counterD = {}
+
+    def __call__(self, mD):
+        self.record(mD)
+
+    def __add(self, name, labels, value):
+        key = (name, labels)
+        self.__counterD[key] = self.__counterD.get(key, 0) + value
+
+    def record(self, mD):
+        """Add a request record (as passed to the ApiBase metrics callback) to the aggregates."""
+        endPoint = mD.get("endpoint")
+        with self.__lock:
+            for phase in self.PHASES:
+                if mD.get(phase) is not None:
+                    key = (phase, endPoint)
+                    if key not in self.__histogramD:
+                        self.__histogramD[key] = Histogram(self.__buckets)
+                    self.__histogramD[key].observe(mD[phase])
+            code = mD.get("status_code")
+            self.__add("requests_total", (("endpoint", endPoint), ("code", str(code) if code is not None else "none")), 1)
+            self.__add("bytes_sent_total", (("endpoint", endPoint),), mD.get("bytes_sent") or 0)
+            self.__add("bytes_received_total", (("endpoint", endPoint),), mD.get("bytes_received") or 0)
+            self.__add("retries_total", (("endpoint", endPoint),), mD.get("retries") or 0)
+            if mD.get("error"):
+                self.__add("errors_total", (("endpoint", endPoint),), 1)
+            if mD.get("checksum"):
+                self.__add("checksum_total", (("endpoint", endPoint), ("outcome", mD["checksum"])), 1)
+
+    def getHistogram(self, phase, endPoint):
+        """Return the Histogram of the input phase ('latency', 'wait', 'connect', 'ttfb', 'transfer', 'write') for endPoint or None."""
+        with self.__lock:
+            return self.__histogramD.get((phase, endPoint))
+
+    def getCounter(self, name, **labels):
+        """Return the sum of counter 'name' over the entries matching the input labels (e.g. getCounter("requests_total", endpoint="download"))."""
+        total = 0
+        with self.__lock:
+            for (ky, labelL), value in self.__counterD.items():
+                lD = dict(labelL)
+                if ky == name and all([lD.get(lk) == lv for lk, lv in labels.items()]):
+                    total += value
+        return total
+
+    @staticmethod
+    def __formatLabels(labelL):
+        return "{%s}" % ",".join(['%s="%s"' % (ky, str(val).replace("\\", "\\\\").replace('"', '\\"')) for ky, val in labelL])
+
+    def toPrometheus(self, prefix="onedep_client"):
+        """Return the aggregates in the Prometheus text exposition format."""
+        lineL = []
+        with self.__lock:
+            for phase in self.PHASES:
+                keyL = sorted([ky for ky in self.__histogramD if ky[0] == phase], key=lambda ky: str(ky[1]))
+                if not keyL:
+                    continue
+                name = "%s_request_%s_seconds" % (prefix, phase)
+                lineL.append("# HELP %s Request %s time by endpoint" % (name, phase))
+                lineL.append("# TYPE %s histogram" % name)
+                for key in keyL:
+                    hist = self.__histogramD[key]
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lineL.append("%s_bucket%s %d" % (name, self.__formatLabels([("endpoint", key[1]), ("le", repr(float(bound)))]), count))
+                    lineL.append("%s_bucket%s %d" % (name, self.__formatLabels([("endpoint", key[1]), ("le", "+Inf")]), hist.count))
+                    lineL.append("%s_sum%s %r" % (name, self.__formatLabels([("endpoint", key[1])]), hist.sum))
+                    lineL.append("%s_count%s %d" % (name, self.__formatLabels([("endpoint", key[1])]), hist.count))
+            for counter in sorted(set([ky[0] for ky in self.__counterD])):
+                name = "%s_%s" % (prefix, counter)
+                lineL.append("# TYPE %s counter" % name)
+                for key in sorted([ky for ky in self.__counterD if ky[0] == counter], key=lambda ky: str(ky[1])):
+                    lineL.append("%s%s %s" % (name, self.__formatLabels(key[1]), self.__counterD[key]))
+        return "\n".join(lineL) + "\n"
+
+    def writeTextfile(self, filePath, prefix="onedep_client"):
+        """Write the aggregates to filePath in Prometheus textfile format (replacing the file atomically, e.g. for the node_exporter textfile collector)."""
+        filePath = os.path.expanduser(filePath)
+        dirPath = os.path.dirname(filePath) or "."
+        fd, tmpPath = tempfile.mkstemp(prefix=".metrics-", suffix=".prom.tmp", dir=dirPath)
+        try:
+            with os.fdopen(fd, "w") as ofh:
+                ofh.write(self.toPrometheus(prefix=prefix))
+            os.rename(tmpPath, filePath)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+
+
+class TextfileExporter(object):
+    def __init__(self, metrics, filePath, interval=15.0, prefix="onedep_client"):
+        """
+        Background writer of RequestMetrics aggregates to a Prometheus textfile at a fixed interval.
+
+        :param object metrics: RequestMetrics instance
+        :param string filePath: output file path (e.g. in the node_exporter textfile collector directory, ending in .prom)
+        :param float interval: (Optional) time between writes (seconds)
+        :param string prefix: (Optional) metric name prefix
+
+        """
+        self.__metrics = metrics
+        self.__filePath = filePath
+        self.__interval = interval
+        self.__prefix = prefix
+        self.__stopEvent = threading.Event()
+        self.__thread = None
+
+    def write(self):
+        try:
+            self.__metrics.writeTextfile(self.__filePath, prefix=self.__prefix)
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning("Failed writing metrics textfile %r %s", self.__filePath, str(e))
+
+    def __run(self):
+        while not self.__stopEvent.wait(self.__interval):
+            self.write()
+
+    def start(self):
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, name="metrics-textfile-exporter")
+            self.__thread.daemon = True
+            self.__thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background writer and write the final aggregates."""
+        self.__stopEvent.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.write()
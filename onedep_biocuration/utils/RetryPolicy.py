@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+RetryPolicy.py
+^^^^^^^^^^^^^^
+
+Retry schedules and retry budgets for idempotent service requests.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import division
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import collections
+import logging
+import random
+import socket
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+log = logging.getLogger(__name__)
+
+
+def isTransientException(exception):
+    """Return True if the input exception raised by a request is a transient connection failure (reset, timeout, truncated body)."""
+    import requests.exceptions  # pylint: disable=import-outside-toplevel
+    import urllib3.exceptions  # pylint: disable=import-outside-toplevel
+
+    transientL = [
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+        urllib3.exceptions.ProtocolError,
+        urllib3.exceptions.TimeoutError,
+        socket.timeout,
+    ]
+    try:
+        transientL.append(ConnectionError)
+    except NameError:  # pragma: no cover
+        pass
+    return isinstance(exception, tuple(transientL))
+
+
+class RetryBudget(object):
+    def __init__(self, ratio=0.2, minRetries=10, window=10.0):
+        """
+        Limit on retries relative to the volume of requests in a sliding time window.
+
+        Within any window at most minRetries + ratio * (requests made in the window) retries are allowed,
+        so that during an outage retries add at most a fraction of the normal request load.
+
+        :param float ratio: (Optional) retries allowed per request made
+        :param int minRetries: (Optional) retries allowed in each window irrespective of the request volume
+        :param float window: (Optional) length of the sliding window (seconds)
+
+        """
+        self.__ratio = ratio
+        self.__minRetries = minRetries
+        self.__window = window
+        self.__lock = threading.Lock()
+        self.__requestQ = collections.deque()
+        self.__retryQ = collections.deque()
+
+    def __prune(self, now):
+        for q in [self.__requestQ, self.__retryQ]:
+            while q and now - q[0] > self.__window:
+                q.popleft()
+
+    def recordRequest(self):
+        """Record a request (first attempt) which adds to the retry allowance."""
+        now = time.time()
+        with self.__lock:
+            self.__prune(now)
+            self.__requestQ.append(now)
+
+    def acquire(self):
+        """Withdraw one retry from the budget.
+
+        :rtype: bool True if the retry is allowed
+        """
+        now = time.time()
+        with self.__lock:
+            self.__prune(now)
+            if len(self.__retryQ) >= self.__minRetries + self.__ratio * len(self.__requestQ):
+                return False
+            self.__retryQ.append(now)
+            return True
+
+
+class RetryPolicy(object):
+    def __init__(
+        self,
+        maxAttempts=4,
+        initialDelay=0.5,
+        maxDelay=30.0,
+        multiplier=2.0,
+        jitter=0.5,
+        maxRetryAfter=120.0,
+        retryStatusCodes=(429, 500, 502, 503, 504),
+        endPoints=("session_status", "session_index", "download"),
+        refetchOnChecksumFailure=True,
+        budget=None,
+    ):
+        """
+        Capped exponential backoff with jitter for retrying idempotent service requests.
+
+        Requests to the listed endpoints are retried after connection failures (resets, timeouts and
+        truncated bodies), after responses with one of the listed status codes and, for downloads, after
+        checksum failures. A Retry-After response header sets a lower limit on the pause. All retries are
+        drawn from a shared RetryBudget.
+
+        :param int maxAttempts: (Optional) largest number of attempts for a request (including the first)
+        :param float initialDelay: (Optional) pause before the first retry (seconds)
+        :param float maxDelay: (Optional) upper limit on the backoff pause (seconds)
+        :param float multiplier: (Optional) growth factor between successive pauses
+        :param float jitter: (Optional) fraction by which each pause is randomly shortened
+        :param float maxRetryAfter: (Optional) give up rather than wait when Retry-After asks for longer than this (seconds)
+        :param list retryStatusCodes: (Optional) HTTP status codes of retryable responses
+        :param list endPoints: (Optional) idempotent endpoints for which requests are retried
+        :param bool refetchOnChecksumFailure: (Optional) download again when the content checksum does not match
+        :param object budget: (Optional) RetryBudget instance (default: 10 retries plus 20% of requests per 10 seconds)
+
+        """
+        self.maxAttempts = maxAttempts
+        self.initialDelay = initialDelay
+        self.maxDelay = maxDelay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.maxRetryAfter = maxRetryAfter
+        self.retryStatusCodes = retryStatusCodes
+        self.endPoints = endPoints
+        self.refetchOnChecksumFailure = refetchOnChecksumFailure
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def isRetryable(self, endPoint):
+        """Return True if requests to the input endpoint may be retried."""
+        return self.maxAttempts > 1 and endPoint in self.endPoints
+
+    def isRetryableException(self, exception):
+        """Return True if the input exception raised by a request is a transient connection failure."""
+        return isTransientException(exception)
+
+    def isRetryableResponse(self, response):
+        """Return True if the input response has a retryable status code."""
+        return response is not None and response.status_code in self.retryStatusCodes
+
+    @staticmethod
+    def parseRetryAfter(value, now=None):
+        """Return the pause (seconds) requested by a Retry-After header value (delay seconds or HTTP date) or None."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        tt = parsedate_tz(value)
+        if tt is None:
+            return None
+        return max(0.0, mktime_tz(tt) - (now if now is not None else time.time()))
+
+    def getPause(self, attempt, retryAfter=None):
+        """Return the pause (seconds) before retrying after the input failed attempt or None to give up.
+
+        :param int attempt: number of the failed attempt (1 for the first request)
+        :param float retryAfter: (Optional) pause requested by the service (seconds)
+
+        """
+        if attempt >= self.maxAttempts:
+            return None
+        if retryAfter is not None and retryAfter > self.maxRetryAfter:
+            log.debug("Service asks to retry after %.1f seconds - giving up", retryAfter)
+            return None
+        pause = min(self.maxDelay, self.initialDelay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            pause *= random.uniform(1.0 - self.jitter, 1.0)
+        return max(pause, retryAfter) if retryAfter is not None else pause
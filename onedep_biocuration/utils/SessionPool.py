@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+SessionPool.py
+^^^^^^^^^^^^^^
+
+Pool of pre-created service sessions leased to content requests.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import collections
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class SessionPool(object):
+    def __init__(self, client, size=4, maxAge=900.0, retryPause=5.0):
+        """
+        Keep 'size' spare service sessions ready so that session creation is off the critical path
+        of content requests. Sessions are replenished by a background thread, handed out once by
+        lease() and retired unused when older than maxAge.
+
+        :param object client: ApiBase instance used only for session creation (its current session is not changed)
+        :param int size: (Optional) number of spare sessions kept ready
+        :param float maxAge: (Optional) age (seconds) beyond which spare sessions are retired
+        :param float retryPause: (Optional) pause (seconds) before replenishing again after a failure
+
+        """
+        self.__client = client
+        self.__size = size
+        self.__maxAge = maxAge
+        self.__retryPause = retryPause
+        self.__spareQ = collections.deque()
+        self.__cond = threading.Condition()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__replenish, name="session-pool")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __create(self):
+        """Internal method to create a new session without altering the session context of the client."""
+        return self.__client.post("session", session_id=None)
+
+    def __retire(self, now):
+        while self.__spareQ and now - self.__spareQ[0][0] > self.__maxAge:
+            _, rD = self.__spareQ.popleft()
+            log.debug("Retiring spare session %r", rD.get("session_id"))
+
+    def __replenish(self):
+        while True:
+            with self.__cond:
+                while not self.__closed:
+                    self.__retire(time.time())
+                    if len(self.__spareQ) < self.__size:
+                        break
+                    # wake for the next retirement or a lease
+                    self.__cond.wait(max(0.1, self.__maxAge - (time.time() - self.__spareQ[0][0])) if self.__spareQ else None)
+                if self.__closed:
+                    return
+            createTime = time.time()
+            rD = self.__create()
+            with self.__cond:
+                if rD.get("session_id"):
+                    self.__spareQ.append((createTime, rD))
+                    self.__cond.notify_all()
+                    continue
+                log.debug("Spare session creation failed %r", rD)
+                self.__cond.wait(self.__retryPause)
+
+    def lease(self, wait=0.0):
+        """Return the service response for a new session (with key session_id).
+
+        A spare session is returned if one is ready (optionally waiting up to 'wait' seconds for one);
+        otherwise a session is created directly.
+
+        :rtype: json service response converted to dictionary (with mininal keys: api_error_flag, api_status_text, session_id)
+        """
+        deadline = time.time() + wait
+        with self.__cond:
+            while True:
+                self.__retire(time.time())
+                if self.__spareQ:
+                    _, rD = self.__spareQ.popleft()
+                    self.__cond.notify_all()
+                    return dict(rD)
+                remaining = deadline - time.time()
+                if remaining <= 0 or self.__closed:
+                    break
+                self.__cond.wait(remaining)
+            self.__cond.notify_all()
+        return self.__create()
+
+    def available(self):
+        """Return the number of spare sessions ready for lease."""
+        with self.__cond:
+            self.__retire(time.time())
+            return len(self.__spareQ)
+
+    def close(self):
+        """Stop replenishing and discard the spare sessions."""
+        with self.__cond:
+            self.__closed = True
+            self.__spareQ.clear()
+            self.__cond.notify_all()
+        self.__thread.join()
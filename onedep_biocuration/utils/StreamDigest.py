@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+StreamDigest.py
+^^^^^^^^^^^^^^^
+
+Message digest computed over data chunks as they are streamed.
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import hashlib
+import logging
+import threading
+
+try:
+    import queue
+except ImportError:  # pragma: no cover
+    import Queue as queue
+
+log = logging.getLogger(__name__)
+
+
+class StreamDigest(object):
+    def __init__(self, algorithm="md5", pipelined=False, maxPending=16):
+        """
+        Incremental digest of a data stream.
+
+        In pipelined mode chunks are hashed on a worker thread so that hashing overlaps
+        network reads and file writes (hashlib releases the GIL for large updates).
+
+        :param string algorithm: (Optional) hashlib algorithm name
+        :param bool pipelined: (Optional) hash on a worker thread
+        :param int maxPending: (Optional) maximum number of chunks queued for the worker thread
+
+        """
+        self.__hash = hashlib.new(algorithm)
+        self.__nBytes = 0
+        self.__queue = None
+        self.__thread = None
+        if pipelined:
+            self.__queue = queue.Queue(maxsize=maxPending)
+            self.__thread = threading.Thread(target=self.__worker, name="stream-digest")
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def __worker(self):
+        while True:
+            chunk = self.__queue.get()
+            if chunk is None:
+                break
+            self.__hash.update(chunk)
+
+    def update(self, chunk):
+        """Add the input chunk (bytes) to the digest. Chunks must not be modified after this call."""
+        self.__nBytes += len(chunk)
+        if self.__queue is not None:
+            self.__queue.put(chunk)
+        else:
+            self.__hash.update(chunk)
+
+    def isPipelined(self):
+        return self.__queue is not None
+
+    def close(self):
+        """Wait for any pending chunks and stop the worker thread."""
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+            self.__queue = None
+
+    def hexdigest(self):
+        self.close()
+        return self.__hash.hexdigest()
+
+    def digest(self):
+        self.close()
+        return self.__hash.digest()
+
+    def getByteCount(self):
+        return self.__nBytes
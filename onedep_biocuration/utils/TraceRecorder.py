@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+TraceRecorder.py
+^^^^^^^^^^^^^^^^
+
+Timeline of client calls in the Chrome trace-event format (chrome://tracing, Perfetto).
+
+:copyright: @wwPDB
+:license: Apache 2.0, see LICENSE file for more details.
+
+
+Updates:
+    18-Oct-2026  initial version
+"""
+
+from __future__ import unicode_literals
+
+__docformat__ = "restructuredtext en"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class NullSpan(object):
+    """Span used when tracing is off - entering, leaving and annotating it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class TraceSpan(object):
+    def __init__(self, recorder, name, cat, args):
+        """
+        Timed interval of a TraceRecorder timeline (use as a context manager).
+
+        :param object recorder: TraceRecorder instance
+        :param string name: event name
+        :param string cat: event category
+        :param dict args: event arguments
+
+        """
+        self.__recorder = recorder
+        self.__name = name
+        self.__cat = cat
+        self.__args = args
+        self.__startTime = None
+
+    def set(self, **args):
+        """Add arguments to the event (e.g. the outcome of the traced call)."""
+        self.__args.update(args)
+
+    def __enter__(self):
+        self.__startTime = time.time()
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        if excType is not None:
+            self.__args["exception"] = excType.__name__
+        self.__recorder.addComplete(self.__name, self.__cat, self.__startTime, time.time(), self.__args)
+        return False
+
+
+class TraceRecorder(object):
+    def __init__(self, processName="onedep client", maxEvents=1000000):
+        """
+        Recorder of client calls as Chrome trace events on a track for each thread.
+
+        Set an instance as the trace recorder of a client (ApiBase/ContentRequest traceRecorder option)
+        to record the lifecycle of each session (session creation, content request, each status poll,
+        download and checksum verification) and write the timeline with write() to open it in a trace
+        viewer (chrome://tracing or https://ui.perfetto.dev).
+
+        :param string processName: (Optional) name of the process track
+        :param int maxEvents: (Optional) largest number of events kept (later events are dropped)
+
+        """
+        self.__processName = processName
+        self.__maxEvents = maxEvents
+        self.__pid = os.getpid()
+        self.__origin = time.time()
+        self.__lock = threading.Lock()
+        self.__eventL = []
+        # thread ident -> thread name
+        self.__threadD = {}
+        self.__dropped = 0
+
+    def span(self, name, cat="client", **args):
+        """Return a TraceSpan context manager recording the time spent in its body as a complete event."""
+        return TraceSpan(self, name, cat, args)
+
+    def instant(self, name, cat="client", **args):
+        """Record an instant event (e.g. a report cache hit)."""
+        self.__add({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self.__toMicroseconds(time.time()), "args": args})
+
+    def addComplete(self, name, cat, startTime, endTime, args=None):
+        """Record a complete event for the interval from startTime to endTime (seconds since the epoch)."""
+        ts = self.__toMicroseconds(startTime)
+        self.__add({"name": name, "cat": cat, "ph": "X", "ts": ts, "dur": max(0.0, self.__toMicroseconds(endTime) - ts), "args": args if args else {}})
+
+    def __toMicroseconds(self, tS):
+        return round((tS - self.__origin) * 1.0e6, 1)
+
+    def __add(self, eD):
+        th = threading.current_thread()
+        eD["pid"] = self.__pid
+        eD["tid"] = th.ident
+        with self.__lock:
+            if len(self.__eventL) >= self.__maxEvents:
+                self.__dropped += 1
+                return
+            if th.ident not in self.__threadD:
+                self.__threadD[th.ident] = th.name
+            self.__eventL.append(eD)
+
+    def getEvents(self):
+        """Return a copy of the recorded events (excluding track metadata)."""
+        with self.__lock:
+            return list(self.__eventL)
+
+    def clear(self):
+        with self.__lock:
+            self.__eventL = []
+            self.__threadD = {}
+            self.__dropped = 0
+            self.__origin = time.time()
+
+    def toChromeTrace(self):
+        """Return the timeline as a Chrome trace-event dictionary ({"traceEvents": [...], ...})."""
+        with self.__lock:
+            eventL = [{"name": "process_name", "ph": "M", "pid": self.__pid, "tid": 0, "args": {"name": self.__processName}}]
+            for ii, (tid, threadName) in enumerate(sorted(self.__threadD.items(), key=lambda item: item[0])):
+                eventL.append({"name": "thread_name", "ph": "M", "pid": self.__pid, "tid": tid, "args": {"name": threadName}})
+                eventL.append({"name": "thread_sort_index", "ph": "M", "pid": self.__pid, "tid": tid, "args": {"sort_index": ii}})
+            eventL.extend(self.__eventL)
+            if self.__dropped:
+                log.warning("Trace event limit reached - %d events dropped", self.__dropped)
+            return {"traceEvents": eventL, "displayTimeUnit": "ms", "otherData": {"origin": self.__origin, "dropped": self.__dropped}}
+
+    def write(self, filePath):
+        """Write the timeline to filePath as Chrome trace-event JSON (replacing the file atomically)."""
+        filePath = os.path.expanduser(filePath)
+        dirPath = os.path.dirname(filePath) or "."
+        fd, tmpPath = tempfile.mkstemp(prefix=".trace-", suffix=".json.tmp", dir=dirPath)
+        try:
+            with os.fdopen(fd, "w") as ofh:
+                json.dump(self.toChromeTrace(), ofh)
+            os.rename(tmpPath, filePath)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
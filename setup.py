@@ -11,7 +11,7 @@ if sys.argv[-1] == "publish":
 
 packages = []
 
-requires = ["requests", "six"]
+requires = ["requests", "urllib3>=1.26,<3", "six"]
 
 
 with open("onedep_biocuration/__init__.py", "r") as fd:
@@ -52,7 +52,8 @@ setup(
         ]
     },
     #
-    install_requires=["requests", "six"],
+    # urllib3 is pinned to the releases whose response internals are read by DownloadEngine
+    install_requires=["requests", "urllib3>=1.26,<3", "six", 'futures; python_version < "3"'],
     packages=find_packages(exclude=["onedep_biocuration.tests", "tests.*"]),
     package_data={
         # If any package contains *.md or *.rst files, include them:
@@ -66,5 +67,8 @@ setup(
     extras_require={
         "dev": ["check-manifest"],
         "test": ["coverage"],
+        "async": ["aiohttp"],
+        "fast": ["orjson"],
+        "zstd": ["zstandard"],
     },
 )